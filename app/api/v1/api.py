@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints.news import router as news_router
 from app.api.v1.endpoints.health import router as health_router
+from app.api.v1.endpoints.metrics import router as metrics_router
 
 api_router = APIRouter()
 
@@ -14,4 +15,10 @@ api_router.include_router(
     news_router,
     prefix="/news",
     tags=["News"]
+)
+
+api_router.include_router(
+    metrics_router,
+    prefix="/metrics",
+    tags=["Metrics"]
 )
\ No newline at end of file
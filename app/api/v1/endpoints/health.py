@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
+from typing import Optional
 from datetime import datetime
 from app.core.config import settings
+from app.services import admission_controller, batch_news_runner, gemini_service, geolocation_service, location_index, news_cache, news_service, prewarm_scheduler
 
 router = APIRouter()
 
@@ -11,14 +13,36 @@ class HealthResponse(BaseModel):
     app_name: str
     version: str
     timestamp: datetime
+    generation: Optional[dict] = None
+    cache: Optional[dict] = None
+    geolocation: Optional[dict] = None
+    prewarm: Optional[dict] = None
+    resilience: Optional[dict] = None
+    batch: Optional[dict] = None
+    admission: Optional[dict] = None
 
 
 @router.get("/", response_model=HealthResponse)
 async def health_check():
     """Endpoint de health check"""
+    resilience = gemini_service.resilience.stats()
+    # Con el circuito abierto la API sigue respondiendo desde el caché
+    breaker_open = resilience["circuit_breaker"]["state"] != "closed"
+    
     return HealthResponse(
-        status="healthy",
+        status="degraded" if breaker_open else "healthy",
         app_name=settings.app_name,
         version=settings.app_version,
-        timestamp=datetime.utcnow()
+        timestamp=datetime.utcnow(),
+        generation={
+            **gemini_service.executor.stats(),
+            "parsing": gemini_service.parse_stats(),
+            "routing": gemini_service.router.stats()
+        },
+        cache={**news_cache.stats(), **news_service.stats()},
+        geolocation={**geolocation_service.stats(), "locations": location_index.stats()},
+        prewarm=prewarm_scheduler.stats(),
+        resilience=resilience,
+        batch=batch_news_runner.stats(),
+        admission=admission_controller.stats()
     )
\ No newline at end of file
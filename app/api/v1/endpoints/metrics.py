@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Query
+from app.services import gemini_service, usage_tracker
+
+router = APIRouter()
+
+
+@router.get(
+    "/usage",
+    response_model=dict,
+    summary="Consumo de tokens y costo de Gemini",
+    description="Tokens y costo estimado de las llamadas a Gemini, en total y por endpoint, ubicación, idioma, límite y modelo."
+)
+async def get_usage(
+    top: int = Query(
+        default=20,
+        ge=1,
+        le=500,
+        description="Cantidad máxima de valores por dimensión (los más caros)"
+    )
+):
+    """
+    Retorna la contabilidad de uso de Gemini desde que arrancó el servidor.
+    """
+    return {
+        "usage": usage_tracker.stats(top),
+        "context_cache": gemini_service.context_cache_stats()
+    }
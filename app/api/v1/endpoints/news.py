@@ -1,18 +1,116 @@
 from fastapi import APIRouter, HTTPException, Request, Query
-from typing import List, Optional
+from fastapi.responses import Response, StreamingResponse
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
+import hashlib
+import json
+import logging
 
+from app.core.compression import compress, negotiate
+from app.core.config import settings
 from app.schemas import (
     NewsRequest,
+    NewsBatchRequest,
     NewsResponse,
     NewsCategory,
     ErrorResponse,
     LocationResponse
 )
-from app.services import geolocation_service, gemini_service
+from app.services import (
+    AdmissionRejected,
+    admission_controller,
+    batch_news_runner,
+    geolocation_service,
+    news_service
+)
+from app.services.metrics import span
+from app.services.news_cache import EncodedNews
+from app.services.news_versions import unpack_snapshot
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _client_ip(request: Request) -> Optional[str]:
+    """IP del cliente, o None si la petición es local"""
+    client_ip = request.client.host
+    if client_ip in ["127.0.0.1", "localhost", "::1"]:
+        return None
+    return client_ip
+
+
+def _coordinates(location: LocationResponse) -> Optional[Tuple[float, float]]:
+    """(latitud, longitud) de una ubicación detectada, si el proveedor las informó"""
+    if location.latitude is None or location.longitude is None:
+        return None
+    return location.latitude, location.longitude
+
+
+def _admission(
+    request: Request,
+    location_string: str,
+    limit: int,
+    categories: Optional[List[NewsCategory]],
+    language: str
+):
+    """Control de admisión de la generación; lo que el caché puede responder pasa directo"""
+    return _client_admission(
+        request,
+        cacheable=news_service.is_cached(location_string, limit, categories, language)
+    )
+
+
+def _client_admission(request: Request, cacheable: bool = False, cost: int = 1):
+    return admission_controller.admit(
+        client_ip=request.client.host if request.client else None,
+        api_key=request.headers.get(settings.admission_api_key_header),
+        cacheable=cacheable,
+        cost=cost
+    )
+
+
+async def _hold_admission(admission) -> AsyncExitStack:
+    """
+    Entra al control de admisión antes de responder (un rechazo todavía puede
+    ser un 429) y deja el cupo tomado hasta que el stream lo suelte.
+    """
+    stack = AsyncExitStack()
+    try:
+        await stack.enter_async_context(admission)
+    except AdmissionRejected as e:
+        logger.info("Petición rechazada por control de admisión", extra={"reason": e.reason})
+        raise _rejected(e)
+    return stack
+
+
+async def _admitted_lines(stack: AsyncExitStack, lines: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Emite el stream y libera el cupo de admisión al terminar o desconectarse el cliente"""
+    async with stack:
+        async for line in lines:
+            yield line
+
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _custom_location_string(news_request: NewsRequest) -> str:
+    """Arma el string de ubicación a partir de ciudad, región y país"""
+    location_parts = [
+        news_request.city,
+        news_request.region,
+        news_request.country
+    ]
+    location_string = ", ".join(filter(None, location_parts))
+    
+    if not location_string:
+        raise ValueError("Debes proporcionar al menos ciudad, región o país")
+    return location_string
+
 
 @router.get(
     "/",
@@ -43,14 +141,25 @@ router = APIRouter()
                 }
             }
         },
+        304: {
+            "description": "Las noticias no cambiaron desde el ETag enviado en `If-None-Match`"
+        },
         400: {
             "description": "Error en los parámetros de la solicitud",
             "model": ErrorResponse
         },
+        429: {
+            "description": "Cuota del cliente agotada o servicio saturado (ver `Retry-After`)",
+            "model": ErrorResponse
+        },
         503: {
             "description": "Servicio de geolocalización no disponible",
             "model": ErrorResponse
         },
+        504: {
+            "description": "Gemini no respondió a tiempo",
+            "model": ErrorResponse
+        },
         500: {
             "description": "Error interno del servidor",
             "model": ErrorResponse
@@ -76,6 +185,10 @@ async def get_news(
         default="es", 
         description="Código de idioma para las noticias",
         examples=["es", "en"]
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="Cursor de una respuesta anterior: retorna solo los cambios (`NewsDeltaResponse`)"
     )
 ):
     """
@@ -84,48 +197,43 @@ async def get_news(
     - **limit**: Número de noticias (1-20)
     - **categories**: Filtrar por categorías específicas
     - **language**: Idioma de las noticias (es, en, etc.)
+    - **since**: Cursor de la respuesta anterior; retorna solo lo nuevo, lo modificado y los IDs eliminados
     """
     try:
-        # 1. Debug IP
-        client_ip = request.client.host
-        print(f"DEBUG: Client IP -> {client_ip}") 
-        
-        if client_ip in ["127.0.0.1", "localhost", "::1"]:
-            client_ip = None
-        
-        # 2. Debug Location
+        client_ip = _client_ip(request)
         location = await geolocation_service.get_location_by_ip(client_ip)
         location_string = geolocation_service.format_location_string(location)
-        print(f"DEBUG: Location detected -> {location_string}")
+        logger.debug("Ubicación detectada", extra={"client_ip": client_ip, "location": location_string})
         
-        # 3. Debug Gemini
-        print(f"DEBUG: Calling Gemini...")
-        news = await gemini_service.get_news_by_location(
-            location=location_string,
-            limit=limit,
-            categories=categories,
-            language=language
-        )
-        print(f"DEBUG: News received -> {len(news)}")
+        async with _admission(request, location_string, limit, categories, language):
+            news = await news_service.get_news_encoded(
+                location=location_string,
+                limit=limit,
+                categories=categories,
+                language=language,
+                coordinates=_coordinates(location)
+            )
+        logger.debug("Noticias obtenidas", extra={"location": location_string, "total_news": news.total})
         
-        return NewsResponse(
-            success=True,
-            location=location_string,
-            generated_at=datetime.utcnow(),
-            total_news=len(news),
-            news=news
-        )
+        headers = _news_cache_headers(location_string, news, since)
+        if _not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return _news_response(request, location_string, news, headers, since)
         
+    except AdmissionRejected as e:
+        logger.info("Petición rechazada por control de admisión", extra={"reason": e.reason})
+        raise _rejected(e)
     except ValueError as e:
-        print(f"ERROR VALUE: {str(e)}")  # <--- ESTO SALDRÁ EN TU TERMINAL
+        logger.info("Petición inválida: %s", e)
         raise HTTPException(status_code=400, detail=f"Error de valor: {str(e)}")
     except ConnectionError as e:
-        print(f"ERROR CONEXION: {str(e)}")
+        logger.warning("Error de conexión: %s", e)
         raise HTTPException(status_code=503, detail=f"Error de conexión: {str(e)}")
+    except TimeoutError as e:
+        logger.warning("Tiempo de espera agotado: %s", e)
+        raise HTTPException(status_code=504, detail=f"Tiempo de espera agotado: {str(e)}")
     except Exception as e:
-        print(f"ERROR GENERAL: {str(e)}")
-        import traceback
-        traceback.print_exc() # Imprime el error completo
+        logger.exception("Error obteniendo noticias")
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
 
 
@@ -135,49 +243,442 @@ async def get_news(
     responses={
         200: {"description": "Noticias obtenidas exitosamente"},
         400: {"description": "Ubicación no proporcionada", "model": ErrorResponse},
+        429: {"description": "Cuota del cliente agotada o servicio saturado (ver `Retry-After`)", "model": ErrorResponse},
+        503: {"description": "Gemini no disponible temporalmente", "model": ErrorResponse},
+        504: {"description": "Gemini no respondió a tiempo", "model": ErrorResponse},
         500: {"description": "Error interno", "model": ErrorResponse}
     },
     summary="Obtener noticias con ubicación personalizada",
     description="Obtiene noticias relevantes basadas en una ubicación proporcionada manualmente."
 )
-async def get_news_custom_location(news_request: NewsRequest):
+async def get_news_custom_location(request: Request, news_request: NewsRequest):
     """
     Obtiene noticias para una ubicación proporcionada manualmente.
     
     Útil cuando quieres buscar noticias de una ciudad diferente a tu ubicación actual.
     """
     try:
-        location_parts = [
-            news_request.city,
-            news_request.region,
-            news_request.country
-        ]
-        location_string = ", ".join(filter(None, location_parts))
-        
-        if not location_string:
-            raise ValueError("Debes proporcionar al menos ciudad, región o país")
+        location_string = _custom_location_string(news_request)
         
-        news = await gemini_service.get_news_by_location(
-            location=location_string,
-            limit=news_request.limit,
-            categories=news_request.categories,
-            language=news_request.language
-        )
+        async with _admission(
+            request, location_string, news_request.limit, news_request.categories, news_request.language
+        ):
+            news = await news_service.get_news_encoded(
+                location=location_string,
+                limit=news_request.limit,
+                categories=news_request.categories,
+                language=news_request.language
+            )
         
-        return NewsResponse(
-            success=True,
-            location=location_string,
-            generated_at=datetime.utcnow(),
-            total_news=len(news),
-            news=news
+        return _news_response(
+            request,
+            location_string,
+            news,
+            {"ETag": _news_etag(location_string, news, news_request.since)},
+            news_request.since
         )
         
+    except AdmissionRejected as e:
+        raise _rejected(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ConnectionError as e:
+        raise HTTPException(status_code=503, detail=f"Error de conexión: {str(e)}")
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=f"Tiempo de espera agotado: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
 
 
+def _news_etag(location_string: str, news: EncodedNews, since: Optional[str] = None) -> str:
+    """ETag débil de la respuesta: las noticias, la ubicación que se informa y el `since`"""
+    digest = hashlib.blake2b(
+        f"{location_string}|{news.etag}|{since or ''}".encode("utf-8"),
+        digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _news_cache_headers(
+    location_string: str,
+    news: EncodedNews,
+    since: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Validadores y `Cache-Control` de `GET /news/`.
+    
+    La respuesta depende de la IP del cliente, que ningún `Vary` puede
+    expresar, así que es `private`: la cachea el cliente pero no el CDN.
+    `max-age` es lo que le queda de frescura al lote en el caché.
+    """
+    max_age = news.max_age if news.max_age is not None else settings.news_cache_ttl_seconds
+    return {
+        "ETag": _news_etag(location_string, news, since),
+        "Cache-Control": (
+            f"private, max-age={int(max_age)}, "
+            f"stale-while-revalidate={int(settings.news_cache_stale_seconds)}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Si el `If-None-Match` de la petición coincide con `etag` (comparación débil)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _news_body(location_string: str, news: EncodedNews) -> bytes:
+    """
+    Arma el JSON de `NewsResponse` alrededor de las noticias ya serializadas
+    (mismo formato que `NewsResponse.model_dump_json()`), sin crear modelos.
+    """
+    return b"".join((
+        b'{"success":true,"location":',
+        json.dumps(location_string, ensure_ascii=False).encode("utf-8"),
+        b',"generated_at":"',
+        news.generated_at.encode("ascii"),
+        b'","version":',
+        str(news.version).encode("ascii"),
+        b',"cursor":"',
+        news.cursor.encode("ascii"),
+        b'","total_news":',
+        str(news.total).encode("ascii"),
+        b',"news":',
+        news.items_json,
+        b"}"
+    ))
+
+
+def _delta_body(location_string: str, news: EncodedNews, since: str) -> bytes:
+    """
+    JSON de `NewsDeltaResponse`: las noticias nuevas o modificadas desde el
+    snapshot de `since` y los IDs eliminados. Si el cursor ya no está en el
+    historial (otro worker, lote desalojado), va el lote completo con `full`.
+    """
+    previous = news.history.get(since)
+    if previous is None:
+        changed, removed = news.item_chunks, []
+    else:
+        before, current = unpack_snapshot(previous), unpack_snapshot(news.snapshot)
+        changed = [
+            chunk
+            for (item_id, digest), chunk in zip(current.items(), news.item_chunks)
+            if before.get(item_id) != digest
+        ]
+        removed = [item_id for item_id in before if item_id not in current]
+    
+    return b"".join((
+        b'{"success":true,"location":',
+        json.dumps(location_string, ensure_ascii=False).encode("utf-8"),
+        b',"generated_at":"',
+        news.generated_at.encode("ascii"),
+        b'","version":',
+        str(news.version).encode("ascii"),
+        b',"cursor":"',
+        news.cursor.encode("ascii"),
+        b'","since":',
+        json.dumps(since).encode("utf-8"),
+        b',"full":',
+        b"true" if previous is None else b"false",
+        b',"total_news":',
+        str(news.total).encode("ascii"),
+        b',"news":[',
+        b",".join(changed),
+        b'],"removed":',
+        json.dumps(removed).encode("ascii"),
+        b"}"
+    ))
+
+
+def _news_response(
+    request: Request,
+    location_string: str,
+    news: EncodedNews,
+    headers: Dict[str, str],
+    since: Optional[str] = None
+) -> Response:
+    """
+    Respuesta de `/news/`. Comprimida, se guarda junto al lote cacheado:
+    los siguientes aciertos de caché no vuelven a comprimir. Con `since`
+    se responde solo el delta (lo comprime el middleware si hace falta).
+    """
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if since is not None:
+        with span("serialization"):
+            body = _delta_body(location_string, news, since)
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    
+    if encoding is not None and len(news.items_json) >= settings.compression_min_bytes:
+        body = news.get_variant(location_string, encoding)
+        if body is None:
+            with span("serialization"):
+                body = compress(_news_body(location_string, news), encoding, dense=True)
+            news.set_variant(location_string, encoding, body)
+        headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    with span("serialization"):
+        body = _news_body(location_string, news)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _ndjson(data: dict) -> bytes:
+    with span("serialization"):
+        return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _error_status(e: BaseException) -> Tuple[int, str]:
+    """Código de estado y detalle para un error ocurrido en medio de un stream"""
+    if isinstance(e, ValueError):
+        return 400, str(e)
+    if isinstance(e, ConnectionError):
+        return 503, f"Error de conexión: {str(e)}"
+    if isinstance(e, TimeoutError):
+        return 504, f"Tiempo de espera agotado: {str(e)}"
+    return 500, f"Error interno: {str(e)}"
+
+
+async def _stream_news_lines(
+    location_string: str,
+    limit: int,
+    categories: Optional[List[NewsCategory]],
+    language: str,
+    coordinates: Optional[Tuple[float, float]] = None
+) -> AsyncIterator[bytes]:
+    """
+    Emite las noticias en NDJSON: una línea `meta`, una línea `news` por
+    noticia y una línea final `end` (o `error` si la generación falla).
+    """
+    yield _ndjson({
+        "type": "meta",
+        "location": location_string,
+        "generated_at": datetime.utcnow().isoformat()
+    })
+    
+    total = 0
+    try:
+        async for item in news_service.stream_news(
+            location=location_string,
+            limit=limit,
+            categories=categories,
+            language=language,
+            coordinates=coordinates
+        ):
+            total += 1
+            yield _ndjson({"type": "news", "news": item.model_dump(mode="json")})
+    
+    except Exception as e:
+        status_code, detail = _error_status(e)
+        yield _ndjson({"type": "error", "status_code": status_code, "detail": detail})
+        return
+    
+    yield _ndjson({"type": "end", "total_news": total})
+
+
+STREAM_RESPONSES = {
+    200: {
+        "description": "Noticias en streaming (NDJSON), una por línea",
+        "content": {
+            NDJSON_MEDIA_TYPE: {
+                "example": (
+                    '{"type": "meta", "location": "Santiago, Chile", "generated_at": "2024-01-22T15:30:00"}\n'
+                    '{"type": "news", "news": {"id": 1, "title": "Metro anuncia nueva extensión", ...}}\n'
+                    '{"type": "end", "total_news": 1}\n'
+                )
+            }
+        }
+    },
+    400: {"description": "Error en los parámetros de la solicitud", "model": ErrorResponse},
+    429: {"description": "Cuota del cliente agotada o servicio saturado (ver `Retry-After`)", "model": ErrorResponse},
+    503: {"description": "Servicio de geolocalización no disponible", "model": ErrorResponse}
+}
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses=STREAM_RESPONSES,
+    summary="Noticias en streaming por ubicación automática",
+    description="Igual que `GET /news/`, pero emite cada noticia apenas es generada (NDJSON)."
+)
+async def stream_news(
+    request: Request,
+    limit: int = Query(default=10, ge=1, le=20, description="Número máximo de noticias a retornar"),
+    categories: Optional[List[NewsCategory]] = Query(default=None, description="Filtrar por categorías específicas"),
+    language: str = Query(default="es", description="Código de idioma para las noticias")
+):
+    """
+    Emite las noticias de la ubicación detectada a medida que Gemini las genera.
+    
+    Las noticias cacheadas se envían primero.
+    """
+    try:
+        location = await geolocation_service.get_location_by_ip(_client_ip(request))
+        location_string = geolocation_service.format_location_string(location)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Error de valor: {str(e)}")
+    except ConnectionError as e:
+        raise HTTPException(status_code=503, detail=f"Error de conexión: {str(e)}")
+    
+    admission = await _hold_admission(_admission(request, location_string, limit, categories, language))
+    return StreamingResponse(
+        _admitted_lines(
+            admission,
+            _stream_news_lines(location_string, limit, categories, language, _coordinates(location))
+        ),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    responses=STREAM_RESPONSES,
+    summary="Noticias en streaming con ubicación personalizada",
+    description="Igual que `POST /news/`, pero emite cada noticia apenas es generada (NDJSON)."
+)
+async def stream_news_custom_location(request: Request, news_request: NewsRequest):
+    """
+    Emite las noticias de una ubicación manual a medida que Gemini las genera.
+    """
+    try:
+        location_string = _custom_location_string(news_request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    admission = await _hold_admission(_admission(
+        request, location_string, news_request.limit, news_request.categories, news_request.language
+    ))
+    return StreamingResponse(
+        _admitted_lines(
+            admission,
+            _stream_news_lines(
+                location_string,
+                news_request.limit,
+                news_request.categories,
+                news_request.language
+            )
+        ),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+async def _batch_news_lines(queries: List[Tuple[NewsRequest, Optional[str], Optional[str]]]) -> AsyncIterator[bytes]:
+    """
+    Emite una línea `result` por petición del batch (con su `index` y su
+    propio `status_code`) y una línea final `end` con el resumen.
+    
+    Cada query es (request, ubicación, error); las inválidas se responden primero.
+    """
+    valid = []
+    failed = 0
+    for index, (news_request, location_string, error) in enumerate(queries):
+        if error is not None:
+            failed += 1
+            yield _ndjson({"type": "result", "index": index, "status_code": 400, "detail": error})
+        else:
+            valid.append((index, location_string, news_request))
+    
+    unique = 0
+    async for result in batch_news_runner.run([(location, req) for _, location, req in valid]):
+        unique += 1
+        for position, limit in result.entry.requests:
+            line = {
+                "type": "result",
+                "index": valid[position][0],
+                "location": result.entry.location,
+            }
+            if result.error is not None:
+                failed += 1
+                status_code, detail = _error_status(result.error)
+                line.update(status_code=status_code, detail=detail)
+            else:
+                news = result.items[:limit]
+                line.update(
+                    status_code=200,
+                    source=result.source,
+                    total_news=len(news),
+                    news=[item.model_dump(mode="json") for item in news]
+                )
+            yield _ndjson(line)
+    
+    yield _ndjson({
+        "type": "end",
+        "total_requests": len(queries),
+        "unique_locations": unique,
+        "failed": failed
+    })
+
+
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Un resultado por petición (NDJSON), a medida que están listos",
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "example": (
+                        '{"type": "result", "index": 1, "location": "Lima, Perú", "status_code": 200, "source": "cache", "total_news": 5, "news": [...]}\n'
+                        '{"type": "result", "index": 0, "location": "Santiago, Chile", "status_code": 504, "detail": "Tiempo de espera agotado: ..."}\n'
+                        '{"type": "end", "total_requests": 2, "unique_locations": 2, "failed": 1}\n'
+                    )
+                }
+            }
+        },
+        400: {"description": "Batch demasiado grande", "model": ErrorResponse},
+        429: {"description": "Cuota del cliente agotada o servicio saturado (ver `Retry-After`)", "model": ErrorResponse}
+    },
+    summary="Noticias para varias ubicaciones",
+    description=(
+        "Recibe una lista de peticiones y emite en NDJSON el resultado de cada una, "
+        "con su propio código de estado. Las ubicaciones repetidas se generan una sola vez."
+    )
+)
+async def get_news_batch(request: Request, batch_request: NewsBatchRequest):
+    """
+    Obtiene noticias para muchas ubicaciones en una sola llamada.
+    
+    Los aciertos de caché salen primero; el resto se genera con concurrencia
+    acotada y, cuando conviene, agrupando varias ubicaciones en un mismo prompt.
+    Los resultados no llegan en orden: usa `index` para asociarlos.
+    
+    Cada ubicación única que no está en caché gasta un token de la cuota del cliente.
+    """
+    if len(batch_request.requests) > settings.news_batch_max_requests:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El batch admite como máximo {settings.news_batch_max_requests} peticiones"
+        )
+    
+    queries = []
+    for news_request in batch_request.requests:
+        try:
+            queries.append((news_request, _custom_location_string(news_request), None))
+        except ValueError as e:
+            queries.append((news_request, None, str(e)))
+    
+    cost = batch_news_runner.uncached(
+        [(location, news_request) for news_request, location, error in queries if error is None]
+    )
+    admission = await _hold_admission(_client_admission(request, cost=cost))
+    return StreamingResponse(
+        _admitted_lines(admission, _batch_news_lines(queries)),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
 @router.get(
     "/location",
     response_model=LocationResponse,
@@ -211,11 +712,7 @@ async def get_detected_location(request: Request):
     Útil para debugging y verificar qué ubicación está usando el sistema.
     """
     try:
-        client_ip = request.client.host
-        
-        if client_ip in ["127.0.0.1", "localhost", "::1"]:
-            client_ip = None
-        
+        client_ip = _client_ip(request)
         location = await geolocation_service.get_location_by_ip(client_ip)
         return location
         
@@ -223,17 +720,32 @@ async def get_detected_location(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# `/categories` es estático: el cuerpo y su ETag se arman una sola vez
+CATEGORIES_JSON = json.dumps(
+    [{"value": category.value, "name": category.name} for category in NewsCategory],
+    ensure_ascii=False
+).encode("utf-8")
+CATEGORIES_ETAG = f'"{hashlib.blake2b(CATEGORIES_JSON, digest_size=12).hexdigest()}"'
+
+
 @router.get(
     "/categories",
     response_model=List[dict],
+    responses={304: {"description": "Las categorías no cambiaron (`If-None-Match`)"}},
     summary="Listar categorías disponibles",
     description="Retorna todas las categorías de noticias disponibles para filtrar."
 )
-async def get_categories():
+async def get_categories(request: Request):
     """
     Lista todas las categorías de noticias disponibles.
+    
+    La respuesta es pública y cacheable en el CDN.
     """
-    return [
-        {"value": category.value, "name": category.name}
-        for category in NewsCategory
-    ]
\ No newline at end of file
+    headers = {
+        "ETag": CATEGORIES_ETAG,
+        "Cache-Control": f"public, max-age={settings.categories_max_age_seconds}",
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, CATEGORIES_ETAG):
+        return Response(status_code=304, headers=headers)
+    return Response(content=CATEGORIES_JSON, media_type="application/json", headers=headers)
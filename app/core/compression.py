@@ -0,0 +1,84 @@
+import gzip
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+
+
+def _gzip(level: int) -> Callable[[bytes], bytes]:
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(quality: int) -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def _zstd(level: int) -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    compressor = zstandard.ZstdCompressor(level=level)
+    return compressor.compress
+
+
+def _available(codecs: Dict[str, Optional[Callable[[bytes], bytes]]]) -> Dict[str, Callable[[bytes], bytes]]:
+    # brotli y zstd son opcionales: si el paquete no está, solo se ofrece gzip
+    return {name: codec for name, codec in codecs.items() if codec is not None}
+
+
+# Respuestas dinámicas: niveles rápidos, se comprimen en cada petición
+FAST_CODECS = _available({"br": _brotli(5), "zstd": _zstd(3), "gzip": _gzip(6)})
+# Variantes que quedan en caché: se comprimen una vez, conviene el mejor ratio
+DENSE_CODECS = _available({"br": _brotli(9), "zstd": _zstd(12), "gzip": _gzip(9)})
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Elige la codificación según `Accept-Encoding` (con sus q-values) y el
+    orden de preferencia de `settings.compression_encodings`. None = sin comprimir.
+    """
+    if not settings.compression_enabled or not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for name in settings.compression_encodings.split(","):
+        name = name.strip().lower()
+        if name not in FAST_CODECS:
+            continue
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(data: bytes, encoding: str, dense: bool = False) -> bytes:
+    codecs = DENSE_CODECS if dense else FAST_CODECS
+    return codecs[encoding](data)
@@ -1,5 +1,7 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -8,11 +10,148 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = False
     
+    # Logging (JSON por línea; las respuestas crudas de Gemini se muestrean en DEBUG)
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_payload_sample_rate: float = 0.01
+    log_payload_max_chars: int = 2000
+    
     # API Keys
     gemini_api_key: str
     
     # Geolocation
+    # Backend: "http" (ip-api.com), "csv" (tabla de rangos local) o "mmdb" (MaxMind/DB-IP)
+    geolocation_backend: str = "http"
+    geolocation_db_path: Optional[str] = None
+    geolocation_db_language: str = "es"
+    geolocation_http_fallback: bool = True
     geolocation_api_url: str = "http://ip-api.com/json"
+    geolocation_timeout_seconds: float = 10.0
+    geolocation_max_connections: int = 20
+    geolocation_cache_ttl_seconds: float = 3600.0
+    geolocation_negative_ttl_seconds: float = 300.0
+    geolocation_cache_max_entries: int = 10000
+    
+    # Índice de lugares canónicos (JSON con alias y coordenadas, se suma a los incluidos)
+    location_index_path: Optional[str] = None
+    
+    # Gemini
+    gemini_model: str = "models/gemini-flash-latest"
+    gemini_temperature: float = 0.7
+    # Modelo rápido para el nivel "fast first" y, con enrutamiento, para peticiones chicas
+    gemini_fast_model: str = "models/gemini-flash-lite-latest"
+    gemini_fast_temperature: float = 0.5
+    gemini_routing_enabled: bool = False
+    gemini_fast_max_limit: int = 6
+    # Holgura sobre los tokens medidos por noticia al fijar max_output_tokens
+    gemini_output_token_headroom: float = 1.5
+    gemini_latency_budget_seconds: float = 15.0
+    gemini_error_budget: float = 0.3
+    gemini_max_concurrency: int = 4
+    gemini_timeout_seconds: float = 30.0
+    gemini_structured_output: bool = True
+    
+    # Costos (USD por millón de tokens) para la contabilidad de uso
+    gemini_input_cost_per_million: float = 0.30
+    gemini_output_cost_per_million: float = 2.50
+    gemini_fast_input_cost_per_million: float = 0.10
+    gemini_fast_output_cost_per_million: float = 0.40
+    gemini_cached_input_cost_ratio: float = 0.25
+    usage_max_keys: int = 500
+    
+    # Context caching de las instrucciones fijas del prompt (requiere que
+    # superen el mínimo de tokens cacheables del modelo)
+    gemini_context_cache_enabled: bool = False
+    gemini_context_cache_ttl_seconds: int = 3600
+    
+    # Resiliencia de Gemini
+    gemini_deadline_seconds: float = 45.0
+    gemini_max_retries: int = 2
+    gemini_retry_budget_ratio: float = 0.2
+    gemini_retry_backoff_base_seconds: float = 0.5
+    gemini_retry_backoff_max_seconds: float = 4.0
+    gemini_hedge_enabled: bool = False
+    gemini_hedge_percentile: float = 95.0
+    gemini_hedge_min_samples: int = 20
+    gemini_breaker_failure_threshold: int = 5
+    gemini_breaker_recovery_seconds: float = 30.0
+    
+    # News cache
+    news_cache_ttl_seconds: float = 300.0
+    news_cache_stale_seconds: float = 600.0
+    news_cache_max_bytes: int = 50 * 1024 * 1024
+    # Control de admisión de `/news/`: las peticiones que no salen del caché
+    # pasan por una cuota por cliente y un tope global con cola acotada (429)
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 32
+    admission_max_queue: int = 64
+    admission_queue_timeout_seconds: float = 10.0
+    admission_ip_rate_per_minute: float = 30.0
+    admission_ip_burst: int = 10
+    admission_key_rate_per_minute: float = 120.0
+    admission_key_burst: int = 30
+    admission_max_clients: int = 10000
+    admission_api_key_header: str = "X-API-Key"
+    # API keys con cuota propia, separadas por comas; las demás se cobran a la IP
+    admission_api_keys: str = ""
+    
+    # Cache HTTP: `/categories` es estático y se puede cachear en el CDN
+    categories_max_age_seconds: int = 86400
+    
+    # Compresión de respuestas (br y zstd solo si están instalados brotli / zstandard)
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+    compression_encodings: str = "br,zstd,gzip"
+    # "Fast first": el modelo rápido responde las primeras noticias y el
+    # modelo estándar completa el lote en segundo plano (queda en caché)
+    news_fast_first_enabled: bool = False
+    news_fast_first_items: int = 3
+    
+    # Generación en paralelo por categoría
+    news_fanout_enabled: bool = False
+    news_fanout_min_categories: int = 2
+    news_fanout_chunk_size: int = 1
+    news_fanout_title_similarity: float = 0.85
+    
+    # Store persistente de lotes (compartido entre workers y reinicios)
+    news_store_enabled: bool = True
+    news_store_url: str = "sqlite:///./news_store.db"
+    news_store_retention_seconds: float = 86400.0
+    news_store_lease_seconds: float = 60.0
+    news_store_wait_seconds: float = 20.0
+    news_store_poll_seconds: float = 0.5
+    
+    # Reutilización de lotes de ubicaciones cercanas
+    news_proximity_enabled: bool = True
+    news_proximity_radius_km: float = 5.0
+    news_proximity_same_region: bool = False
+    
+    # Endpoint batch (muchas ubicaciones por llamada)
+    news_batch_max_requests: int = 200
+    news_batch_max_concurrency: int = 4
+    news_batch_pack_enabled: bool = True
+    news_batch_pack_size: int = 4
+    news_batch_pack_max_limit: int = 5
+    
+    # Pre-calentamiento de las ubicaciones más pedidas
+    prewarm_enabled: bool = True
+    prewarm_top_n: int = 30
+    prewarm_calls_per_minute: float = 10.0
+    prewarm_interval_seconds: float = 15.0
+    prewarm_lookahead_seconds: float = 60.0
+    prewarm_jitter_seconds: float = 5.0
+    prewarm_half_life_seconds: float = 1800.0
+    prewarm_min_score: float = 3.0
+    
+    @model_validator(mode="after")
+    def check_fanout(self) -> "Settings":
+        # Con grupos tan grandes como el mínimo, cada grupo se volvería a dividir;
+        # sin fan-out estos valores no se usan y no deben impedir el arranque
+        if self.news_fanout_enabled and self.news_fanout_chunk_size >= self.news_fanout_min_categories:
+            raise ValueError(
+                "news_fanout_chunk_size debe ser menor que news_fanout_min_categories"
+            )
+        return self
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,123 @@
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+
+# ID de correlación de la petición en curso (lo asigna RequestIdMiddleware)
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Atributos estándar de LogRecord; el resto viene de `extra=` y se emite como campo
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Copia el ID de correlación al record en el thread que loguea (antes de encolar)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea, con los campos de `extra=` al primer nivel"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            data["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legible para desarrollo local"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+
+class _PreformattedQueueHandler(QueueHandler):
+    """
+    Encola el record sin formatearlo: el formato (y el JSON) se arma en el
+    thread del listener, fuera del event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging() -> None:
+    """
+    Configura el logging de la app: los records se encolan en el event loop
+    y un thread aparte los formatea y escribe en stdout.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if settings.log_json else TextFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _PreformattedQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.log_level.upper())
+
+    # uvicorn trae sus propios handlers; se unifican con los de la app
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola y detiene el thread de logging"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_payload(logger: logging.Logger, message: str, payload: str, **fields) -> None:
+    """
+    Loguea payloads grandes (p. ej. la respuesta cruda de Gemini) solo en una
+    fracción de las llamadas y truncados, para no inundar los logs.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if random.random() >= settings.log_payload_sample_rate:
+        return
+    limit = settings.log_payload_max_chars
+    logger.debug(
+        message,
+        extra={
+            **fields,
+            "payload": payload[:limit],
+            "payload_chars": len(payload),
+            "truncated": len(payload) > limit,
+        }
+    )
@@ -0,0 +1,149 @@
+import re
+import time
+import uuid
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import compress, is_compressible, negotiate
+from app.core.config import settings
+from app.core.logging import request_id
+from app.services.metrics import http_duration, http_in_flight, http_requests
+from app.services.usage import current_endpoint
+
+
+class UsageContextMiddleware:
+    """Marca cada petición con su endpoint para atribuirle el consumo de Gemini"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_endpoint.set(f"{scope['method']} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_endpoint.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Cuenta las peticiones HTTP y mide su duración hasta el último byte
+    (en streaming incluye toda la generación).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            # La plantilla de la ruta (no la URL) mantiene acotadas las etiquetas
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_duration.observe(time.perf_counter() - started, method=scope["method"], path=path)
+            http_requests.inc(method=scope["method"], path=path, status=str(status))
+
+
+class RequestIdMiddleware:
+    """
+    Asigna un ID de correlación a cada petición: el del header `X-Request-ID`
+    si viene uno válido, o uno nuevo. Se incluye en los logs y en la respuesta.
+    """
+
+    HEADER = "x-request-id"
+    VALID_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(self.HEADER.encode(), b"").decode("latin-1")
+        current = incoming if self.VALID_ID.match(incoming) else uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.HEADER] = current
+            await send(message)
+
+        token = request_id.set(current)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
+
+
+class CompressionMiddleware:
+    """
+    Comprime las respuestas según `Accept-Encoding` (br, zstd o gzip).
+
+    Solo comprime respuestas completas de tipos de texto/JSON sobre el
+    umbral mínimo; los streams NDJSON pasan tal cual para no retrasar cada
+    línea. Si la respuesta ya trae `Content-Encoding` (p. ej. una variante
+    cacheada de `/news/`) no se toca.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1"))
+        start: Optional[Message] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Se retiene hasta ver el cuerpo: los headers dependen de si se comprime
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            headers = MutableHeaders(scope=held)
+            body = message.get("body", b"")
+            streaming = message.get("more_body", False)
+
+            if is_compressible(headers.get("content-type")) and "content-encoding" not in headers and not streaming:
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding is not None and len(body) >= settings.compression_min_bytes:
+                    body = compress(body, encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+
+            await send(held)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,7 @@
+from .news_batch import get_news_batch, save_news_batch, store_key
+
+__all__ = [
+    "get_news_batch",
+    "save_news_batch",
+    "store_key"
+]
@@ -0,0 +1,53 @@
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.db.base import NewsStore
+from app.models.news_batch import NewsBatchRecord
+from app.schemas.news import NewsItem
+
+if TYPE_CHECKING:
+    # news_cache importa este módulo: la llave solo hace falta para los tipos
+    from app.services.news_cache import CacheKey
+
+news_list_adapter = TypeAdapter(List[NewsItem])
+
+
+def store_key(key: "CacheKey") -> str:
+    """Serializa la llave de caché (ubicación, categorías, idioma) para el store"""
+    location, categories, language = key
+    return f"{location}|{','.join(categories)}|{language}"
+
+
+async def get_news_batch(
+    store: NewsStore,
+    key: "CacheKey"
+) -> Optional[Tuple[List[NewsItem], NewsBatchRecord]]:
+    """Lee un lote del store y lo valida como lista de NewsItem"""
+    record = await store.get(store_key(key))
+    if record is None:
+        return None
+    return news_list_adapter.validate_json(record.items_json), record
+
+
+async def save_news_batch(
+    store: NewsStore,
+    key: "CacheKey",
+    items: List[NewsItem],
+    limit: int,
+    ttl: float
+) -> NewsBatchRecord:
+    """Guarda un lote recién generado con su timestamp de generación"""
+    location, categories, language = key
+    record = NewsBatchRecord(
+        key=store_key(key),
+        location=location,
+        categories=categories,
+        language=language,
+        limit=limit,
+        items_json=news_list_adapter.dump_json(items).decode("utf-8"),
+        generated_at=time.time()
+    )
+    await store.put(record, ttl)
+    return record
@@ -0,0 +1,8 @@
+from .base import NewsStore
+from .session import create_news_store, news_store
+
+__all__ = [
+    "NewsStore",
+    "create_news_store",
+    "news_store"
+]
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.models.news_batch import NewsBatchRecord
+
+
+class NewsStore(ABC):
+    """
+    Interfaz del store persistente de lotes de noticias.
+
+    Lo comparten todos los workers (y sobrevive a reinicios), así que una
+    generación hecha por un worker le sirve a los demás.
+    """
+
+    async def startup(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[NewsBatchRecord]:
+        """Retorna el lote guardado, o None si no existe o ya venció"""
+
+    @abstractmethod
+    async def put(self, record: NewsBatchRecord, ttl: float) -> None:
+        """Guarda el lote; `ttl` indica cuánto tiempo vale la pena conservarlo"""
+
+    @abstractmethod
+    async def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """
+        Intenta reservar la generación de una llave entre workers.
+        Retorna False si otro worker la tiene reservada y no ha vencido.
+        """
+
+    @abstractmethod
+    async def release_lease(self, key: str, owner: str) -> None:
+        """Libera la reserva si todavía es de `owner`"""
@@ -0,0 +1,97 @@
+import json
+from typing import Optional
+
+from app.db.base import NewsStore
+from app.models.news_batch import NewsBatchRecord
+
+
+class RedisNewsStore(NewsStore):
+    """
+    Store compartido en Redis, para varias instancias detrás de un balanceador.
+
+    Requiere el paquete `redis` (pip install redis).
+    """
+
+    PREFIX = "news_near_me:"
+
+    # Compara y borra en un solo paso: entre un GET y un DEL la reserva
+    # podría vencer y pasar a otro worker
+    RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+
+    async def startup(self) -> None:
+        if self._client is not None:
+            return
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError(
+                "El store 'redis' requiere el paquete redis (pip install redis)"
+            )
+        self._client = redis.from_url(self.url)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self):
+        if self._client is None:
+            await self.startup()
+        return self._client
+
+    async def get(self, key: str) -> Optional[NewsBatchRecord]:
+        client = await self._get_client()
+        raw = await client.get(f"{self.PREFIX}batch:{key}")
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return NewsBatchRecord(
+            key=data["key"],
+            location=data["location"],
+            categories=tuple(data["categories"]),
+            language=data["language"],
+            limit=data["limit"],
+            items_json=data["items_json"],
+            generated_at=data["generated_at"]
+        )
+
+    async def put(self, record: NewsBatchRecord, ttl: float) -> None:
+        client = await self._get_client()
+        data = {
+            "key": record.key,
+            "location": record.location,
+            "categories": list(record.categories),
+            "language": record.language,
+            "limit": record.limit,
+            "items_json": record.items_json,
+            "generated_at": record.generated_at,
+        }
+        await client.set(
+            f"{self.PREFIX}batch:{record.key}",
+            json.dumps(data, ensure_ascii=False),
+            ex=max(int(ttl), 1)
+        )
+
+    async def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        client = await self._get_client()
+        acquired = await client.set(
+            f"{self.PREFIX}lease:{key}",
+            owner,
+            nx=True,
+            px=max(int(ttl * 1000), 1)
+        )
+        return bool(acquired)
+
+    async def release_lease(self, key: str, owner: str) -> None:
+        client = await self._get_client()
+        # Solo se libera si la reserva sigue siendo nuestra
+        await client.eval(self.RELEASE_SCRIPT, 1, f"{self.PREFIX}lease:{key}", owner)
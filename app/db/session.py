@@ -0,0 +1,26 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.db.base import NewsStore
+
+
+def create_news_store(url: str) -> NewsStore:
+    """
+    Crea el store según la URL:
+
+    - `sqlite:///ruta/al/archivo.db` (por defecto): archivo local en modo WAL,
+      compartido por los workers de una misma máquina.
+    - `redis://host:puerto/db`: servidor compartido entre máquinas.
+    """
+    if url.startswith("sqlite:///"):
+        from app.db.sqlite_store import SqliteNewsStore
+        return SqliteNewsStore(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://")):
+        from app.db.redis_store import RedisNewsStore
+        return RedisNewsStore(url)
+    raise ValueError(f"URL de store no soportada: {url}")
+
+
+news_store: Optional[NewsStore] = (
+    create_news_store(settings.news_store_url) if settings.news_store_enabled else None
+)
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.db.base import NewsStore
+from app.models.news_batch import NewsBatchRecord
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_batches (
+    key TEXT PRIMARY KEY,
+    location TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    language TEXT NOT NULL,
+    item_limit INTEGER NOT NULL,
+    items TEXT NOT NULL,
+    generated_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS news_batches_expires_at ON news_batches (expires_at);
+CREATE TABLE IF NOT EXISTS generation_leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SqliteNewsStore(NewsStore):
+    """
+    Store en un archivo SQLite local en modo WAL.
+
+    WAL permite que varios workers lean mientras uno escribe. Las consultas
+    son bloqueantes, así que corren en un thread para no frenar el event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    async def _run(self, func, *args):
+        def call():
+            with self._lock:
+                if self._conn is None:
+                    self._conn = self._connect()
+                return func(self._conn, *args)
+        return await asyncio.to_thread(call)
+
+    async def startup(self) -> None:
+        await self._run(lambda conn: None)
+
+    async def close(self) -> None:
+        def close():
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+        await asyncio.to_thread(close)
+
+    async def get(self, key: str) -> Optional[NewsBatchRecord]:
+        def query(conn: sqlite3.Connection):
+            return conn.execute(
+                "SELECT key, location, categories, language, item_limit, items, generated_at "
+                "FROM news_batches WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+        row = await self._run(query)
+        if row is None:
+            return None
+        return NewsBatchRecord(
+            key=row[0],
+            location=row[1],
+            categories=tuple(json.loads(row[2])),
+            language=row[3],
+            limit=row[4],
+            items_json=row[5],
+            generated_at=row[6]
+        )
+
+    async def put(self, record: NewsBatchRecord, ttl: float) -> None:
+        def upsert(conn: sqlite3.Connection):
+            conn.execute(
+                "INSERT OR REPLACE INTO news_batches "
+                "(key, location, categories, language, item_limit, items, generated_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.key,
+                    record.location,
+                    json.dumps(list(record.categories), ensure_ascii=False),
+                    record.language,
+                    record.limit,
+                    record.items_json,
+                    record.generated_at,
+                    record.generated_at + ttl
+                )
+            )
+            # Limpieza oportunista de lotes que ya no sirven ni como respaldo
+            conn.execute("DELETE FROM news_batches WHERE expires_at < ?", (time.time(),))
+
+        await self._run(upsert)
+
+    async def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        def acquire(conn: sqlite3.Connection) -> bool:
+            now = time.time()
+            cursor = conn.execute(
+                "INSERT INTO generation_leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE generation_leases.expires_at < ? OR generation_leases.owner = excluded.owner",
+                (key, owner, now + ttl, now)
+            )
+            return cursor.rowcount > 0
+
+        return await self._run(acquire)
+
+    async def release_lease(self, key: str, owner: str) -> None:
+        await self._run(
+            lambda conn: conn.execute(
+                "DELETE FROM generation_leases WHERE key = ? AND owner = ?",
+                (key, owner)
+            )
+        )
@@ -1,8 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    RequestIdMiddleware,
+    UsageContextMiddleware
+)
+from app.db.session import news_store
+from app.services import gemini_service, geolocation_service, prewarm_scheduler
+from app.services.metrics import registry
+from app.services.service_metrics import register_service_metrics
+
+
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Abre y cierra los recursos compartidos de la app"""
+    setup_logging()
+    # El SDK de Gemini se carga en segundo plano: health responde sin esperarlo
+    sdk_warm_up = asyncio.create_task(asyncio.to_thread(gemini_service.warm_up))
+    # El schema de OpenAPI se arma una vez aquí y no en la primera visita a /docs
+    app.openapi()
+    await geolocation_service.startup()
+    if news_store is not None:
+        await news_store.startup()
+    if settings.prewarm_enabled:
+        await prewarm_scheduler.start()
+    yield
+    await sdk_warm_up
+    await prewarm_scheduler.stop()
+    await geolocation_service.shutdown()
+    if news_store is not None:
+        await news_store.close()
+    shutdown_logging()
+
 
 app = FastAPI(
     title=settings.app_name,
@@ -34,6 +74,7 @@ Para soporte o consultas: tu-email@ejemplo.com
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
     contact={
         "name": "Tu Nombre",
         "url": "https://tu-sitio-web.com",
@@ -113,6 +154,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresión negociada (gzip siempre; br/zstd si están instalados)
+app.add_middleware(CompressionMiddleware)
+
+# Correlación de logs, métricas HTTP y atribución del consumo de Gemini a cada endpoint
+app.add_middleware(UsageContextMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+register_service_metrics()
+
 # Incluir rutas
 app.include_router(api_router, prefix="/api/v1")
 
@@ -134,4 +184,10 @@ async def root():
             "redoc": "/redoc",
             "openapi_json": "/api/v1/openapi.json"
         }
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas en el formato de texto de Prometheus"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
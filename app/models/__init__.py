@@ -0,0 +1,5 @@
+from .news_batch import NewsBatchRecord
+
+__all__ = [
+    "NewsBatchRecord"
+]
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass
+class NewsBatchRecord:
+    """Lote de noticias generado, tal como se guarda en el store persistente"""
+    key: str
+    location: str
+    categories: Tuple[str, ...]
+    language: str
+    limit: int
+    items_json: str
+    generated_at: float  # epoch (time.time())
@@ -3,7 +3,9 @@ from .news import (
     NewsCategory,
     NewsItem,
     NewsRequest,
+    NewsBatchRequest,
     NewsResponse,
+    NewsDeltaResponse,
     ErrorResponse
 )
 
@@ -14,6 +16,8 @@ __all__ = [
     "NewsCategory",
     "NewsItem",
     "NewsRequest",
+    "NewsBatchRequest",
     "NewsResponse",
+    "NewsDeltaResponse",
     "ErrorResponse"
 ]
\ No newline at end of file
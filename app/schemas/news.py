@@ -78,6 +78,29 @@ class NewsRequest(BaseModel):
         default="es", 
         description="Idioma de las noticias"
     )
+    since: Optional[str] = Field(
+        None, 
+        description="Cursor de una respuesta anterior: retorna solo los cambios desde entonces"
+    )
+
+
+class NewsBatchRequest(BaseModel):
+    """Request con varias ubicaciones para obtener noticias en una sola llamada"""
+    requests: List[NewsRequest] = Field(
+        ..., 
+        min_length=1, 
+        description="Peticiones de noticias, una por ubicación"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {"city": "Santiago", "country": "Chile", "limit": 5},
+                    {"city": "Lima", "country": "Perú", "limit": 5}
+                ]
+            }
+        }
 
 
 class NewsResponse(BaseModel):
@@ -88,6 +111,8 @@ class NewsResponse(BaseModel):
         default_factory=datetime.utcnow, 
         description="Fecha de generación"
     )
+    version: Optional[int] = Field(None, description="Versión del lote de noticias de esta ubicación")
+    cursor: Optional[str] = Field(None, description="Cursor para pedir solo los cambios con `since`")
     total_news: int = Field(..., description="Total de noticias encontradas")
     news: List[NewsItem] = Field(..., description="Lista de noticias")
     
@@ -97,12 +122,47 @@ class NewsResponse(BaseModel):
                 "success": True,
                 "location": "Santiago, Región Metropolitana, Chile",
                 "generated_at": "2024-01-22T10:30:00Z",
+                "version": 3,
+                "cursor": "5f2c0e9a1b7d4c3e8a6f0b12",
                 "total_news": 5,
                 "news": []
             }
         }
 
 
+class NewsDeltaResponse(BaseModel):
+    """Response con los cambios desde el cursor `since`"""
+    success: bool = Field(..., description="Si la operación fue exitosa")
+    location: str = Field(..., description="Ubicación usada para la búsqueda")
+    generated_at: datetime = Field(..., description="Fecha de generación del lote actual")
+    version: int = Field(..., description="Versión del lote actual")
+    cursor: str = Field(..., description="Cursor del lote actual (para el próximo `since`)")
+    since: str = Field(..., description="Cursor recibido")
+    full: bool = Field(
+        ..., 
+        description="Si el cursor ya no está disponible y `news` trae el lote completo"
+    )
+    total_news: int = Field(..., description="Total de noticias en el lote actual")
+    news: List[NewsItem] = Field(..., description="Noticias nuevas o modificadas")
+    removed: List[int] = Field(default_factory=list, description="IDs de noticias que ya no están")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "success": True,
+                "location": "Santiago, Región Metropolitana, Chile",
+                "generated_at": "2024-01-22T10:35:00Z",
+                "version": 4,
+                "cursor": "9d41b6e07a3f2c5d8e1b4a70",
+                "since": "5f2c0e9a1b7d4c3e8a6f0b12",
+                "full": False,
+                "total_news": 5,
+                "news": [],
+                "removed": [183927461029384]
+            }
+        }
+
+
 class ErrorResponse(BaseModel):
     """Response de error"""
     success: bool = False
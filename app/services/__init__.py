@@ -1,9 +1,31 @@
 from .geolocation_service import geolocation_service, GeolocationService
 from .gemini_service import gemini_service, GeminiService
+from .location_index import location_index, LocationIndex
+from .news_cache import NewsCache
+from .news_service import news_cache, news_service, NewsService, prewarm_scheduler
+from .prewarm import PrewarmScheduler
+from .batch_news import batch_news_runner, BatchNewsRunner
+from .usage import usage_tracker, UsageTracker
+from .admission import admission_controller, AdmissionController, AdmissionRejected
 
 __all__ = [
     "geolocation_service",
     "GeolocationService",
     "gemini_service", 
-    "GeminiService"
+    "GeminiService",
+    "location_index",
+    "LocationIndex",
+    "news_cache",
+    "NewsCache",
+    "news_service",
+    "NewsService",
+    "prewarm_scheduler",
+    "PrewarmScheduler",
+    "batch_news_runner",
+    "BatchNewsRunner",
+    "usage_tracker",
+    "UsageTracker",
+    "admission_controller",
+    "AdmissionController",
+    "AdmissionRejected"
 ]
\ No newline at end of file
@@ -0,0 +1,191 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, Optional
+
+from app.core.config import settings
+from app.services.token_bucket import TokenBucket
+
+
+class AdmissionRejected(Exception):
+    """La petición no se admite: cuota agotada o cola llena (responder 429)"""
+
+    def __init__(self, reason: str, retry_after: float, detail: str):
+        super().__init__(detail)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class ClientQuotas:
+    """
+    Un token bucket por cliente (IP o API key), en un LRU acotado: los
+    clientes inactivos se olvidan, y al volver empiezan con el bucket lleno.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: float, max_clients: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def take(self, client: str, cost: float = 1) -> float:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        return bucket.take(cost=cost)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionController:
+    """
+    Control de admisión de las rutas que generan con Gemini.
+
+    - Cuota por cliente: token bucket por API key si es una de las
+      configuradas, o por IP. Una key desconocida no abre otra cuota: se
+      cobra a la IP como cualquier petición.
+    - Tope global de peticiones en generación, con una cola de espera
+      acotada; con la cola llena (o tras esperar demasiado) se rechaza.
+    - Las peticiones que el caché puede responder no pasan por aquí: no
+      gastan cuota de Gemini y no deben esperar detrás de las que sí.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        ip_quotas: ClientQuotas,
+        key_quotas: ClientQuotas,
+        api_keys: Iterable[str] = (),
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.api_keys: FrozenSet[str] = frozenset(api_keys)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.ip_quotas = ip_quotas
+        self.key_quotas = key_quotas
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Promedio móvil de la duración de una petición admitida (para Retry-After)
+        self._avg_duration = 2.0
+
+        # Métricas
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.bypassed = 0
+        self.shed: Dict[str, int] = {"ip_quota": 0, "key_quota": 0, "queue_full": 0, "queue_timeout": 0}
+
+    def _reject(self, reason: str, retry_after: float, detail: str) -> AdmissionRejected:
+        self.shed[reason] += 1
+        return AdmissionRejected(reason, retry_after, detail)
+
+    def _queue_wait_estimate(self) -> float:
+        return self._avg_duration * (self.queued + 1) / self.max_concurrency
+
+    def _check_quota(self, client_ip: Optional[str], api_key: Optional[str], cost: float = 1) -> None:
+        if api_key and api_key in self.api_keys:
+            wait = self.key_quotas.take(api_key, cost)
+            if wait:
+                raise self._reject("key_quota", wait, "Cuota de la API key agotada")
+            return
+        wait = self.ip_quotas.take(client_ip or "local", cost)
+        if wait:
+            raise self._reject("ip_quota", wait, "Demasiadas peticiones desde esta IP")
+
+    async def _acquire(self) -> None:
+        if not self._semaphore.locked():
+            # Hay un cupo libre: se toma sin esperar
+            await self._semaphore.acquire()
+            return
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full", self._queue_wait_estimate(), "Servicio saturado, intenta más tarde")
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout", self._queue_wait_estimate(), "Servicio saturado, intenta más tarde")
+        finally:
+            self.queued -= 1
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        client_ip: Optional[str],
+        api_key: Optional[str] = None,
+        cacheable: bool = False,
+        cost: float = 1
+    ) -> AsyncIterator[None]:
+        """
+        Admite la petición o lanza `AdmissionRejected` (con el `Retry-After`
+        sugerido). `cost` son los tokens de cuota que gasta (p. ej. un batch
+        paga una generación por ubicación); ocupa un solo cupo de concurrencia.
+        """
+        if not self.enabled or cacheable or cost <= 0:
+            self.bypassed += 1
+            yield
+            return
+
+        self._check_quota(client_ip, api_key, cost)
+        await self._acquire()
+
+        self.admitted += 1
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            self._avg_duration = 0.9 * self._avg_duration + 0.1 * (time.monotonic() - started)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "bypassed": self.bypassed,
+            "shed": dict(self.shed),
+            "tracked_clients": {"ip": len(self.ip_quotas), "api_key": len(self.key_quotas)},
+            "avg_duration_seconds": round(self._avg_duration, 3),
+        }
+
+
+# Singleton
+admission_controller = AdmissionController(
+    max_concurrency=settings.admission_max_concurrency,
+    max_queue=settings.admission_max_queue,
+    queue_timeout=settings.admission_queue_timeout_seconds,
+    ip_quotas=ClientQuotas(
+        rate_per_minute=settings.admission_ip_rate_per_minute,
+        burst=settings.admission_ip_burst,
+        max_clients=settings.admission_max_clients
+    ),
+    key_quotas=ClientQuotas(
+        rate_per_minute=settings.admission_key_rate_per_minute,
+        burst=settings.admission_key_burst,
+        max_clients=settings.admission_max_clients
+    ),
+    api_keys=[key.strip() for key in settings.admission_api_keys.split(",") if key.strip()],
+    enabled=settings.admission_enabled
+)
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.schemas.news import NewsItem, NewsCategory, NewsRequest
+from app.services.gemini_service import gemini_service, GeminiService
+from app.services.location_index import location_index
+from app.services.news_cache import CacheKey, make_cache_key
+from app.services.news_service import news_service, NewsService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchEntry:
+    """Una ubicación única del batch y las peticiones (índice, limit) que la pidieron"""
+    key: CacheKey
+    location: str
+    categories: Optional[List[NewsCategory]]
+    language: str
+    requests: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def limit(self) -> int:
+        return max(limit for _, limit in self.requests)
+
+
+@dataclass
+class BatchResult:
+    """Resultado de una ubicación: noticias o el error que la hizo fallar"""
+    entry: BatchEntry
+    source: str
+    items: List[NewsItem] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+
+class BatchNewsRunner:
+    """
+    Resuelve muchas peticiones de noticias en una sola llamada.
+
+    - Deduplica las peticiones por llave de caché (lugar canónico).
+    - Los aciertos de caché se entregan de inmediato.
+    - Las demás se generan con concurrencia acotada; con `pack_enabled`, las
+      ubicaciones que comparten categorías, idioma y un `limit` chico se
+      agrupan en un solo prompt multi-ubicación.
+    - Los resultados salen a medida que terminan; una ubicación que falla
+      no hace fallar el batch.
+    """
+
+    def __init__(
+        self,
+        news: NewsService,
+        gemini: GeminiService,
+        max_concurrency: int,
+        pack_enabled: bool,
+        pack_size: int,
+        pack_max_limit: int
+    ):
+        self.news = news
+        self.gemini = gemini
+        self.max_concurrency = max_concurrency
+        self.pack_enabled = pack_enabled
+        self.pack_size = pack_size
+        self.pack_max_limit = pack_max_limit
+
+        # Métricas
+        self.batches = 0
+        self.requests = 0
+        self.deduplicated = 0
+        self.cache_hits = 0
+        self.packed_prompts = 0
+        self.packed_locations = 0
+        self.pack_misses = 0
+        self.failures = 0
+
+    def _group(self, queries: Sequence[Tuple[str, NewsRequest]]) -> List[BatchEntry]:
+        entries: Dict[CacheKey, BatchEntry] = {}
+        for index, (location, request) in enumerate(queries):
+            key = make_cache_key(location, request.categories, request.language)
+            entry = entries.get(key)
+            if entry is None:
+                entry = BatchEntry(
+                    key=key,
+                    location=location,
+                    categories=request.categories,
+                    language=request.language
+                )
+                entries[key] = entry
+            entry.requests.append((index, request.limit))
+        return list(entries.values())
+
+    def plan(self, queries: Sequence[Tuple[str, NewsRequest]]) -> List[BatchEntry]:
+        """Agrupa las peticiones (ubicación, request) por llave de caché, en orden"""
+        entries = self._group(queries)
+        self.deduplicated += len(queries) - len(entries)
+        return entries
+
+    def uncached(self, queries: Sequence[Tuple[str, NewsRequest]]) -> int:
+        """Ubicaciones únicas que habría que generar (lo que cobra el control de admisión)"""
+        return sum(
+            not self.news.is_cached(entry.location, entry.limit, entry.categories, entry.language)
+            for entry in self._group(queries)
+        )
+
+    def _packs(self, entries: List[BatchEntry]) -> Tuple[List[List[BatchEntry]], List[BatchEntry]]:
+        """Separa las entradas en grupos para prompts multi-ubicación y entradas sueltas"""
+        if not self.pack_enabled or self.pack_size < 2:
+            return [], list(entries)
+
+        groups: Dict[Tuple, List[BatchEntry]] = {}
+        single: List[BatchEntry] = []
+        for entry in entries:
+            if entry.limit > self.pack_max_limit:
+                single.append(entry)
+                continue
+            # Un mismo prompt solo sirve para un mismo idioma y categorías
+            groups.setdefault((entry.key[1], entry.key[2]), []).append(entry)
+
+        packs: List[List[BatchEntry]] = []
+        for group in groups.values():
+            for start in range(0, len(group), self.pack_size):
+                chunk = group[start:start + self.pack_size]
+                if len(chunk) > 1:
+                    packs.append(chunk)
+                else:
+                    single.extend(chunk)
+        return packs, single
+
+    async def _fetch(self, entry: BatchEntry, source: str = "generated") -> BatchResult:
+        try:
+            items = await self.news.get_news(
+                location=entry.location,
+                limit=entry.limit,
+                categories=entry.categories,
+                language=entry.language
+            )
+        except Exception as e:
+            self.failures += 1
+            return BatchResult(entry=entry, source=source, error=e)
+        return BatchResult(entry=entry, source=source, items=items)
+
+    async def _fetch_pack(self, pack: List[BatchEntry]) -> List[BatchResult]:
+        limit = max(entry.limit for entry in pack)
+        self.packed_prompts += 1
+        try:
+            grouped = await self.gemini.get_news_for_locations(
+                [location_index.display_name(entry.location) for entry in pack],
+                limit=limit,
+                categories=pack[0].categories,
+                language=pack[0].language
+            )
+        except Exception as e:
+            logger.warning("Falló el prompt multi-ubicación (%d ubicaciones): %s", len(pack), e)
+            grouped = [[] for _ in pack]
+
+        results: List[BatchResult] = []
+        missing: List[BatchEntry] = []
+        for entry, items in zip(pack, grouped):
+            if len(items) < entry.limit:
+                missing.append(entry)
+                continue
+            self.packed_locations += 1
+            # El lote cubre lo que realmente llegó, no el limit más alto del grupo
+            items = await self.news.remember(entry.key, items, len(items))
+            results.append(BatchResult(entry=entry, source="packed", items=items))
+
+        # Lo que el prompt agrupado no cubrió se pide por separado
+        if missing:
+            self.pack_misses += len(missing)
+            results.extend(await asyncio.gather(*(self._fetch(entry) for entry in missing)))
+        return results
+
+    async def run(self, queries: Sequence[Tuple[str, NewsRequest]]) -> AsyncIterator[BatchResult]:
+        """Entrega un resultado por ubicación única a medida que están listos"""
+        self.batches += 1
+        self.requests += len(queries)
+        entries = self.plan(queries)
+
+        pending: List[BatchEntry] = []
+        for entry in entries:
+            if self.news.is_cached(entry.location, entry.limit, entry.categories, entry.language):
+                self.cache_hits += 1
+                yield await self._fetch(entry, source="cache")
+            else:
+                pending.append(entry)
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        queue: "asyncio.Queue[BatchResult]" = asyncio.Queue()
+
+        def fail(entry: BatchEntry, error: Exception) -> None:
+            self.failures += 1
+            logger.warning("Falló el batch para %s: %s", entry.location, error)
+            queue.put_nowait(BatchResult(entry=entry, source="generated", error=error))
+
+        # Cada entrada deja exactamente un resultado en la cola, aunque algo
+        # falle fuera de _fetch: si no, `run` esperaría para siempre
+        async def run_single(entry: BatchEntry) -> None:
+            async with semaphore:
+                try:
+                    result = await self._fetch(entry)
+                except Exception as e:
+                    fail(entry, e)
+                    return
+                await queue.put(result)
+
+        async def run_pack(pack: List[BatchEntry]) -> None:
+            async with semaphore:
+                try:
+                    results = await self._fetch_pack(pack)
+                except Exception as e:
+                    for entry in pack:
+                        fail(entry, e)
+                    return
+                for result in results:
+                    await queue.put(result)
+
+        packs, single = self._packs(pending)
+        tasks = [asyncio.create_task(run_pack(pack)) for pack in packs]
+        tasks += [asyncio.create_task(run_single(entry)) for entry in single]
+        try:
+            for _ in range(len(pending)):
+                yield await queue.get()
+        finally:
+            # Si el cliente se desconecta no tiene sentido seguir generando
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "deduplicated": self.deduplicated,
+            "cache_hits": self.cache_hits,
+            "packed_prompts": self.packed_prompts,
+            "packed_locations": self.packed_locations,
+            "pack_misses": self.pack_misses,
+            "failures": self.failures,
+        }
+
+
+# Singleton
+batch_news_runner = BatchNewsRunner(
+    news_service,
+    gemini_service,
+    max_concurrency=settings.news_batch_max_concurrency,
+    pack_enabled=settings.news_batch_pack_enabled,
+    pack_size=settings.news_batch_pack_size,
+    pack_max_limit=settings.news_batch_pack_max_limit
+)
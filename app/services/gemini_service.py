@@ -1,21 +1,365 @@
-import google.generativeai as genai
+import asyncio
 import json
+import logging
 import re
-from typing import List, Optional
+import threading
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
+from pydantic import TypeAdapter, ValidationError
 from app.core.config import settings
+from app.core.logging import log_payload
 from app.schemas.news import NewsItem, NewsCategory
+from app.services.generation_executor import GenerationExecutor, GenerationTimeoutError
+from app.services.model_router import ModelRouter, ModelTier, RoutingDecision
+from app.services.json_stream import IncrementalItemParser, parse_complete_items
+from app.services.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller, RetryBudget
+from app.services.metrics import record_upstream_error, span, stage_duration
+from app.services.usage import UsageRecord, current_endpoint, usage_tracker
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+logger = logging.getLogger(__name__)
+
+_sdk_lock = threading.Lock()
+_sdk = None
+
+
+def load_sdk():
+    """
+    Importa y configura el SDK de Gemini en el primer uso: su árbol de
+    dependencias es la mayor parte del tiempo de arranque de la app.
+    """
+    global _sdk
+    if _sdk is None:
+        with _sdk_lock:
+            if _sdk is None:
+                import google.generativeai as genai
+                genai.configure(api_key=settings.gemini_api_key)
+                _sdk = genai
+    return _sdk
+
+# Instrucciones fijas: van como system instruction (y en context caching si
+# está activo) en vez de repetirse dentro de cada prompt
+NEWS_SYSTEM_INSTRUCTION = """Eres un asistente de noticias experto. Entregas las noticias más relevantes que están sucediendo actualmente cerca de una ubicación.
+
+Reglas:
+1. Las noticias deben ser relevantes para la ubicación pedida (ciudad, región o país).
+2. Incluye noticias locales, regionales y nacionales que afecten a esa zona.
+3. Prioriza noticias recientes y de alto impacto, ordenadas por relevancia (de mayor a menor).
+4. Cada noticia incluye un resumen de 2-3 oraciones y el contexto de por qué es relevante para la ubicación.
+5. Responde en el idioma pedido."""
+
+NEWS_JSON_FORMAT = """Responde ÚNICAMENTE con un JSON válido, sin texto adicional, sin markdown, con esta estructura:
+{"news": [{"id": 1, "title": "...", "summary": "...", "category": "una de: política, economía, deportes, tecnología, entretenimiento, salud, educación, seguridad, medio ambiente, local, otros", "relevance_score": 8, "location_context": "...", "estimated_date": "enero 2024", "keywords": ["...", "..."]}]}"""
+
+
+def build_system_instruction(structured: bool) -> str:
+    """Con salida estructurada el formato lo impone el schema; si no, se describe el JSON"""
+    if structured:
+        return NEWS_SYSTEM_INSTRUCTION
+    return f"{NEWS_SYSTEM_INSTRUCTION}\n\n{NEWS_JSON_FORMAT}"
+
+
+# Claves del JSON Schema de Pydantic que entiende el schema de salida de Gemini
+GEMINI_SCHEMA_KEYS = ("type", "description", "enum")
+
+
+def _to_gemini_schema(node: dict, defs: dict) -> dict:
+    """Convierte un nodo de JSON Schema al subconjunto OpenAPI que acepta Gemini"""
+    ref = node.get("$ref")
+    if ref is not None:
+        resolved = dict(defs[ref.split("/")[-1]])
+        resolved.update({k: v for k, v in node.items() if k != "$ref"})
+        return _to_gemini_schema(resolved, defs)
+
+    options = node.get("anyOf")
+    if options is not None:
+        # Solo se soporta Optional[X]: anyOf [X, null]
+        non_null = [option for option in options if option.get("type") != "null"]
+        merged = dict(non_null[0])
+        if "description" in node:
+            merged["description"] = node["description"]
+        schema = _to_gemini_schema(merged, defs)
+        if len(non_null) < len(options):
+            schema["nullable"] = True
+        return schema
+
+    schema = {key: node[key] for key in GEMINI_SCHEMA_KEYS if key in node}
+    if "properties" in node:
+        schema["properties"] = {
+            name: _to_gemini_schema(value, defs)
+            for name, value in node["properties"].items()
+        }
+        schema["required"] = list(node.get("required", []))
+    if "items" in node:
+        schema["items"] = _to_gemini_schema(node["items"], defs)
+    return schema
+
+
+def build_news_response_schema() -> dict:
+    """Schema de salida de Gemini derivado de NewsItem: una lista de noticias"""
+    json_schema = NewsItem.model_json_schema()
+    defs = json_schema.pop("$defs", {})
+    return {"type": "array", "items": _to_gemini_schema(json_schema, defs)}
+
+
+def build_multi_location_response_schema(news_schema: dict) -> dict:
+    """Schema de salida para varias ubicaciones: las noticias de cada una por índice"""
+    return {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "location_index": {"type": "integer", "description": "Número de la ubicación (desde 1)"},
+                "news": news_schema,
+            },
+            "required": ["location_index", "news"],
+        },
+    }
 
 
 class GeminiService:
     """Servicio para interactuar con Gemini Pro"""
     
     def __init__(self):
-        genai.configure(api_key=settings.gemini_api_key)
         # ANTES: self.model = genai.GenerativeModel('gemini-pro')
+        # El SDK y los modelos se crean en el primer uso (o en `warm_up`)
+        
+        # Salida estructurada: JSON restringido por el schema de NewsItem
+        self.structured_output = settings.gemini_structured_output
+        self.system_instruction = build_system_instruction(self.structured_output)
+        
+        # AHORA: Usamos el modelo más actual y estable (configurable con GEMINI_MODEL)
+        self.model_name = settings.gemini_model
+        self._model = None
+        self._models = {}
+        
+        # Modelos con las instrucciones fijas en context caching: modelo -> (modelo, vence)
+        self.context_cache_enabled = settings.gemini_context_cache_enabled
+        self._cached_models: Dict[str, Tuple["genai.GenerativeModel", float]] = {}
+        self.context_cache_errors = 0
+        
+        # Elige modelo y configuración; el enrutamiento por tamaño es opcional
+        self.router = ModelRouter(
+            fast=ModelTier(
+                name=ModelRouter.FAST,
+                model=settings.gemini_fast_model,
+                temperature=settings.gemini_fast_temperature,
+                input_cost_per_million=settings.gemini_fast_input_cost_per_million,
+                output_cost_per_million=settings.gemini_fast_output_cost_per_million
+            ),
+            standard=ModelTier(
+                name=ModelRouter.STANDARD,
+                model=self.model_name,
+                temperature=settings.gemini_temperature,
+                input_cost_per_million=settings.gemini_input_cost_per_million,
+                output_cost_per_million=settings.gemini_output_cost_per_million
+            ),
+            fast_max_limit=settings.gemini_fast_max_limit,
+            latency_budget=settings.gemini_latency_budget_seconds,
+            error_budget=settings.gemini_error_budget,
+            cached_input_cost_ratio=settings.gemini_cached_input_cost_ratio,
+            routing_enabled=settings.gemini_routing_enabled,
+            token_headroom=settings.gemini_output_token_headroom
+        )
+        
+        # Las generaciones corren fuera del event loop con concurrencia acotada
+        self.executor = GenerationExecutor(
+            max_concurrency=settings.gemini_max_concurrency,
+            timeout=settings.gemini_timeout_seconds
+        )
+        
+        # Deadline, reintentos, hedging y circuit breaker
+        self.resilience = ResilientCaller(
+            deadline=settings.gemini_deadline_seconds,
+            max_retries=settings.gemini_max_retries,
+            backoff_base=settings.gemini_retry_backoff_base_seconds,
+            backoff_max=settings.gemini_retry_backoff_max_seconds,
+            retry_budget=RetryBudget(ratio=settings.gemini_retry_budget_ratio),
+            breaker=CircuitBreaker(
+                failure_threshold=settings.gemini_breaker_failure_threshold,
+                recovery_timeout=settings.gemini_breaker_recovery_seconds,
+                # Una prueba que no informa en el deadline de una llamada se da por perdida
+                probe_timeout=settings.gemini_deadline_seconds
+            ),
+            hedge_enabled=settings.gemini_hedge_enabled,
+            hedge_percentile=settings.gemini_hedge_percentile,
+            hedge_min_samples=settings.gemini_hedge_min_samples
+        )
+        
+        self._response_schema = build_news_response_schema()
+        self._multi_response_schema = build_multi_location_response_schema(self._response_schema)
+        self._news_adapter = TypeAdapter(List[NewsItem])
         
-        # AHORA: Usamos el modelo más actual y estable
-        self.model = genai.GenerativeModel('models/gemini-flash-latest')  
+        # Métricas de parsing
+        self.parsed_responses = 0
+        self.parse_failures = 0
+        self.salvaged_responses = 0
+        self.empty_responses = 0
+    
+    @property
+    def model(self):
+        """GenerativeModel del modelo estándar (se crea en el primer uso)"""
+        if self._model is None:
+            self._model = load_sdk().GenerativeModel(self.model_name, system_instruction=self.system_instruction)
+        return self._model
+    
+    @model.setter
+    def model(self, model) -> None:
+        self._model = model
+    
+    def warm_up(self) -> None:
+        """Importa el SDK y crea el modelo estándar; el lifespan lo corre en un thread aparte"""
+        started = time.perf_counter()
+        try:
+            self._get_model(self.model_name)
+        except Exception:
+            # La primera generación lo reintenta y reporta el error a quien la pidió
+            logger.exception("No se pudo inicializar el SDK de Gemini")
+            return
+        logger.info("SDK de Gemini listo", extra={"seconds": round(time.perf_counter() - started, 3)})
+    
+    def _get_model(self, name: str):
+        """
+        Instancia (y reutiliza) el GenerativeModel de cada modelo. Puede
+        importar el SDK: desde el event loop se llega por `_resolve_model`.
+        """
+        if name == self.model_name:
+            return self.model
+        if name not in self._models:
+            self._models[name] = load_sdk().GenerativeModel(name, system_instruction=self.system_instruction)
+        return self._models[name]
+    
+    async def _resolve_model(self, name: str):
+        """
+        Modelo a usar para una llamada: con context caching, uno que referencia
+        las instrucciones fijas ya cacheadas en Gemini (se recrea al vencer).
+        Si el cache no se puede crear, se sigue con el modelo normal.
+        """
+        # Si el warm-up todavía importa el SDK (o falló), se espera en un
+        # thread: el import y su lock no deben frenar el event loop
+        genai = _sdk if _sdk is not None else await asyncio.to_thread(load_sdk)
+        if not self.context_cache_enabled:
+            return self._get_model(name)
+        
+        cached = self._cached_models.get(name)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        
+        ttl = settings.gemini_context_cache_ttl_seconds
+        try:
+            content = await asyncio.to_thread(
+                genai.caching.CachedContent.create,
+                model=name,
+                system_instruction=self.system_instruction,
+                ttl=timedelta(seconds=ttl)
+            )
+        except Exception as e:
+            # Típicamente: las instrucciones no alcanzan el mínimo de tokens cacheables
+            self.context_cache_errors += 1
+            self.context_cache_enabled = False
+            logger.warning("Context caching desactivado para %s: %s", name, e)
+            return self._get_model(name)
+        
+        model = genai.GenerativeModel.from_cached_content(content)
+        # Se renueva un poco antes de que venza en Gemini
+        self._cached_models[name] = (model, time.monotonic() + ttl * 0.9)
+        return model
+    
+    def _generation_config(self, decision: RoutingDecision, response_schema: Optional[dict] = None) -> dict:
+        config = dict(decision.generation_config)
+        if self.structured_output:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = response_schema or self._response_schema
+        return config
+    
+    def _record_usage(
+        self,
+        decision: RoutingDecision,
+        latency: float,
+        response,
+        prompt: str,
+        location: str,
+        language: str,
+        limit: int
+    ) -> None:
+        """Registra los tokens de la respuesta en el router y en la contabilidad de uso"""
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+        cached_tokens = getattr(usage, "cached_content_token_count", 0) or 0
+        self.router.record(
+            decision.model,
+            latency,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens
+        )
+        
+        record = UsageRecord(
+            endpoint=current_endpoint.get(),
+            location=location,
+            language=language,
+            limit=limit,
+            model=decision.model,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            prompt_chars=len(prompt),
+            latency_seconds=round(latency, 3),
+            cost_usd=self.router.cost(decision.tier, prompt_tokens, output_tokens, cached_tokens)
+        )
+        usage_tracker.record(record)
+        logger.info("gemini_usage", extra={"usage": record.as_dict()})
+    
+    def _record_item_size(self, decision: RoutingDecision, response, items: int) -> None:
+        """Mide los tokens por noticia entregada para ajustar max_output_tokens"""
+        usage = getattr(response, "usage_metadata", None)
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+        self.router.record_item_size(decision.model, output_tokens, items)
+    
+    async def _generate(
+        self,
+        prompt: str,
+        decision: RoutingDecision,
+        location: str,
+        language: str,
+        limit: int,
+        response_schema: Optional[dict] = None
+    ):
+        """Genera contenido con la llamada asíncrona nativa del SDK"""
+        model = await self._resolve_model(decision.model)
+        generation_config = self._generation_config(decision, response_schema)
+        
+        async def attempt(remaining: float):
+            timeout = min(self.executor.timeout, remaining)
+            try:
+                return await self.executor.run(
+                    lambda: model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config,
+                        request_options={"timeout": timeout}
+                    ),
+                    timeout=timeout
+                )
+            except Exception as e:
+                # Cada intento fallido cuenta, aunque un reintento lo salve
+                record_upstream_error("gemini", e)
+                raise
+        
+        started = time.monotonic()
+        try:
+            with span("gemini_call"):
+                response = await self.resilience.call(attempt)
+        except Exception:
+            self.router.record(decision.model, None, error=True)
+            raise
+        self._record_usage(
+            decision, time.monotonic() - started, response, prompt, location, language, limit
+        )
+        return response
     
     def _build_news_prompt(
         self, 
@@ -24,45 +368,45 @@ class GeminiService:
         categories: Optional[List[NewsCategory]] = None,
         language: str = "es"
     ) -> str:
-        """Construye el prompt para obtener noticias"""
+        """
+        Construye la parte variable del prompt; las instrucciones fijas van en
+        la system instruction del modelo.
+        """
         
         categories_text = ""
         if categories:
             categories_text = f"\nEnfócate especialmente en estas categorías: {', '.join([c.value for c in categories])}"
         
-        prompt = f"""Eres un asistente de noticias experto. Necesito que me proporciones un listado de las {limit} noticias más relevantes que estén sucediendo actualmente cerca de la siguiente ubicación:
-
-**Ubicación:** {location}
-
-{categories_text}
-
-**Instrucciones importantes:**
-1. Las noticias deben ser relevantes para esa ubicación específica (ciudad, región o país)
-2. Incluye noticias locales, regionales y nacionales que afecten a esa zona
-3. Prioriza noticias recientes y de alto impacto
-4. El idioma de respuesta debe ser: {language}
-
-**IMPORTANTE: Responde ÚNICAMENTE con un JSON válido, sin texto adicional, sin markdown, sin explicaciones.**
-
-El JSON debe tener exactamente esta estructura:
-{{
-    "news": [
-        {{
-            "id": 1,
-            "title": "Título de la noticia",
-            "summary": "Resumen de 2-3 oraciones explicando la noticia",
-            "category": "una de: política, economía, deportes, tecnología, entretenimiento, salud, educación, seguridad, medio ambiente, local, otros",
-            "relevance_score": 8,
-            "location_context": "Por qué es relevante para {location}",
-            "estimated_date": "enero 2024",
-            "keywords": ["palabra1", "palabra2", "palabra3"]
-        }}
-    ]
-}}
+        return f"""Genera exactamente {limit} noticias para esta ubicación: {location}
+Idioma de respuesta: {language}{categories_text}"""
+    
+    def _build_multi_location_prompt(
+        self,
+        locations: List[str],
+        limit: int,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es",
+        structured: bool = False
+    ) -> str:
+        """Construye un solo prompt que pide noticias para varias ubicaciones"""
+        
+        locations_text = "\n".join(
+            f"{idx}. {location}" for idx, location in enumerate(locations, start=1)
+        )
+        categories_text = ""
+        if categories:
+            categories_text = f"\nEnfócate especialmente en estas categorías: {', '.join([c.value for c in categories])}"
+        
+        format_text = ""
+        if not structured:
+            format_text = """
 
-Genera exactamente {limit} noticias ordenadas por relevancia (de mayor a menor).
-"""
-        return prompt
+En lugar de la estructura indicada, responde ÚNICAMENTE con este JSON:
+{"locations": [{"location_index": 1, "news": [<noticias con la estructura indicada>]}]}"""
+        
+        return f"""Genera exactamente {limit} noticias para cada una de estas ubicaciones, identificando cada una con su número en `location_index`:
+{locations_text}
+Idioma de respuesta: {language}{categories_text}{format_text}"""
     
     def _parse_gemini_response(self, response_text: str) -> List[dict]:
         """Parsea la respuesta de Gemini a JSON"""
@@ -79,10 +423,71 @@ Genera exactamente {limit} noticias ordenadas por relevancia (de mayor a menor).
             return data.get("news", [])
             
         except json.JSONDecodeError as e:
-            # Si falla el parsing, intentar extraer información manualmente
-            print(f"Error parsing JSON: {e}")
-            print(f"Response was: {response_text[:500]}...")
-            return []
+            # Si falla el parsing (p. ej. respuesta truncada), rescatar los items completos
+            logger.warning("Error parsing JSON: %s", e, extra={"response_chars": len(response_text)})
+            log_payload(logger, "Respuesta de Gemini no parseable", response_text)
+            self.parse_failures += 1
+            return parse_complete_items(response_text)
+    
+    def _parse_news(self, response_text: str, location: str) -> List[NewsItem]:
+        """
+        Convierte la respuesta de Gemini en noticias validadas.
+        
+        Con salida estructurada se valida todo en una pasada con TypeAdapter; si
+        falla (respuesta truncada, valores fuera de rango) se rescata cada item
+        completo y se valida por separado.
+        """
+        self.parsed_responses += 1
+        failures_before = self.parse_failures
+        
+        if self.structured_output:
+            try:
+                # Parsing y validación en una sola pasada
+                with span("validation"):
+                    return self._news_adapter.validate_json(response_text)
+            except ValidationError as e:
+                logger.warning("Error validating structured response: %d errores", e.error_count())
+                self.parse_failures += 1
+                with span("parse"):
+                    raw_news = parse_complete_items(response_text)
+        else:
+            with span("parse"):
+                raw_news = self._parse_gemini_response(response_text)
+        
+        news_items = []
+        with span("validation"):
+            for idx, item in enumerate(raw_news, start=1):
+                news_item = self._build_news_item(item, idx, location)
+                if news_item is not None:
+                    news_items.append(news_item)
+        
+        if not news_items:
+            self.empty_responses += 1
+        elif self.parse_failures > failures_before:
+            self.salvaged_responses += 1
+        return news_items
+    
+    def parse_stats(self) -> dict:
+        """Tasa de fallas de parsing de las respuestas de Gemini"""
+        return {
+            "structured_output": self.structured_output,
+            "responses": self.parsed_responses,
+            "parse_failures": self.parse_failures,
+            "salvaged_responses": self.salvaged_responses,
+            "empty_responses": self.empty_responses,
+            "parse_failure_rate": (
+                round(self.parse_failures / self.parsed_responses, 4)
+                if self.parsed_responses else 0.0
+            ),
+        }
+    
+    def context_cache_stats(self) -> dict:
+        return {
+            "enabled": self.context_cache_enabled,
+            "cached_models": len(self._cached_models),
+            "errors": self.context_cache_errors,
+            "system_instruction_chars": len(self.system_instruction),
+        }
     
     def _validate_category(self, category: str) -> NewsCategory:
         """Valida y convierte la categoría"""
@@ -105,49 +510,189 @@ Genera exactamente {limit} noticias ordenadas por relevancia (de mayor a menor).
         }
         return category_map.get(category.lower(), NewsCategory.OTHER)
     
+    def _build_news_item(self, item: dict, idx: int, location: str) -> Optional[NewsItem]:
+        """Valida un item crudo de Gemini, normalizando categoría y relevancia"""
+        try:
+            return NewsItem(
+                id=item.get("id", idx),
+                title=item.get("title", "Sin título"),
+                summary=item.get("summary", "Sin resumen disponible"),
+                category=self._validate_category(item.get("category", "otros")),
+                relevance_score=min(max(item.get("relevance_score", 5), 1), 10),
+                location_context=item.get("location_context", location),
+                estimated_date=item.get("estimated_date"),
+                keywords=item.get("keywords", [])
+            )
+        except Exception as e:
+            logger.warning("Error parsing news item %d: %s", idx, e)
+            return None
+    
     async def get_news_by_location(
         self,
         location: str,
         limit: int = 10,
         categories: Optional[List[NewsCategory]] = None,
-        language: str = "es"
+        language: str = "es",
+        tier: Optional[str] = None
     ) -> List[NewsItem]:
         
-        prompt = self._build_news_prompt(location, limit, categories, language)
+        with span("prompt_build"):
+            prompt = self._build_news_prompt(location, limit, categories, language)
+        decision = self.router.choose(limit, len(categories or []), tier)
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, decision, location, language, limit)
+            log_payload(logger, "Respuesta cruda de Gemini", response.text, location=location)
+            items = self._parse_news(response.text, location)
+            self._record_item_size(decision, response, len(items))
+            return items
             
-            # --- DEBUG PRINTS ---
-            print("--- RAW GEMINI RESPONSE ---")
-            print(response.text)
-            print("---------------------------")
-            # --------------------
-
-            raw_news = self._parse_gemini_response(response.text)
-            
-            news_items = []
-            for idx, item in enumerate(raw_news, start=1):
-                try:
-                    news_item = NewsItem(
-                        id=item.get("id", idx),
-                        title=item.get("title", "Sin título"),
-                        summary=item.get("summary", "Sin resumen disponible"),
-                        category=self._validate_category(item.get("category", "otros")),
-                        relevance_score=min(max(item.get("relevance_score", 5), 1), 10),
-                        location_context=item.get("location_context", location),
-                        estimated_date=item.get("estimated_date"),
-                        keywords=item.get("keywords", [])
-                    )
-                    news_items.append(news_item)
-                except Exception as e:
-                    print(f"Error parsing news item {idx}: {e}")
-                    continue
+        except (GenerationTimeoutError, CircuitOpenError):
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error comunicándose con Gemini: {str(e)}")
+    
+    def _parse_multi_location_news(self, response_text: str, locations: List[str]) -> List[List[NewsItem]]:
+        """Reparte la respuesta multi-ubicación; las ubicaciones sin noticias quedan vacías"""
+        self.parsed_responses += 1
+        results: List[List[NewsItem]] = [[] for _ in locations]
+        
+        try:
+            cleaned = response_text.strip()
+            if not self.structured_output:
+                json_match = re.search(r'\{[\s\S]*\}', cleaned)
+                if json_match:
+                    cleaned = json_match.group()
+            data = json.loads(cleaned)
+        except json.JSONDecodeError as e:
+            logger.warning("Error parsing multi-location JSON: %s", e)
+            self.parse_failures += 1
+            self.empty_responses += 1
+            return results
+        
+        groups = data.get("locations", []) if isinstance(data, dict) else data
+        for group in groups:
+            if not isinstance(group, dict):
+                continue
+            index = group.get("location_index")
+            if not isinstance(index, int) or not 1 <= index <= len(locations):
+                continue
+            location = locations[index - 1]
+            for idx, item in enumerate(group.get("news") or [], start=1):
+                news_item = self._build_news_item(item, idx, location)
+                if news_item is not None:
+                    results[index - 1].append(news_item)
+        
+        if not any(results):
+            self.empty_responses += 1
+        return results
+    
+    async def get_news_for_locations(
+        self,
+        locations: List[str],
+        limit: int = 5,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es"
+    ) -> List[List[NewsItem]]:
+        """
+        Genera noticias para varias ubicaciones con una sola llamada.
+        
+        Retorna una lista alineada con `locations`; las que Gemini omitió
+        quedan vacías para que el llamador las pida por separado.
+        """
+        with span("prompt_build"):
+            prompt = self._build_multi_location_prompt(
+                locations, limit, categories, language, structured=self.structured_output
+            )
+        # El presupuesto de tokens se calcula con el total de noticias pedidas
+        decision = self.router.choose(limit * len(locations), len(categories or []))
+        
+        try:
+            response = await self._generate(
+                prompt,
+                decision,
+                f"batch de {len(locations)} ubicaciones",
+                language,
+                limit * len(locations),
+                response_schema=self._multi_response_schema
+            )
+            results = self._parse_multi_location_news(response.text, locations)
+            self._record_item_size(decision, response, sum(len(items) for items in results))
+            return results
             
-            return news_items
+        except (GenerationTimeoutError, CircuitOpenError):
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error comunicándose con Gemini: {str(e)}")
+    
+    async def stream_news_by_location(
+        self,
+        location: str,
+        limit: int = 10,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es"
+    ) -> AsyncIterator[NewsItem]:
+        """
+        Genera noticias en streaming: cada noticia se entrega apenas Gemini
+        termina de escribir su objeto JSON.
+        """
+        with span("prompt_build"):
+            prompt = self._build_news_prompt(location, limit, categories, language)
+        parser = IncrementalItemParser()
+        idx = 0
+        decision = self.router.choose(limit, len(categories or []))
+        model = await self._resolve_model(decision.model)
+        generation_config = self._generation_config(decision)
+        
+        # En streaming no se reintenta (ya se enviaron datos), pero el breaker aplica
+        probe = self.resilience.check()
+        started = time.monotonic()
+        last_chunk = None
+        try:
+            chunks = self.executor.stream(
+                lambda: model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True,
+                    request_options={"timeout": self.executor.timeout}
+                )
+            )
+            async for chunk in chunks:
+                last_chunk = chunk
+                for item in parser.feed(chunk.text):
+                    news_item = self._build_news_item(item, idx + 1, location)
+                    if news_item is None:
+                        continue
+                    idx += 1
+                    if idx == 1:
+                        stage_duration.observe(time.monotonic() - started, stage="gemini_first_item")
+                    yield news_item
+                    if idx >= limit:
+                        break
+                if idx >= limit:
+                    await chunks.aclose()
+                    break
+            self.resilience.record()
+            stage_duration.observe(time.monotonic() - started, stage="gemini_stream")
+            # El último fragmento trae el uso de tokens acumulado
+            self._record_usage(
+                decision, time.monotonic() - started, last_chunk, prompt, location, language, limit
+            )
+            self._record_item_size(decision, last_chunk, idx)
             
+        except GenerationTimeoutError as e:
+            record_upstream_error("gemini", e)
+            self.resilience.record(e)
+            self.router.record(decision.model, None, error=True)
+            raise
         except Exception as e:
+            record_upstream_error("gemini", e)
+            self.resilience.record(e)
+            self.router.record(decision.model, None, error=True)
             raise RuntimeError(f"Error comunicándose con Gemini: {str(e)}")
+        finally:
+            # Cliente desconectado o stream cancelado: la prueba del breaker no queda tomada
+            self.resilience.release(probe)
 
 
 # Singleton
@@ -0,0 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Optional
+
+
+class GenerationTimeoutError(TimeoutError):
+    """La generación superó el tiempo máximo permitido"""
+
+
+class GenerationExecutor:
+    """
+    Ejecuta llamadas asíncronas a Gemini con concurrencia limitada.
+
+    Las llamadas que exceden el límite esperan en cola sin bloquear el
+    event loop, y cada llamada tiene su propio timeout.
+    """
+
+    def __init__(self, max_concurrency: int, timeout: float):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Métricas
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None):
+        """
+        Reserva un slot de generación, esperando en cola si no hay uno libre.
+        Con `timeout`, la espera en cola lanza `asyncio.TimeoutError` al vencer.
+        """
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def _timeout_error(self, timeout: float) -> GenerationTimeoutError:
+        self.timeouts += 1
+        return GenerationTimeoutError(f"Gemini no respondió en {timeout:.1f} segundos")
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Ejecuta `call` cuando haya un slot libre. El timeout cubre la espera
+        en cola y la llamada; 0 significa que ya no queda tiempo.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        try:
+            async with self.slot(timeout):
+                result = await asyncio.wait_for(call(), timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise self._timeout_error(timeout)
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return result
+
+    async def stream(
+        self,
+        call: Callable[[], Awaitable[AsyncIterable[Any]]],
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Igual que `run`, pero para respuestas en streaming.
+
+        El slot se mantiene mientras dure el stream y el timeout aplica a la
+        espera en cola más la respuesta completa, no a cada fragmento.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        try:
+            async with self.slot(timeout):
+                response = await asyncio.wait_for(call(), timeout=max(deadline - loop.time(), 0))
+                iterator = response.__aiter__()
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    yield chunk
+        except asyncio.TimeoutError:
+            raise self._timeout_error(timeout)
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+
+    def stats(self) -> dict:
+        """Estado actual de la cola de generación"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+        }
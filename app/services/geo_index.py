@@ -0,0 +1,90 @@
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia en km sobre la superficie terrestre"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass
+class GeoPoint:
+    """Posición de una llave de caché y la zona a la que pertenece"""
+    latitude: float
+    longitude: float
+    location: str
+    country: Optional[str] = None
+    region: Optional[str] = None
+
+
+class ProximityIndex:
+    """
+    Grilla lat/lon de llaves de caché para buscar lotes cercanos.
+
+    Las celdas miden `cell_km` de lado (en latitud); una búsqueda revisa la
+    celda del punto y las vecinas que alcanza el radio. Se guardan como
+    máximo `max_keys` llaves, desalojando las más antiguas.
+    """
+
+    def __init__(self, cell_km: float, max_keys: int = 50000):
+        self.cell_deg = max(cell_km, 0.1) / KM_PER_DEGREE
+        self.max_keys = max_keys
+        self._points: "OrderedDict[Hashable, GeoPoint]" = OrderedDict()
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg)
+
+    def get(self, key: Hashable) -> Optional[GeoPoint]:
+        return self._points.get(key)
+
+    def add(self, key: Hashable, point: GeoPoint) -> None:
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = point
+        self._cells.setdefault(self._cell(point.latitude, point.longitude), set()).add(key)
+
+        while len(self._points) > self.max_keys:
+            self.remove(next(iter(self._points)))
+
+    def remove(self, key: Hashable) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(point.latitude, point.longitude)
+        keys = self._cells.get(cell)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, Hashable]]:
+        """Llaves a menos de `radius_km`, de la más cercana a la más lejana"""
+        row, col = self._cell(latitude, longitude)
+        rows = math.ceil(radius_km / (self.cell_deg * KM_PER_DEGREE))
+        # Los grados de longitud se achican hacia los polos
+        shrink = max(math.cos(math.radians(latitude)), 0.01)
+        cols = math.ceil(radius_km / (self.cell_deg * KM_PER_DEGREE * shrink))
+
+        found: List[Tuple[float, Hashable]] = []
+        for r in range(row - rows, row + rows + 1):
+            for c in range(col - cols, col + cols + 1):
+                for key in self._cells.get((r, c), ()):
+                    point = self._points[key]
+                    distance = haversine_km(latitude, longitude, point.latitude, point.longitude)
+                    if distance <= radius_km:
+                        found.append((distance, key))
+        found.sort(key=lambda pair: pair[0])
+        return found
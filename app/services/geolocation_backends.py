@@ -0,0 +1,343 @@
+"""
+Backends de geolocalización por IP.
+
+- `http`: consulta un servicio externo compatible con ip-api.com.
+- `csv`: tabla local de rangos CIDR (o inicio/fin) compilada a un índice
+  binario, abierto con mmap y consultado con búsqueda binaria.
+- `mmdb`: base de datos MaxMind/DB-IP (requiere el paquete `maxminddb`).
+"""
+import csv
+import ipaddress
+import json
+import mmap
+import os
+import socket
+import struct
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import httpx
+
+from app.schemas.location import LocationResponse
+
+
+class GeolocationBackend(ABC):
+    """Interfaz común de los backends"""
+
+    name = "base"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    async def startup(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    @abstractmethod
+    async def lookup(self, ip: Optional[str]) -> Optional[LocationResponse]:
+        """Retorna la ubicación o None si el backend no conoce la IP"""
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses}
+
+
+class HttpGeolocationBackend(GeolocationBackend):
+    """Backend que consulta ip-api.com con un cliente HTTP compartido"""
+
+    name = "http"
+
+    def __init__(self, api_url: str, timeout: float, max_connections: int):
+        super().__init__()
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def startup(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def lookup(self, ip: Optional[str]) -> Optional[LocationResponse]:
+        # Fuera del lifespan (scripts, tests) el cliente se abre bajo demanda
+        if self._client is None:
+            await self.startup()
+
+        url = f"{self.api_url}/{ip}" if ip else self.api_url
+
+        try:
+            response = await self._client.get(url)
+            response.raise_for_status()
+            data = response.json()
+
+        except httpx.HTTPError as e:
+            raise ConnectionError(f"Error conectando al servicio de geolocalización: {str(e)}")
+
+        if data.get("status") == "fail":
+            self.misses += 1
+            raise ValueError(f"Error de geolocalización: {data.get('message')}")
+
+        self.hits += 1
+        return LocationResponse(
+            city=data.get("city", "Unknown"),
+            region=data.get("regionName", "Unknown"),
+            country=data.get("country", "Unknown"),
+            country_code=data.get("countryCode"),
+            latitude=data.get("lat"),
+            longitude=data.get("lon"),
+            ip=data.get("query"),
+            timezone=data.get("timezone")
+        )
+
+
+# Formato del índice compilado:
+#   cabecera:  MAGIC | cantidad de rangos (uint32) | offset de la sección de datos (uint64)
+#   rangos:    inicio (16 bytes) | fin (16 bytes) | offset del registro (uint32)
+#   datos:     largo (uint16) | JSON UTF-8 del registro
+# Las IPs se guardan como IPv6 big-endian (IPv4 mapeadas a ::ffff:a.b.c.d),
+# así la comparación de bytes equivale a la comparación de enteros.
+INDEX_MAGIC = b"NNMGEO1\x00"
+HEADER = struct.Struct("<8sIQ")
+RANGE = struct.Struct("<16s16sI")
+RECORD_LENGTH = struct.Struct("<H")
+LOCATION_FIELDS = ("city", "region", "country", "country_code", "latitude", "longitude", "timezone")
+IPV4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
+
+def _ip_bytes(ip: str) -> bytes:
+    # inet_pton es bastante más rápido que ipaddress en el camino caliente
+    try:
+        if ":" in ip:
+            return socket.inet_pton(socket.AF_INET6, ip)
+        return IPV4_MAPPED_PREFIX + socket.inet_pton(socket.AF_INET, ip)
+    except OSError:
+        raise ValueError(f"IP inválida: {ip}")
+
+
+def _parse_row_range(row: dict) -> tuple:
+    if row.get("network"):
+        network = ipaddress.ip_network(row["network"].strip(), strict=False)
+        return _ip_bytes(str(network.network_address)), _ip_bytes(str(network.broadcast_address))
+    return _ip_bytes(row["start_ip"].strip()), _ip_bytes(row["end_ip"].strip())
+
+
+def compile_range_table(csv_path: str, index_path: str) -> int:
+    """
+    Compila un CSV de rangos a un índice binario ordenado.
+
+    El CSV debe tener la columna `network` (CIDR) o `start_ip`/`end_ip`,
+    más las columnas de ubicación: city, region, country, country_code,
+    latitude, longitude, timezone. Retorna la cantidad de rangos.
+    """
+    ranges = []
+    records = {}
+    data = bytearray()
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            start, end = _parse_row_range(row)
+            record = {}
+            for field in LOCATION_FIELDS:
+                value = (row.get(field) or "").strip()
+                if field in ("latitude", "longitude"):
+                    record[field] = float(value) if value else None
+                else:
+                    record[field] = value or None
+
+            encoded = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            # Los registros repetidos (misma ciudad en muchos rangos) se guardan una sola vez
+            offset = records.get(encoded)
+            if offset is None:
+                offset = len(data)
+                records[encoded] = offset
+                data += RECORD_LENGTH.pack(len(encoded)) + encoded
+            ranges.append((start, end, offset))
+
+    ranges.sort()
+    data_offset = HEADER.size + RANGE.size * len(ranges)
+
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, len(ranges), data_offset))
+        for start, end, offset in ranges:
+            f.write(RANGE.pack(start, end, offset))
+        f.write(data)
+    os.replace(tmp_path, index_path)
+    return len(ranges)
+
+
+class RangeTableBackend(GeolocationBackend):
+    """
+    Backend local sobre una tabla de rangos de IP.
+
+    Acepta un CSV (se compila a `<archivo>.idx` si el índice no existe o está
+    desactualizado) o un índice ya compilado. El índice se abre con mmap, así
+    que no se carga en memoria y las búsquedas son O(log n) sin red.
+    """
+
+    name = "csv"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._count = 0
+        self._data_offset = 0
+
+    def _index_path(self) -> str:
+        if not self.path.endswith(".csv"):
+            return self.path
+
+        index_path = f"{self.path}.idx"
+        if (
+            not os.path.exists(index_path)
+            or os.path.getmtime(index_path) < os.path.getmtime(self.path)
+        ):
+            compile_range_table(self.path, index_path)
+        return index_path
+
+    async def startup(self) -> None:
+        if self._mmap is not None:
+            return
+
+        self._file = open(self._index_path(), "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._data_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            await self.shutdown()
+            raise ValueError(f"Índice de geolocalización inválido: {self.path}")
+
+    async def shutdown(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def find(self, ip: str) -> Optional[dict]:
+        """Búsqueda binaria del rango que contiene la IP"""
+        try:
+            target = _ip_bytes(ip)
+        except ValueError:
+            return None
+
+        mm = self._mmap
+        lo, hi = 0, self._count
+        # Último rango cuyo inicio es <= target
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = HEADER.size + mid * RANGE.size
+            if mm[pos:pos + 16] <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+
+        start, end, offset = RANGE.unpack_from(mm, HEADER.size + (lo - 1) * RANGE.size)
+        if target > end:
+            return None
+
+        position = self._data_offset + offset
+        (length,) = RECORD_LENGTH.unpack_from(mm, position)
+        start_data = position + RECORD_LENGTH.size
+        return json.loads(mm[start_data:start_data + length])
+
+    async def lookup(self, ip: Optional[str]) -> Optional[LocationResponse]:
+        if not ip:
+            return None
+        if self._mmap is None:
+            await self.startup()
+
+        record = self.find(ip)
+        if record is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return LocationResponse(
+            city=record.get("city") or "Unknown",
+            region=record.get("region") or "Unknown",
+            country=record.get("country") or "Unknown",
+            country_code=record.get("country_code"),
+            latitude=record.get("latitude"),
+            longitude=record.get("longitude"),
+            ip=ip,
+            timezone=record.get("timezone")
+        )
+
+
+class MaxMindBackend(GeolocationBackend):
+    """Backend local sobre una base .mmdb (GeoLite2-City, DB-IP, etc.)"""
+
+    name = "mmdb"
+
+    def __init__(self, path: str, language: str = "es"):
+        super().__init__()
+        self.path = path
+        self.language = language
+        self._reader = None
+
+    async def startup(self) -> None:
+        if self._reader is not None:
+            return
+        try:
+            import maxminddb
+        except ImportError:
+            raise RuntimeError(
+                "El backend 'mmdb' requiere el paquete maxminddb (pip install maxminddb)"
+            )
+        self._reader = maxminddb.open_database(self.path, maxminddb.MODE_MMAP)
+
+    async def shutdown(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _name(self, node: Optional[dict]) -> Optional[str]:
+        names = (node or {}).get("names") or {}
+        return names.get(self.language) or names.get("en")
+
+    async def lookup(self, ip: Optional[str]) -> Optional[LocationResponse]:
+        if not ip:
+            return None
+        if self._reader is None:
+            await self.startup()
+
+        try:
+            record = self._reader.get(ip)
+        except ValueError:
+            record = None
+        if not record:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        subdivisions = record.get("subdivisions") or [{}]
+        country = record.get("country") or {}
+        location = record.get("location") or {}
+        return LocationResponse(
+            city=self._name(record.get("city")) or "Unknown",
+            region=self._name(subdivisions[0]) or "Unknown",
+            country=self._name(country) or "Unknown",
+            country_code=country.get("iso_code"),
+            latitude=location.get("latitude"),
+            longitude=location.get("longitude"),
+            ip=ip,
+            timezone=location.get("time_zone")
+        )
@@ -1,50 +1,123 @@
-import httpx
-from typing import Optional
+from typing import List, Optional
 from app.core.config import settings
 from app.schemas.location import LocationResponse
+from app.services.ip_location_cache import IpLocationCache
+from app.services.metrics import record_upstream_error, span
+from app.services.geolocation_backends import (
+    GeolocationBackend,
+    HttpGeolocationBackend,
+    RangeTableBackend,
+    MaxMindBackend
+)
+
+
+def build_backends() -> List[GeolocationBackend]:
+    """
+    Construye la cadena de backends según `settings.geolocation_backend`.
+
+    Con un backend local, la consulta HTTP queda como respaldo para las IPs
+    que no estén en la base (si `geolocation_http_fallback` está activo).
+    """
+    http_backend = HttpGeolocationBackend(
+        api_url=settings.geolocation_api_url,
+        timeout=settings.geolocation_timeout_seconds,
+        max_connections=settings.geolocation_max_connections
+    )
+
+    backend = settings.geolocation_backend.lower()
+    if backend == "http":
+        return [http_backend]
+
+    if not settings.geolocation_db_path:
+        raise ValueError(f"El backend '{backend}' requiere GEOLOCATION_DB_PATH")
+
+    if backend == "csv":
+        local_backend = RangeTableBackend(settings.geolocation_db_path)
+    elif backend == "mmdb":
+        local_backend = MaxMindBackend(
+            settings.geolocation_db_path,
+            language=settings.geolocation_db_language
+        )
+    else:
+        raise ValueError(f"Backend de geolocalización desconocido: {backend}")
+
+    backends = [local_backend]
+    if settings.geolocation_http_fallback:
+        backends.append(http_backend)
+    return backends
 
 
 class GeolocationService:
     """Servicio para obtener la ubicación del usuario"""
-    
-    def __init__(self):
-        self.api_url = settings.geolocation_api_url
-    
+
+    def __init__(self, backends: Optional[List[GeolocationBackend]] = None):
+        self.backends = backends if backends is not None else build_backends()
+        self.cache = IpLocationCache(
+            ttl=settings.geolocation_cache_ttl_seconds,
+            negative_ttl=settings.geolocation_negative_ttl_seconds,
+            max_entries=settings.geolocation_cache_max_entries
+        )
+
+    async def startup(self) -> None:
+        """Abre los recursos de los backends (se llama desde el lifespan de la app)"""
+        for backend in self.backends:
+            await backend.startup()
+
+    async def shutdown(self) -> None:
+        """Cierra los recursos de los backends"""
+        for backend in self.backends:
+            await backend.shutdown()
+
     async def get_location_by_ip(self, ip: Optional[str] = None) -> LocationResponse:
         """
         Obtiene la ubicación basada en la IP.
         Si no se proporciona IP, usa la IP del cliente.
         """
-        url = f"{self.api_url}/{ip}" if ip else self.api_url
-        
-        async with httpx.AsyncClient() as client:
+        with span("ip_lookup"):
+            return await self._lookup(ip)
+
+    async def _lookup(self, ip: Optional[str]) -> LocationResponse:
+        cached = self.cache.get(ip)
+        if cached is not None:
+            if cached.error is not None:
+                raise ValueError(cached.error)
+            return cached.location.model_copy(update={"ip": ip or cached.location.ip})
+
+        # Un hueco o un error de un backend (p. ej. la base local) no descarta
+        # a los siguientes: se prueba toda la cadena antes de dar la IP por perdida
+        failures: List[Exception] = []
+        for backend in self.backends:
             try:
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("status") == "fail":
-                    raise ValueError(f"Error de geolocalización: {data.get('message')}")
-                
-                return LocationResponse(
-                    city=data.get("city", "Unknown"),
-                    region=data.get("regionName", "Unknown"),
-                    country=data.get("country", "Unknown"),
-                    country_code=data.get("countryCode"),
-                    latitude=data.get("lat"),
-                    longitude=data.get("lon"),
-                    ip=data.get("query"),
-                    timezone=data.get("timezone")
-                )
-                
-            except httpx.HTTPError as e:
-                raise ConnectionError(f"Error conectando al servicio de geolocalización: {str(e)}")
-    
+                location = await backend.lookup(ip)
+            except Exception as e:
+                record_upstream_error("geolocation", e)
+                failures.append(e)
+                continue
+
+            if location is not None:
+                self.cache.set(ip, location)
+                return location
+
+        # Los errores transitorios (red, timeouts) no se cachean
+        transient = [e for e in failures if not isinstance(e, ValueError)]
+        if transient:
+            raise transient[-1]
+
+        error = str(failures[-1]) if failures else f"Error de geolocalización: IP {ip} no encontrada"
+        self.cache.set_error(ip, error)
+        raise ValueError(error)
+
     def format_location_string(self, location: LocationResponse) -> str:
         """Formatea la ubicación como string legible"""
         parts = [location.city, location.region, location.country]
         return ", ".join(filter(lambda x: x and x != "Unknown", parts))
 
+    def stats(self) -> dict:
+        return {
+            "cache": self.cache.stats(),
+            "backends": [backend.stats() for backend in self.backends],
+        }
+
 
 # Singleton
 geolocation_service = GeolocationService()
\ No newline at end of file
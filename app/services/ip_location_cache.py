@@ -0,0 +1,98 @@
+import ipaddress
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.schemas.location import LocationResponse
+
+
+@dataclass
+class IpCacheEntry:
+    """Resultado cacheado: una ubicación o un error de geolocalización"""
+    location: Optional[LocationResponse]
+    error: Optional[str]
+    expires_at: float
+
+
+def ip_prefix(ip: Optional[str]) -> str:
+    """
+    Agrupa una IP por prefijo de red (/24 en IPv4, /48 en IPv6).
+
+    Las IPs de un mismo prefijo casi siempre geolocalizan a la misma ciudad.
+    Sin IP (cliente local) se usa la llave "self".
+    """
+    if not ip:
+        return "self"
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+    prefix = 24 if address.version == 4 else 48
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+class IpLocationCache:
+    """
+    Caché LRU de IP -> ubicación con TTL.
+
+    Las respuestas fallidas (`status == "fail"`) también se cachean, con un
+    TTL más corto, para no repetir consultas que sabemos que fallan.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, IpCacheEntry]" = OrderedDict()
+
+        # Métricas
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, ip: Optional[str]) -> Optional[IpCacheEntry]:
+        key = ip_prefix(ip)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.error is not None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, ip: Optional[str], location: LocationResponse) -> None:
+        self._store(ip, IpCacheEntry(location, None, time.monotonic() + self.ttl))
+
+    def set_error(self, ip: Optional[str], error: str) -> None:
+        self._store(ip, IpCacheEntry(None, error, time.monotonic() + self.negative_ttl))
+
+    def _store(self, ip: Optional[str], entry: IpCacheEntry) -> None:
+        key = ip_prefix(ip)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,88 @@
+import json
+from typing import List
+
+
+class IncrementalItemParser:
+    """
+    Parser incremental de la lista de noticias que genera Gemini.
+
+    Recibe el texto por partes (`feed`) y retorna cada objeto de la primera
+    lista JSON en cuanto se cierra su llave, sin esperar el resto de la
+    respuesta. Funciona tanto con `{"news": [...]}` como con `[...]`, e
+    ignora texto fuera del JSON (por ejemplo, bloques markdown).
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._items_depth = None  # profundidad de la lista de items
+        self._item_start = None
+        self.failed_items = 0
+
+    def feed(self, text: str) -> List[dict]:
+        """Agrega texto y retorna los items completos encontrados"""
+        self._buffer += text
+        items = []
+        buffer = self._buffer
+
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                # Solo cuentan los strings dentro de un objeto/lista JSON
+                if self._stack:
+                    self._in_string = True
+            elif char in "{[":
+                if (
+                    char == "{"
+                    and self._items_depth is not None
+                    and len(self._stack) == self._items_depth
+                ):
+                    self._item_start = pos
+                self._stack.append(char)
+                if char == "[" and self._items_depth is None:
+                    self._items_depth = len(self._stack)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if (
+                    char == "}"
+                    and self._item_start is not None
+                    and len(self._stack) == self._items_depth
+                ):
+                    item = self._decode(buffer[self._item_start:pos + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._item_start = None
+
+        # Se descarta lo ya procesado que no forma parte de un item abierto
+        keep_from = self._item_start if self._item_start is not None else len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._pos = len(buffer) - keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        return items
+
+    def _decode(self, text: str):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            self.failed_items += 1
+            return None
+        return item if isinstance(item, dict) else None
+
+
+def parse_complete_items(text: str) -> List[dict]:
+    """Extrae todos los items completos de un texto, aunque esté truncado"""
+    return IncrementalItemParser().feed(text)
@@ -0,0 +1,181 @@
+import json
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PLACES_PATH = Path(__file__).resolve().parent.parent / "data" / "places.json"
+
+# Marca de variantes que apuntan a más de un lugar (p. ej. "santiago")
+AMBIGUOUS = ""
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold(text: str) -> str:
+    """Quita tildes, mayúsculas y puntuación: "Región Metropolitana" -> "region metropolitana" """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NON_ALNUM.sub(" ", stripped.casefold()).split())
+
+
+def fold_parts(location: str) -> List[str]:
+    """Parte una ubicación por comas y normaliza cada parte, descartando las vacías"""
+    return [part for part in (fold(p) for p in location.split(",")) if part]
+
+
+@dataclass
+class Place:
+    """Lugar canónico con sus variantes conocidas"""
+    id: str
+    name: str
+    country: str
+    country_code: str
+    latitude: float
+    longitude: float
+    region: Optional[str] = None
+    aliases: List[str] = field(default_factory=list)
+    region_aliases: List[str] = field(default_factory=list)
+    country_aliases: List[str] = field(default_factory=list)
+
+    @property
+    def display_name(self) -> str:
+        parts = [self.name, self.region if self.region != self.name else None, self.country]
+        return ", ".join(filter(None, parts))
+
+    def countries(self) -> Set[str]:
+        """Formas normalizadas del país: nombre, código y alias"""
+        return {fold(c) for c in [self.country, self.country_code, *self.country_aliases]}
+
+    def variants(self) -> List[str]:
+        """Combinaciones ciudad[, región][, país] que identifican el lugar"""
+        names = {fold(n) for n in [self.name, *self.aliases]}
+        regions = {fold(r) for r in [self.region, *self.region_aliases] if r}
+        countries = self.countries()
+
+        variants = set(names)
+        for name, country in product(names, countries):
+            variants.add(f"{name}|{country}")
+        for name, region in product(names, regions):
+            variants.add(f"{name}|{region}")
+            for country in countries:
+                variants.add(f"{name}|{region}|{country}")
+        return sorted(variants)
+
+
+class LocationIndex:
+    """
+    Índice en memoria de variantes de ubicación -> lugar canónico.
+
+    "Santiago, RM, Chile", "santiago, Región Metropolitana, Chile" y
+    "Santiago de Chile" resuelven al mismo `Place`, así que comparten llave
+    de caché, generación en curso y pre-calentamiento. Las ubicaciones que no
+    están en el índice usan su forma normalizada como llave.
+    """
+
+    def __init__(self, max_resolved: int = 10000):
+        self.places: Dict[str, Place] = {}
+        self._variants: Dict[str, str] = {}
+        self._resolved: Dict[str, Optional[Place]] = {}
+        self.max_resolved = max_resolved
+
+        # Métricas
+        self.resolved = 0
+        self.unresolved = 0
+
+    def add(self, place: Place) -> None:
+        self.places[place.id] = place
+        for variant in place.variants():
+            current = self._variants.get(variant)
+            if current is None or current == place.id:
+                self._variants[variant] = place.id
+            else:
+                self._variants[variant] = AMBIGUOUS
+        self._resolved.clear()
+
+    def load(self, path: Path) -> int:
+        """Carga lugares desde un archivo JSON (lista de objetos con los campos de `Place`)"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for raw in data:
+            self.add(Place(**raw))
+        return len(data)
+
+    def _lookup(self, variant: str) -> Optional[Place]:
+        place_id = self._variants.get(variant)
+        return self.places.get(place_id) if place_id else None
+
+    def resolve(self, location: str) -> Optional[Place]:
+        """Lugar canónico de una ubicación, o None si no está en el índice o es ambigua"""
+        parts = fold_parts(location)
+        if not parts:
+            return None
+        cache_key = "|".join(parts)
+        if cache_key in self._resolved:
+            place = self._resolved[cache_key]
+        else:
+            place = self._lookup(cache_key)
+            if place is None and len(parts) > 2:
+                # "ciudad, comuna, región, país": se prueba ciudad + país
+                place = self._lookup(f"{parts[0]}|{parts[-1]}")
+            if place is None and len(parts) > 1:
+                # La ciudad sola, si no es ambigua y el país dado coincide:
+                # "Lima, Ohio, United States" no es Lima, Perú
+                place = self._lookup(parts[0])
+                if place is not None and parts[-1] not in place.countries():
+                    place = None
+            if len(self._resolved) >= self.max_resolved:
+                self._resolved.clear()
+            self._resolved[cache_key] = place
+
+        if place is None:
+            self.unresolved += 1
+        else:
+            self.resolved += 1
+        return place
+
+    def canonical_id(self, location: str) -> str:
+        """ID del lugar si se conoce; si no, la ubicación normalizada"""
+        place = self.resolve(location)
+        if place is not None:
+            return place.id
+        return ", ".join(fold_parts(location))
+
+    def display_name(self, location: str) -> str:
+        """Nombre canónico para los prompts, o la ubicación tal cual si no se conoce"""
+        place = self.resolve(location)
+        return place.display_name if place is not None else location
+
+    def stats(self) -> dict:
+        lookups = self.resolved + self.unresolved
+        return {
+            "places": len(self.places),
+            "variants": len(self._variants),
+            "resolved": self.resolved,
+            "unresolved": self.unresolved,
+            "resolve_ratio": round(self.resolved / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_location_index() -> LocationIndex:
+    """Índice con los lugares incluidos y, si se configura, los de `location_index_path`"""
+    index = LocationIndex()
+    index.load(DEFAULT_PLACES_PATH)
+    if settings.location_index_path:
+        try:
+            count = index.load(Path(settings.location_index_path))
+            logger.info("Cargados %d lugares desde %s", count, settings.location_index_path)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("No se pudo cargar %s: %s", settings.location_index_path, e)
+    return index
+
+
+# Singleton
+location_index = build_location_index()
@@ -0,0 +1,230 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Métrica con etiquetas en el formato de texto de Prometheus"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Líneas de muestras en el formato de texto de Prometheus"""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class CallbackMetric(Metric):
+    """
+    Métrica que se lee al momento del scrape desde los contadores que ya
+    llevan los servicios (`stats()`), sin instrumentar el camino caliente.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        collect: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = ()
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self.collect().items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * len(self.buckets)
+            self._sums[key] = 0.0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self._sums[key] += value
+
+    def samples(self) -> Iterator[str]:
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Registro de métricas expuesto en `/metrics`"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        metric.name = f"{self.prefix}_{metric.name}"
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        collect: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = ()
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, kind, collect, labelnames))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry("news_near_me")
+
+# Métricas del camino caliente
+stage_duration = registry.histogram(
+    "stage_duration_seconds",
+    "Duración de cada etapa de una petición",
+    ("stage",)
+)
+upstream_errors = registry.counter(
+    "upstream_errors_total",
+    "Errores de servicios externos por tipo de excepción",
+    ("upstream", "exception")
+)
+http_requests = registry.counter(
+    "http_requests_total",
+    "Peticiones HTTP atendidas",
+    ("method", "path", "status")
+)
+http_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Duración de las peticiones HTTP (hasta el último byte de la respuesta)",
+    ("method", "path")
+)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "Peticiones HTTP en curso"
+)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Mide la duración de una etapa (`ip_lookup`, `gemini_call`, `parse`, ...)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_duration.observe(time.perf_counter() - started, stage=stage)
+
+
+def record_upstream_error(upstream: str, exc: BaseException) -> None:
+    upstream_errors.inc(upstream=upstream, exception=type(exc).__name__)
+
+
+def single(value: Optional[float]) -> Dict[LabelValues, float]:
+    """Valor sin etiquetas para las métricas con callback"""
+    return {(): value or 0.0}
@@ -0,0 +1,182 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class ModelTier:
+    """Modelo y configuración de generación de un nivel"""
+    name: str
+    model: str
+    temperature: float
+    # Estimación inicial (con holgura) hasta medir respuestas reales
+    tokens_per_item: int = 400
+    min_tokens_per_item: int = 160
+    base_tokens: int = 256
+    # USD por millón de tokens, para estimar el costo de cada llamada
+    input_cost_per_million: float = 0.0
+    output_cost_per_million: float = 0.0
+
+
+@dataclass
+class RoutingDecision:
+    tier: str
+    model: str
+    generation_config: dict
+
+
+@dataclass
+class ModelStats:
+    """Contadores por modelo; latencia y errores como promedios móviles (EWMA)"""
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    tokens_per_item_ewma: Optional[float] = None
+    alpha: float = field(default=0.2, repr=False)
+
+    def record(self, latency: Optional[float], error: bool, prompt_tokens: int = 0, output_tokens: int = 0) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self.prompt_tokens += prompt_tokens
+        self.output_tokens += output_tokens
+        self.error_ewma = self.alpha * float(error) + (1 - self.alpha) * self.error_ewma
+        if latency is not None and not error:
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma = self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+
+    def record_item_size(self, output_tokens: int, items: int) -> None:
+        if output_tokens <= 0 or items <= 0:
+            return
+        per_item = output_tokens / items
+        if self.tokens_per_item_ewma is None:
+            self.tokens_per_item_ewma = per_item
+        else:
+            self.tokens_per_item_ewma = self.alpha * per_item + (1 - self.alpha) * self.tokens_per_item_ewma
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "latency_ewma_seconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "error_rate_ewma": round(self.error_ewma, 4),
+            "tokens_per_item_ewma": (
+                round(self.tokens_per_item_ewma, 1) if self.tokens_per_item_ewma is not None else None
+            ),
+        }
+
+
+class ModelRouter:
+    """
+    Elige modelo y configuración de generación para cada petición.
+
+    - Sin enrutamiento (por defecto) todo va al modelo estándar; el rápido
+      solo se usa cuando se pide explícitamente (nivel "fast first").
+    - Con enrutamiento, las peticiones chicas (pocas noticias y categorías) van
+      al modelo rápido y el resto al estándar, salvo que esté fuera de
+      presupuesto (latencia o tasa de errores) y el rápido esté sano.
+    - `max_output_tokens` sale del tamaño medido de cada noticia en las
+      respuestas del modelo, con holgura, por la cantidad pedida.
+    """
+
+    FAST = "fast"
+    STANDARD = "standard"
+
+    def __init__(
+        self,
+        fast: ModelTier,
+        standard: ModelTier,
+        fast_max_limit: int,
+        latency_budget: float,
+        error_budget: float,
+        cached_input_cost_ratio: float = 0.25,
+        routing_enabled: bool = False,
+        token_headroom: float = 1.5
+    ):
+        self.tiers = {self.FAST: fast, self.STANDARD: standard}
+        self.routing_enabled = routing_enabled
+        self.token_headroom = token_headroom
+        self.fast_max_limit = fast_max_limit
+        self.latency_budget = latency_budget
+        self.error_budget = error_budget
+        self.cached_input_cost_ratio = cached_input_cost_ratio
+        self.model_stats: Dict[str, ModelStats] = {}
+        self.decisions: Dict[str, int] = {self.FAST: 0, self.STANDARD: 0}
+
+    def _stats(self, model: str) -> ModelStats:
+        if model not in self.model_stats:
+            self.model_stats[model] = ModelStats()
+        return self.model_stats[model]
+
+    def _within_budget(self, tier: str) -> bool:
+        stats = self._stats(self.tiers[tier].model)
+        if stats.error_ewma > self.error_budget:
+            return False
+        return stats.latency_ewma is None or stats.latency_ewma <= self.latency_budget
+
+    def choose(self, limit: int, category_count: int = 0, tier: Optional[str] = None) -> RoutingDecision:
+        if tier is None and not self.routing_enabled:
+            tier = self.STANDARD
+        elif tier is None:
+            # Cada categoría extra alarga el prompt y la respuesta
+            tier = self.FAST if limit + category_count <= self.fast_max_limit else self.STANDARD
+            if not self._within_budget(tier):
+                other = self.FAST if tier == self.STANDARD else self.STANDARD
+                if self._within_budget(other):
+                    tier = other
+
+        self.decisions[tier] += 1
+        config = self.tiers[tier]
+        return RoutingDecision(
+            tier=tier,
+            model=config.model,
+            generation_config={
+                "max_output_tokens": config.base_tokens + self.tokens_per_item(tier) * limit,
+                "temperature": config.temperature,
+            }
+        )
+
+    def tokens_per_item(self, tier: str) -> int:
+        """Tokens a reservar por noticia: lo medido con holgura, o la estimación inicial"""
+        config = self.tiers[tier]
+        measured = self._stats(config.model).tokens_per_item_ewma
+        if measured is None:
+            return config.tokens_per_item
+        return max(config.min_tokens_per_item, math.ceil(measured * self.token_headroom))
+
+    def cost(self, tier: str, prompt_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+        """Costo estimado en USD; los tokens servidos desde context caching cuestan menos"""
+        config = self.tiers[tier]
+        billed_prompt = prompt_tokens - cached_tokens + cached_tokens * self.cached_input_cost_ratio
+        return (
+            billed_prompt * config.input_cost_per_million
+            + output_tokens * config.output_cost_per_million
+        ) / 1_000_000
+
+    def record(
+        self,
+        model: str,
+        latency: Optional[float],
+        error: bool = False,
+        prompt_tokens: int = 0,
+        output_tokens: int = 0
+    ) -> None:
+        self._stats(model).record(latency, error, prompt_tokens, output_tokens)
+
+    def record_item_size(self, model: str, output_tokens: int, items: int) -> None:
+        """Registra cuántos tokens de salida ocupó cada noticia efectivamente entregada"""
+        self._stats(model).record_item_size(output_tokens, items)
+
+    def stats(self) -> dict:
+        return {
+            "routing_enabled": self.routing_enabled,
+            "tiers": {name: tier.model for name, tier in self.tiers.items()},
+            "decisions": dict(self.decisions),
+            "models": {model: stats.as_dict() for model, stats in self.model_stats.items()},
+        }
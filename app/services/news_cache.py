@@ -0,0 +1,382 @@
+import hashlib
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.crud.news_batch import news_list_adapter
+from app.schemas.news import NewsItem, NewsCategory
+from app.services.location_index import location_index
+from app.services.news_versions import SNAPSHOT_RECORD, Snapshot, item_digest, pack_snapshot
+
+
+CacheKey = Tuple[str, Tuple[str, ...], str]
+
+
+def normalize_location(location: str) -> str:
+    """ID canónico de la ubicación (o su forma sin tildes, mayúsculas ni espacios extra)"""
+    return location_index.canonical_id(location)
+
+
+def make_cache_key(
+    location: str,
+    categories: Optional[List[NewsCategory]] = None,
+    language: str = "es"
+) -> CacheKey:
+    """Construye la llave de caché: ubicación canónica, categorías ordenadas e idioma"""
+    category_values = tuple(sorted({c.value for c in categories or []}))
+    return normalize_location(location), category_values, language.strip().lower()
+
+
+def encode_items(items: List[NewsItem]) -> List[bytes]:
+    """JSON de cada noticia, tal como lo serializa Pydantic"""
+    return [item.__pydantic_serializer__.to_json(item) for item in items]
+
+
+class CompactBatch:
+    """
+    Lote de noticias en forma compacta: el arreglo JSON en UTF-8 (un solo
+    `bytes`), dónde empieza cada noticia y el snapshot (id, digest) de cada
+    una. Un lote de 10 noticias son 4 objetos en vez de ~150 (modelos, sus
+    dicts, strings y listas de keywords); los `NewsItem` se reconstruyen
+    solo si alguien los pide.
+    """
+    __slots__ = ("json", "offsets", "index")
+
+    def __init__(self, items_json: List[bytes], ids: List[int]):
+        self.json = b"[" + b",".join(items_json) + b"]"
+        # offsets[i] = inicio de la noticia i; la noticia termina un byte antes
+        # del inicio de la siguiente (la coma, o el "]" final)
+        self.offsets = array("I")
+        position = 1
+        for item_json in items_json:
+            self.offsets.append(position)
+            position += len(item_json) + 1
+        self.offsets.append(position)
+        self.index: Snapshot = pack_snapshot(
+            (item_id, item_digest(item_json)) for item_id, item_json in zip(ids, items_json)
+        )
+
+    @classmethod
+    def from_items(cls, items: List[NewsItem]) -> "CompactBatch":
+        return cls(encode_items(items), [item.id for item in items])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Tamaño de los datos del lote (para el límite de memoria del caché)"""
+        return len(self.json) + len(self.offsets) * self.offsets.itemsize + len(self.index)
+
+    @property
+    def ids(self) -> List[int]:
+        return [item_id for item_id, _ in SNAPSHOT_RECORD.iter_unpack(self.index)]
+
+    def chunk(self, position: int) -> bytes:
+        """JSON de una noticia"""
+        return self.json[self.offsets[position]:self.offsets[position + 1] - 1]
+
+    def prefix(self, limit: int) -> bytes:
+        """Arreglo JSON con las primeras `limit` noticias"""
+        if limit >= len(self):
+            return self.json
+        if limit <= 0:
+            return b"[]"
+        return self.json[:self.offsets[limit] - 1] + b"]"
+
+    def snapshot(self, limit: int) -> Snapshot:
+        return self.index[:limit * SNAPSHOT_RECORD.size]
+
+    def items(self, limit: Optional[int] = None) -> List[NewsItem]:
+        """Reconstruye los modelos de las primeras `limit` noticias"""
+        return news_list_adapter.validate_json(self.prefix(len(self) if limit is None else limit))
+
+
+@dataclass
+class EncodedNews:
+    """Arreglo JSON de noticias listo para escribir en la respuesta"""
+    items_json: bytes
+    total: int
+    etag: str
+    generated_at: str
+    # Segundos que el lote sigue fresco en el caché (para `Cache-Control`)
+    max_age: Optional[float] = None
+    # Respuestas completas ya comprimidas, por (ubicación, codificación), en orden LRU
+    variants: "OrderedDict[Tuple[str, str], bytes]" = field(default_factory=OrderedDict, repr=False)
+    # Versión del lote en su llave y cursor de esta vista (para `since`)
+    version: int = 1
+    cursor: str = ""
+    # Lote del que sale la vista y su snapshot, para armar deltas
+    batch: Optional[CompactBatch] = field(default=None, repr=False)
+    snapshot: Snapshot = field(default=b"", repr=False)
+    # Snapshots anteriores de la misma llave, por cursor (compartido con la entrada)
+    history: Dict[str, Snapshot] = field(default_factory=dict, repr=False)
+    # Avisa a la entrada dueña cuando cambia lo que la vista ocupa
+    on_resize: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+    MAX_VARIANTS = 8
+
+    def buffers(self) -> List[bytes]:
+        """Lo que la vista guarda aparte del lote: prefijo copiado, snapshot y variantes"""
+        buffers = [self.snapshot, *self.variants.values()]
+        if self.batch is None or self.items_json is not self.batch.json:
+            buffers.append(self.items_json)
+        return buffers
+
+    @property
+    def item_chunks(self) -> List[bytes]:
+        """JSON de cada noticia de la vista"""
+        if self.batch is None:
+            return []
+        return [self.batch.chunk(position) for position in range(self.total)]
+
+    def get_variant(self, location: str, encoding: str) -> Optional[bytes]:
+        body = self.variants.get((location, encoding))
+        if body is not None:
+            self.variants.move_to_end((location, encoding))
+        return body
+
+    def set_variant(self, location: str, encoding: str, body: bytes) -> None:
+        # Acotado: un lote cercano puede responder bajo varios nombres de ubicación;
+        # se descarta la variante menos usada, no todas
+        self.variants[(location, encoding)] = body
+        self.variants.move_to_end((location, encoding))
+        while len(self.variants) > self.MAX_VARIANTS:
+            self.variants.popitem(last=False)
+        if self.on_resize is not None:
+            self.on_resize()
+
+
+def encode_news(
+    batch: CompactBatch,
+    limit: Optional[int] = None,
+    generated_at: Optional[datetime] = None,
+    version: int = 1
+) -> EncodedNews:
+    """
+    Arma la vista JSON de las primeras `limit` noticias de un lote, con su
+    snapshot y el cursor que los clientes mandan en `since`.
+    """
+    total = len(batch) if limit is None else min(limit, len(batch))
+    body = batch.prefix(total)
+    # ETag débil: identifica las noticias, no el resto de la respuesta
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return EncodedNews(
+        items_json=body,
+        total=total,
+        etag=f'W/"{digest}"',
+        generated_at=(generated_at or datetime.utcnow()).isoformat(),
+        version=version,
+        cursor=digest,
+        batch=batch,
+        snapshot=batch.snapshot(total)
+    )
+
+
+@dataclass
+class CacheEntry:
+    """Lote de noticias generado para una llave, guardado en forma compacta"""
+    batch: CompactBatch
+    limit: int
+    created_at: float
+    ttl: float
+    size: int
+    generated_at: datetime = field(default_factory=datetime.utcnow)
+    # Se incrementa cada vez que cambia el contenido del lote de esta llave
+    version: int = 1
+    # Snapshots de las vistas entregadas, por cursor; pasa de un lote al siguiente
+    history: "OrderedDict[str, Snapshot]" = field(default_factory=OrderedDict, repr=False)
+    _encoded: Dict[int, EncodedNews] = field(default_factory=dict, repr=False)
+    # Bytes de las vistas, sus variantes comprimidas y el historial
+    view_bytes: int = 0
+    # Lo instala el caché para cobrar el crecimiento de la entrada
+    on_resize: Optional[Callable[[int], None]] = field(default=None, repr=False)
+
+    MAX_HISTORY = 16
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.monotonic()) - self.created_at
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.age(now) < self.ttl
+
+    def covers(self, limit: int) -> bool:
+        """Si el lote se generó con un límite suficiente para responder `limit`"""
+        return self.limit >= limit
+
+    def news(self, limit: Optional[int] = None) -> List[NewsItem]:
+        """Las primeras `limit` noticias como modelos (se reconstruyen en cada llamada)"""
+        return self.batch.items(limit)
+
+    def encoded(self, limit: int) -> EncodedNews:
+        """Las primeras `limit` noticias en JSON (se arma una vez por `limit`)"""
+        encoded = self._encoded.get(limit)
+        if encoded is None:
+            encoded = self._encoded[limit] = encode_news(
+                self.batch,
+                limit,
+                self.generated_at,
+                version=self.version
+            )
+            encoded.history = self.history
+            encoded.on_resize = self.resize
+            self.history[encoded.cursor] = encoded.snapshot
+            self.history.move_to_end(encoded.cursor)
+            while len(self.history) > self.MAX_HISTORY:
+                self.history.popitem(last=False)
+            self.resize()
+        return encoded
+
+    def resize(self) -> None:
+        """Recalcula lo que ocupan las vistas y avisa al caché de la diferencia"""
+        # Por identidad: el snapshot de una vista es el mismo objeto que guarda el historial
+        buffers = {id(snapshot): snapshot for snapshot in self.history.values()}
+        for view in self._encoded.values():
+            buffers.update((id(buffer), buffer) for buffer in view.buffers())
+        view_bytes = sum(len(buffer) for buffer in buffers.values())
+        delta = view_bytes - self.view_bytes
+        if not delta:
+            return
+        self.view_bytes = view_bytes
+        self.size += delta
+        if self.on_resize is not None:
+            self.on_resize(delta)
+
+
+class NewsCache:
+    """
+    Caché LRU en memoria de lotes de noticias.
+
+    Cada entrada tiene su propio TTL y, una vez vencida, se puede seguir
+    sirviendo durante `stale_ttl` segundos mientras se refresca. Las
+    entradas se desalojan por tamaño total aproximado en bytes, que incluye
+    las vistas JSON por `limit`, sus variantes comprimidas y el historial;
+    hasta entonces quedan disponibles como respaldo con `get_last_good`.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._view_bytes = 0
+
+        # Métricas
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.fallback_hits = 0
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def peek(self, key: CacheKey) -> Optional[CacheEntry]:
+        """La entrada tal cual, sin tocar el orden del LRU ni las métricas"""
+        return self._entries.get(key)
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Retorna la entrada (fresca o no) y la marca como usada recientemente"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        # Las entradas vencidas se conservan (hasta que el LRU las desaloje)
+        # como último resultado bueno si Gemini no está disponible
+        if entry.age() >= entry.ttl + self.stale_ttl:
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_last_good(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Retorna la entrada sin importar su antigüedad"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.fallback_hits += 1
+        return entry
+
+    def set(
+        self,
+        key: CacheKey,
+        items: List[NewsItem],
+        limit: int,
+        ttl: Optional[float] = None,
+        age: float = 0.0
+    ) -> CacheEntry:
+        """
+        Guarda un lote, desalojando las entradas menos usadas si hace falta.
+        `age` permite cargar lotes generados antes (p. ej. por otro worker).
+        """
+        # Se serializa una sola vez y no se guardan los modelos: el JSON sirve
+        # para responder, para medir el tamaño y para reconstruirlos si hace falta
+        batch = CompactBatch.from_items(items)
+        previous = self._entries.get(key)
+        entry = CacheEntry(
+            batch=batch,
+            limit=limit,
+            created_at=time.monotonic() - age,
+            ttl=ttl if ttl is not None else self.ttl,
+            size=batch.nbytes,
+            generated_at=datetime.utcnow() - timedelta(seconds=age)
+        )
+        if previous is not None:
+            # La versión y el historial siguen a la llave, no al lote
+            entry.history = previous.history
+            entry.version = previous.version + (previous.batch.json != batch.json)
+            entry.resize()
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._view_bytes += entry.view_bytes
+        entry.on_resize = lambda delta: self._resized(key, entry, delta)
+        self._evict()
+        return entry
+
+    def _resized(self, key: CacheKey, entry: CacheEntry, delta: int) -> None:
+        """Una entrada armó vistas o variantes nuevas después de guardarse"""
+        # Una entrada ya reemplazada o desalojada no cuenta
+        if self._entries.get(key) is not entry:
+            return
+        self._bytes += delta
+        self._view_bytes += delta
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self._view_bytes -= entry.view_bytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._view_bytes = 0
+
+    def stats(self) -> dict:
+        """Estado actual del caché"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "view_bytes": self._view_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "fallback_hits": self.fallback_hits,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,54 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Iterable, List
+
+from app.schemas.news import NewsItem
+
+
+def normalize_title(title: str) -> str:
+    """Título en minúsculas, sin tildes ni puntuación, para comparar"""
+    title = unicodedata.normalize("NFKD", title.casefold())
+    title = "".join(c for c in title if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", title).split())
+
+
+def titles_similar(a: str, b: str, threshold: float) -> bool:
+    """Compara dos títulos ya normalizados"""
+    if a == b:
+        return True
+    words_a, words_b = set(a.split()), set(b.split())
+    if words_a and words_b:
+        jaccard = len(words_a & words_b) / len(words_a | words_b)
+        if jaccard >= threshold:
+            return True
+    return SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+def merge_news_batches(
+    batches: Iterable[List[NewsItem]],
+    limit: int,
+    similarity: float = 0.85
+) -> List[NewsItem]:
+    """
+    Une varios lotes de noticias en uno solo.
+
+    Ordena por `relevance_score` (manteniendo el orden original en empates),
+    descarta las noticias con títulos casi iguales a una ya elegida y
+    renumera los ids desde 1.
+    """
+    candidates = [item for batch in batches for item in batch]
+    candidates.sort(key=lambda item: item.relevance_score, reverse=True)
+
+    merged: List[NewsItem] = []
+    seen_titles: List[str] = []
+    for item in candidates:
+        title = normalize_title(item.title)
+        if any(titles_similar(title, seen, similarity) for seen in seen_titles):
+            continue
+        seen_titles.append(title)
+        merged.append(item.model_copy(update={"id": len(merged) + 1}))
+        if len(merged) >= limit:
+            break
+
+    return merged
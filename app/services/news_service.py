@@ -0,0 +1,739 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import replace
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.crud.news_batch import get_news_batch, save_news_batch, store_key
+from app.db.base import NewsStore
+from app.db.session import news_store
+from app.schemas.news import NewsItem, NewsCategory
+from app.services.gemini_service import gemini_service, GeminiService
+from app.services.model_router import ModelRouter
+from app.services.geo_index import GeoPoint, ProximityIndex
+from app.services.location_index import fold, fold_parts, location_index
+from app.services.news_cache import (
+    CacheEntry,
+    CacheKey,
+    CompactBatch,
+    EncodedNews,
+    NewsCache,
+    encode_news,
+    make_cache_key
+)
+from app.services.news_merge import merge_news_batches
+from app.services.news_versions import merge_generation, stable_id, with_stable_ids
+from app.services.prewarm import PrewarmScheduler
+from app.services.shared_stream import SharedStream
+
+logger = logging.getLogger(__name__)
+
+
+class NewsService:
+    """
+    Obtiene noticias por ubicación pasando por el caché.
+
+    - Las llamadas concurrentes para la misma llave comparten una sola generación.
+    - Las entradas vencidas se sirven de inmediato mientras se refrescan en segundo plano.
+    - Un lote generado con un `limit` mayor responde peticiones con `limit` menor.
+    - Con `news_fanout_enabled`, las peticiones con varias categorías se generan
+      en paralelo por grupo de categorías y se unen.
+    - Con `news_fast_first_enabled`, el modelo rápido responde las primeras
+      noticias mientras el modelo estándar completa el lote.
+    - Con `news_proximity_enabled`, una ubicación sin caché se responde con
+      el lote fresco más cercano dentro de `news_proximity_radius_km`
+      (mismo país y, opcionalmente, misma región).
+    """
+
+    def __init__(self, gemini: GeminiService, cache: NewsCache, store: Optional[NewsStore] = None):
+        self.gemini = gemini
+        self.cache = cache
+        self.store = store
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._in_flight: Dict[CacheKey, Tuple[int, asyncio.Task]] = {}
+        # Noticias de las generaciones en streaming en curso, por llave
+        self._streams: Dict[CacheKey, Tuple[asyncio.Task, SharedStream[NewsItem]]] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._observers: List[Callable[..., None]] = []
+        self.fast_first_responses = 0
+        self.store_hits = 0
+        self.store_waits = 0
+        self.store_errors = 0
+        self.proximity: Optional[ProximityIndex] = None
+        if settings.news_proximity_enabled:
+            self.proximity = ProximityIndex(cell_km=settings.news_proximity_radius_km)
+        self.proximity_hits = 0
+
+    def add_observer(self, observer: Callable[..., None]) -> None:
+        """
+        Registra una función que se llama en cada consulta con
+        (key, location, limit, categories, language, hit).
+        """
+        self._observers.append(observer)
+
+    def _notify(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str,
+        hit: bool
+    ) -> None:
+        for observer in self._observers:
+            observer(key, location, limit, categories, language, hit)
+
+    async def get_news(
+        self,
+        location: str,
+        limit: int = 10,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es",
+        coordinates: Optional[Tuple[float, float]] = None
+    ) -> List[NewsItem]:
+        """
+        Noticias de una ubicación. `coordinates` (latitud, longitud) permite
+        reutilizar lotes de ubicaciones cercanas.
+        """
+        items, entry = await self._resolve(location, limit, categories, language, coordinates)
+        if items is None:
+            return entry.news(limit)
+        return items[:limit]
+
+    async def get_news_encoded(
+        self,
+        location: str,
+        limit: int = 10,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es",
+        coordinates: Optional[Tuple[float, float]] = None
+    ) -> EncodedNews:
+        """
+        Igual que `get_news`, pero retorna el JSON de las noticias ya
+        serializado: en un acierto de caché no se reconstruye ningún modelo.
+        """
+        items, entry = await self._resolve(location, limit, categories, language, coordinates)
+        if entry is not None:
+            return replace(entry.encoded(limit), max_age=max(0.0, entry.ttl - entry.age()))
+        return encode_news(CompactBatch.from_items(items[:limit]))
+
+    async def _resolve(
+        self,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str,
+        coordinates: Optional[Tuple[float, float]]
+    ) -> Tuple[Optional[List[NewsItem]], Optional[CacheEntry]]:
+        """
+        Noticias de la ubicación y, si salen del caché, la entrada que las
+        tiene. En un acierto las noticias van como `None`: los modelos solo
+        se reconstruyen (`entry.news`) si quien llama los necesita.
+        """
+        # Las variantes de un mismo lugar comparten llave y prompt
+        location = location_index.display_name(location)
+        key = make_cache_key(location, categories, language)
+        entry = self.cache.get(key)
+
+        hit = entry is not None and entry.covers(limit)
+        if not hit:
+            nearby = self._nearby_entry(key, location, coordinates, limit)
+            if nearby is not None:
+                return None, nearby
+        self._notify(key, location, limit, categories, language, hit)
+
+        if hit:
+            if entry.is_fresh():
+                self.cache.hits += 1
+            else:
+                self.cache.stale_hits += 1
+                self._refresh_in_background(key, location, entry.limit, categories, language)
+            return None, entry
+
+        self.cache.misses += 1
+        try:
+            items = await self._load(key, location, limit, categories, language)
+        except Exception as e:
+            # Con Gemini caído se sirve el último resultado bueno, aunque esté vencido
+            last_good = self.cache.get_last_good(key)
+            if last_good is not None:
+                logger.warning("Sirviendo último resultado bueno para %s: %s", key, e)
+                return None, last_good
+            items = await self._read_store(key, limit=1, max_age=None)
+            if items is None:
+                raise
+            logger.warning("Sirviendo último resultado bueno para %s: %s", key, e)
+            return items, self.cache.get(key)
+
+        # El lote recién generado ya quedó en el caché con su JSON serializado
+        entry = self.cache.get(key)
+        if entry is not None and entry.covers(limit):
+            return items, entry
+        return items, None
+
+    def is_cached(
+        self,
+        location: str,
+        limit: int = 10,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es"
+    ) -> bool:
+        """Si `get_news` respondería desde el caché (fresco o vencido), sin tocar métricas"""
+        entry = self.cache.get(make_cache_key(location, categories, language))
+        return entry is not None and entry.covers(limit)
+
+    async def remember(self, key: CacheKey, items: List[NewsItem], limit: int) -> List[NewsItem]:
+        """Guarda en caché y en el store un lote generado fuera de `get_news`"""
+        if not items:
+            return items
+        items = self._cache_batch(key, items, limit)
+        await self._write_store(key, items, limit)
+        return items
+
+    def _cache_batch(self, key: CacheKey, items: List[NewsItem], limit: int, age: float = 0.0) -> List[NewsItem]:
+        """
+        Guarda un lote con IDs estables y retorna las noticias tal como quedaron.
+        Si la llave ya tenía uno, la generación nueva se une a él (ver
+        `merge_generation`) en vez de reemplazarlo entero, así las noticias que
+        siguen vigentes conservan su ID y su contenido.
+        """
+        items = with_stable_ids(items)
+        previous = self.cache.peek(key)
+        if previous is not None:
+            # Los modelos del lote anterior solo hacen falta para completar una generación corta
+            items = merge_generation(previous.news() if len(items) < limit else [], items, limit)
+        self.cache.set(key, items, limit, age=age)
+        return items
+
+    def _geo_point(self, location: str, coordinates: Optional[Tuple[float, float]]) -> Optional[GeoPoint]:
+        """Posición y zona de una ubicación: del lugar canónico o de las coordenadas dadas"""
+        place = location_index.resolve(location)
+        if place is not None:
+            latitude, longitude = coordinates or (place.latitude, place.longitude)
+            return GeoPoint(latitude, longitude, location, fold(place.country), fold(place.region or ""))
+        if coordinates is None or None in coordinates:
+            return None
+        # "ciudad, región, país": la zona sale de las últimas partes
+        parts = fold_parts(location)
+        return GeoPoint(
+            coordinates[0],
+            coordinates[1],
+            location,
+            parts[-1] if len(parts) > 1 else None,
+            parts[-2] if len(parts) > 2 else None
+        )
+
+    def _nearby_entry(
+        self,
+        key: CacheKey,
+        location: str,
+        coordinates: Optional[Tuple[float, float]],
+        limit: int
+    ) -> Optional[CacheEntry]:
+        """
+        Lote fresco de otra ubicación cercana que cubra `limit`, con las mismas
+        categorías e idioma. Registra de paso la posición de `key` en el índice.
+        """
+        if self.proximity is None:
+            return None
+        point = self._geo_point(location, coordinates)
+        if point is None:
+            return None
+        self.proximity.add(key, point)
+
+        for _, other in self.proximity.nearby(
+            point.latitude, point.longitude, settings.news_proximity_radius_km
+        ):
+            if other == key or other[1:] != key[1:]:
+                continue
+            if other not in self.cache:
+                # El lote ya salió del caché: no tiene sentido seguir indexándolo
+                self.proximity.remove(other)
+                continue
+            other_point = self.proximity.get(other)
+            if point.country is None or other_point.country != point.country:
+                continue
+            if settings.news_proximity_same_region and other_point.region != point.region:
+                continue
+            entry = self.cache.get(other)
+            if entry is None or not entry.is_fresh() or not entry.covers(limit):
+                continue
+
+            # El acierto cuenta para la llave vecina, que es la que se sirve
+            self.proximity_hits += 1
+            self.cache.hits += 1
+            self._notify(
+                other, other_point.location, limit,
+                [NewsCategory(c) for c in other[1]] or None, other[2], True
+            )
+            return entry
+        return None
+
+    async def refresh(
+        self,
+        location: str,
+        limit: int = 10,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es"
+    ) -> List[NewsItem]:
+        """Regenera el lote de una llave aunque esté en caché"""
+        location = location_index.display_name(location)
+        key = make_cache_key(location, categories, language)
+        return await self._load(key, location, limit, categories, language)
+
+    async def stream_news(
+        self,
+        location: str,
+        limit: int = 10,
+        categories: Optional[List[NewsCategory]] = None,
+        language: str = "es",
+        coordinates: Optional[Tuple[float, float]] = None
+    ) -> AsyncIterator[NewsItem]:
+        """
+        Entrega las noticias una a una.
+
+        Primero salen las noticias cacheadas; si no alcanzan para `limit`, el
+        resto se genera en streaming y el lote completo queda en el caché.
+        """
+        location = location_index.display_name(location)
+        key = make_cache_key(location, categories, language)
+        entry = self.cache.get(key)
+        if entry is None or not entry.covers(limit):
+            nearby = self._nearby_entry(key, location, coordinates, limit)
+            if nearby is not None:
+                for item in nearby.news(limit):
+                    yield item
+                return
+        sent: List[NewsItem] = []
+        self._notify(
+            key, location, limit, categories, language,
+            entry is not None and entry.covers(limit)
+        )
+
+        if entry is not None:
+            if entry.covers(limit):
+                if entry.is_fresh():
+                    self.cache.hits += 1
+                else:
+                    self.cache.stale_hits += 1
+                    self._refresh_in_background(key, location, entry.limit, categories, language)
+            for item in entry.news(limit):
+                sent.append(item)
+                yield item
+            if entry.covers(limit):
+                return
+
+        self.cache.misses += 1
+
+        # Si ya hay una generación en curso que cubre el pedido, se usa esa:
+        # si es en streaming, sus noticias llegan a medida que se generan
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[0] >= limit:
+            streaming = self._streams.get(key)
+            if streaming is None or streaming[0] is not in_flight[1]:
+                items = await asyncio.shield(in_flight[1])
+                for item in items[len(sent):limit]:
+                    yield item
+                return
+            shared = streaming[1]
+        else:
+            shared = self._start_stream_generation(key, location, limit, categories, language)
+
+        sent_titles = {item.title.strip().lower() for item in sent}
+        async for item in shared.subscribe():
+            if len(sent) >= limit:
+                break
+            if item.title.strip().lower() in sent_titles:
+                continue
+            sent.append(item)
+            yield item
+
+    def _start_stream_generation(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str
+    ) -> SharedStream[NewsItem]:
+        """
+        Genera en streaming una sola vez por llave: los demás clientes de
+        `stream_news` se suscriben y los de `get_news` esperan el lote. La
+        generación sigue aunque se desconecte quien la inició.
+        """
+        shared: SharedStream[NewsItem] = SharedStream()
+
+        async def generate() -> List[NewsItem]:
+            generated: List[NewsItem] = []
+            seen = set()
+            try:
+                async for item in self.gemini.stream_news_by_location(
+                    location=location,
+                    limit=limit,
+                    categories=categories,
+                    language=language
+                ):
+                    # El mismo ID estable que tendrá la noticia en el lote cacheado;
+                    # una noticia repetida no se publica dos veces
+                    item_id = stable_id(item)
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                    item = item.model_copy(update={"id": item_id})
+                    generated.append(item)
+                    shared.publish(item)
+            except BaseException as e:
+                # Los suscriptores no deben quedar esperando, tampoco si se cancela
+                shared.close(e if isinstance(e, Exception) else RuntimeError("Generación cancelada"))
+                raise
+            shared.close()
+            return self._cache_batch(key, generated, limit) if generated else generated
+
+        task = asyncio.create_task(generate())
+        self._in_flight[key] = (limit, task)
+        self._streams[key] = (task, shared)
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return shared
+
+    async def _load(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str
+    ) -> List[NewsItem]:
+        """Genera el lote o se une a una generación en curso que lo cubra"""
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[0] >= limit:
+            task = in_flight[1]
+        elif self._use_fast_first(limit):
+            return await self._load_fast_first(key, location, limit, categories, language)
+        else:
+            task = self._start_generation(key, location, limit, categories, language)
+
+        # shield: si un cliente se desconecta, la generación sigue para los demás
+        return await asyncio.shield(task)
+
+    def _start_generation(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str
+    ) -> asyncio.Task:
+        task = asyncio.create_task(
+            self._generate(key, location, limit, categories, language)
+        )
+        self._in_flight[key] = (limit, task)
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    def _use_fast_first(self, limit: int) -> bool:
+        return settings.news_fast_first_enabled and limit > settings.news_fast_first_items
+
+    async def _load_fast_first(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str
+    ) -> List[NewsItem]:
+        """
+        Lanza en paralelo el lote completo (modelo estándar) y unas pocas
+        noticias con el modelo rápido. Se responde con lo que llegue primero;
+        el lote completo sigue en segundo plano y queda en el caché.
+        """
+        full = self._start_generation(key, location, limit, categories, language)
+        quick = asyncio.create_task(
+            self.gemini.get_news_by_location(
+                location=location,
+                limit=settings.news_fast_first_items,
+                categories=categories,
+                language=language,
+                tier=ModelRouter.FAST
+            )
+        )
+
+        quick.add_done_callback(self._log_quick_failure)
+
+        await asyncio.wait({full, quick}, return_when=asyncio.FIRST_COMPLETED)
+        full_ok = full.done() and full.exception() is None
+        quick_ok = quick.done() and quick.exception() is None and bool(quick.result())
+        if quick_ok and not full_ok:
+            self.fast_first_responses += 1
+            # No pasa por el caché: los IDs estables se asignan aquí
+            return with_stable_ids(quick.result())
+
+        quick.cancel()
+        return await asyncio.shield(full)
+
+    def _log_quick_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Falló el nivel rápido: %s", task.exception())
+
+    async def _generate(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str
+    ) -> List[NewsItem]:
+        # Otro worker (o una ejecución anterior) puede haber generado el lote.
+        # Solo sirve si es más nuevo que el que ya está en el caché: si no, un
+        # refresco antes de vencer recibiría el mismo lote y no llamaría a Gemini
+        cached = self.cache.peek(key)
+        newer_than = time.time() - cached.age() + 1.0 if cached is not None else None
+        stored = await self._read_store(key, limit, max_age=self.cache.ttl, newer_than=newer_than)
+        if stored is not None:
+            return stored
+
+        leased = await self._acquire_lease(key)
+        if not leased:
+            stored = await self._wait_for_store(key, limit, newer_than)
+            if stored is not None:
+                return stored
+
+        try:
+            if self._should_fan_out(categories):
+                items = await self._generate_fanout(location, limit, categories, language)
+            else:
+                items = await self.gemini.get_news_by_location(
+                    location=location,
+                    limit=limit,
+                    categories=categories,
+                    language=language
+                )
+            # Una respuesta vacía suele ser un error de parsing: no se cachea
+            if items:
+                items = self._cache_batch(key, items, limit)
+                await self._write_store(key, items, limit)
+            return items
+        finally:
+            if leased:
+                await self._release_lease(key)
+
+    async def _read_store(
+        self,
+        key: CacheKey,
+        limit: int,
+        max_age: Optional[float],
+        newer_than: Optional[float] = None
+    ) -> Optional[List[NewsItem]]:
+        """
+        Busca el lote en el store; si sirve, lo carga también en el caché.
+        `newer_than` (epoch) descarta los lotes generados hasta ese momento.
+        """
+        if self.store is None:
+            return None
+        try:
+            stored = await get_news_batch(self.store, key)
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning("Error leyendo el store para %s: %s", key, e)
+            return None
+        if stored is None:
+            return None
+
+        items, record = stored
+        age = max(time.time() - record.generated_at, 0.0)
+        if record.limit < limit or (max_age is not None and age >= max_age):
+            return None
+        if newer_than is not None and record.generated_at <= newer_than:
+            return None
+
+        self.store_hits += 1
+        return self._cache_batch(key, items, record.limit, age=age)
+
+    async def _write_store(self, key: CacheKey, items: List[NewsItem], limit: int) -> None:
+        if self.store is None:
+            return
+        try:
+            await save_news_batch(
+                self.store, key, items, limit,
+                ttl=settings.news_store_retention_seconds
+            )
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning("Error guardando en el store %s: %s", key, e)
+
+    async def _acquire_lease(self, key: CacheKey) -> bool:
+        """
+        Reserva la generación entre workers. Retorna False solo si otro worker
+        la tiene; sin store o con el store caído se genera localmente.
+        """
+        if self.store is None:
+            return True
+        try:
+            return await self.store.acquire_lease(
+                store_key(key), self._owner, settings.news_store_lease_seconds
+            )
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning("Error reservando %s, se genera localmente: %s", key, e)
+            return True
+
+    async def _release_lease(self, key: CacheKey) -> None:
+        if self.store is None:
+            return
+        try:
+            await self.store.release_lease(store_key(key), self._owner)
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning("Error liberando %s: %s", key, e)
+
+    async def _wait_for_store(
+        self,
+        key: CacheKey,
+        limit: int,
+        newer_than: Optional[float] = None
+    ) -> Optional[List[NewsItem]]:
+        """Otro worker está generando esta llave: se espera su resultado un rato"""
+        if self.store is None:
+            return None
+        self.store_waits += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.news_store_wait_seconds
+        while loop.time() < deadline:
+            await asyncio.sleep(settings.news_store_poll_seconds)
+            stored = await self._read_store(key, limit, max_age=self.cache.ttl, newer_than=newer_than)
+            if stored is not None:
+                return stored
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "fast_first_responses": self.fast_first_responses,
+            "store_enabled": self.store is not None,
+            "store_hits": self.store_hits,
+            "store_waits": self.store_waits,
+            "store_errors": self.store_errors,
+            "proximity_enabled": self.proximity is not None,
+            "proximity_hits": self.proximity_hits,
+            "proximity_indexed_keys": len(self.proximity) if self.proximity is not None else 0,
+        }
+
+    def _should_fan_out(self, categories: Optional[List[NewsCategory]]) -> bool:
+        return (
+            settings.news_fanout_enabled
+            and categories is not None
+            and len(set(categories)) >= settings.news_fanout_min_categories
+        )
+
+    async def _generate_fanout(
+        self,
+        location: str,
+        limit: int,
+        categories: List[NewsCategory],
+        language: str
+    ) -> List[NewsItem]:
+        """
+        Divide la petición en sub-peticiones concurrentes por grupo de
+        categorías, cada una con un presupuesto de salida menor, y une los
+        resultados. Cada sub-petición usa el caché con su propia llave.
+        """
+        unique = sorted(set(categories), key=lambda c: c.value)
+        size = max(settings.news_fanout_chunk_size, 1)
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+        # Un poco de holgura para compensar los duplicados entre grupos
+        chunk_limit = min(-(-limit // len(chunks)) + 1, 20)
+
+        results = await asyncio.gather(
+            *(
+                self._generate_chunk(location, chunk_limit, chunk, language)
+                for chunk in chunks
+            ),
+            return_exceptions=True
+        )
+
+        batches = [result for result in results if not isinstance(result, BaseException)]
+        if not batches:
+            raise results[0]
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning("Sub-petición fallida para %s: %s", location, result)
+
+        return merge_news_batches(batches, limit, settings.news_fanout_title_similarity)
+
+    async def _generate_chunk(
+        self,
+        location: str,
+        limit: int,
+        categories: List[NewsCategory],
+        language: str
+    ) -> List[NewsItem]:
+        """
+        Sub-petición del fan-out: el lote fresco de su llave si lo hay, si no
+        se genera directo. No vuelve a pasar por `get_news` (ni por `_load`):
+        así no se divide otra vez ni espera la generación que la lanzó.
+        """
+        key = make_cache_key(location, categories, language)
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh() and entry.covers(limit):
+            return entry.news(limit)
+        items = await self.gemini.get_news_by_location(
+            location=location,
+            limit=limit,
+            categories=categories,
+            language=language
+        )
+        return self._cache_batch(key, items, limit) if items else items
+
+    def _forget(self, key: CacheKey, task: asyncio.Task) -> None:
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[1] is task:
+            del self._in_flight[key]
+        streaming = self._streams.get(key)
+        if streaming is not None and streaming[0] is task:
+            del self._streams[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Evita el warning de excepción no recuperada si nadie esperaba la tarea
+            logger.debug("Generación fallida para %s: %s", key, task.exception())
+
+    def _refresh_in_background(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str
+    ) -> None:
+        """Lanza un refresco en segundo plano si no hay uno en curso"""
+        if key in self._in_flight:
+            return
+
+        async def refresh():
+            try:
+                await self._load(key, location, limit, categories, language)
+            except Exception:
+                logger.exception("Error refrescando noticias para %s", key)
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+# Singleton
+news_cache = NewsCache(
+    ttl=settings.news_cache_ttl_seconds,
+    stale_ttl=settings.news_cache_stale_seconds,
+    max_bytes=settings.news_cache_max_bytes
+)
+news_service = NewsService(gemini_service, news_cache, news_store)
+prewarm_scheduler = PrewarmScheduler(
+    news_service,
+    top_n=settings.prewarm_top_n,
+    calls_per_minute=settings.prewarm_calls_per_minute,
+    interval=settings.prewarm_interval_seconds,
+    lookahead=settings.prewarm_lookahead_seconds,
+    jitter=settings.prewarm_jitter_seconds,
+    half_life=settings.prewarm_half_life_seconds,
+    min_score=settings.prewarm_min_score
+)
+news_service.add_observer(prewarm_scheduler.record)
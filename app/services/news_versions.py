@@ -0,0 +1,67 @@
+import hashlib
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+from app.schemas.news import NewsItem
+from app.services.news_merge import normalize_title
+
+# Snapshot de un lote tal como lo recibió un cliente: registros (id, digest del
+# contenido) empaquetados en un solo `bytes`, en el orden del lote
+Snapshot = bytes
+SNAPSHOT_RECORD = struct.Struct(">q8s")
+
+
+def stable_id(item: NewsItem) -> int:
+    """
+    ID derivado del título normalizado: la misma noticia conserva su ID entre
+    generaciones. 48 bits, para que sea un entero seguro también en JavaScript.
+    """
+    digest = hashlib.blake2b(normalize_title(item.title).encode("utf-8"), digest_size=6).digest()
+    return int.from_bytes(digest, "big")
+
+
+def with_stable_ids(items: List[NewsItem]) -> List[NewsItem]:
+    """Reemplaza el `id` 1..N de Gemini por el ID estable (sin repetir noticias)"""
+    result: List[NewsItem] = []
+    seen = set()
+    for item in items:
+        item_id = stable_id(item)
+        if item_id in seen:
+            continue
+        seen.add(item_id)
+        result.append(item if item.id == item_id else item.model_copy(update={"id": item_id}))
+    return result
+
+
+def merge_generation(previous: List[NewsItem], fresh: List[NewsItem], limit: int) -> List[NewsItem]:
+    """
+    Une una generación nueva con el lote que reemplaza: manda la nueva (en
+    su orden) y, si trajo menos de `limit` noticias (p. ej. una respuesta
+    truncada y rescatada), se completa con las anteriores que no repite.
+    """
+    merged = list(fresh[:limit])
+    if len(merged) >= limit:
+        return merged
+    ids = {item.id for item in merged}
+    for item in previous:
+        if item.id not in ids:
+            merged.append(item)
+            ids.add(item.id)
+            if len(merged) >= limit:
+                break
+    return merged
+
+
+def item_digest(item_json: bytes) -> bytes:
+    """Digest del JSON de una noticia: cambia si cambia cualquier campo"""
+    return hashlib.blake2b(item_json, digest_size=8).digest()
+
+
+def pack_snapshot(entries: Iterable[Tuple[int, bytes]]) -> Snapshot:
+    """Empaqueta pares (id, digest) en un snapshot"""
+    return b"".join(SNAPSHOT_RECORD.pack(item_id, digest) for item_id, digest in entries)
+
+
+def unpack_snapshot(snapshot: Snapshot) -> Dict[int, bytes]:
+    """id -> digest de un snapshot, en el orden del lote"""
+    return dict(SNAPSHOT_RECORD.iter_unpack(snapshot))
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.schemas.news import NewsCategory
+from app.services.news_cache import CacheKey
+from app.services.token_bucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrackedKey:
+    """Frecuencia de peticiones de una llave de caché"""
+    location: str
+    categories: Optional[List[NewsCategory]]
+    language: str
+    limit: int
+    score: float
+    updated_at: float
+    requests: int = 0
+    hits: int = 0
+
+
+class PrewarmScheduler:
+    """
+    Regenera las llaves más pedidas antes de que venzan en el caché.
+
+    La frecuencia de cada llave decae exponencialmente (`half_life`), así
+    que solo se mantienen calientes las ubicaciones con tráfico reciente.
+    Los refrescos respetan un presupuesto de llamadas a Gemini por minuto y
+    se espacian con jitter para no generar ráfagas.
+    """
+
+    def __init__(
+        self,
+        news_service,
+        top_n: int,
+        calls_per_minute: float,
+        interval: float,
+        lookahead: float,
+        jitter: float,
+        half_life: float,
+        min_score: float,
+        max_tracked: int = 5000
+    ):
+        self.news_service = news_service
+        self.top_n = top_n
+        self.interval = interval
+        self.lookahead = lookahead
+        self.jitter = jitter
+        self.half_life = half_life
+        self.min_score = min_score
+        self.max_tracked = max_tracked
+        self.budget = TokenBucket(rate=calls_per_minute / 60.0, burst=max(calls_per_minute, 1.0))
+        self._tracked: Dict[CacheKey, TrackedKey] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.skipped_budget = 0
+        self.late_refreshes = 0
+        self.total_refresh_lead = 0.0
+
+    def _decayed(self, tracked: TrackedKey, now: float) -> float:
+        return tracked.score * 0.5 ** ((now - tracked.updated_at) / self.half_life)
+
+    def record(
+        self,
+        key: CacheKey,
+        location: str,
+        limit: int,
+        categories: Optional[List[NewsCategory]],
+        language: str,
+        hit: bool
+    ) -> None:
+        """Registra una petición (la llama NewsService en cada consulta)"""
+        now = time.monotonic()
+        tracked = self._tracked.get(key)
+        if tracked is None:
+            tracked = TrackedKey(location, categories, language, limit, 0.0, now)
+            self._tracked[key] = tracked
+            if len(self._tracked) > self.max_tracked:
+                self._evict_coldest(now)
+
+        tracked.score = self._decayed(tracked, now) + 1.0
+        tracked.updated_at = now
+        tracked.limit = max(tracked.limit, limit)
+        tracked.requests += 1
+        if hit:
+            tracked.hits += 1
+
+    def _evict_coldest(self, now: float) -> None:
+        coldest = min(self._tracked, key=lambda k: self._decayed(self._tracked[k], now))
+        del self._tracked[coldest]
+
+    def hottest(self) -> List[tuple]:
+        """Las `top_n` llaves más pedidas que superan `min_score`"""
+        now = time.monotonic()
+        scored = [
+            (self._decayed(tracked, now), key, tracked)
+            for key, tracked in self._tracked.items()
+        ]
+        scored = [item for item in scored if item[0] >= self.min_score]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(key, tracked) for _, key, tracked in scored[:self.top_n]]
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval + random.uniform(0, self.jitter))
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Error en el ciclo de pre-calentamiento")
+
+    async def tick(self) -> None:
+        """Refresca las llaves calientes que están por vencer o ya vencieron"""
+        for key, tracked in self.hottest():
+            entry = self.news_service.cache.get(key)
+            if entry is not None:
+                remaining = entry.ttl - entry.age()
+                if remaining > self.lookahead:
+                    continue
+            else:
+                remaining = None
+
+            if not self.budget.try_acquire():
+                self.skipped_budget += 1
+                continue
+
+            await asyncio.sleep(random.uniform(0, self.jitter))
+            try:
+                await self.news_service.refresh(
+                    location=tracked.location,
+                    limit=tracked.limit,
+                    categories=tracked.categories,
+                    language=tracked.language
+                )
+            except Exception:
+                self.refresh_errors += 1
+                logger.exception("Error pre-calentando %s", key)
+                continue
+
+            self.refreshes += 1
+            if remaining is None or remaining <= 0:
+                self.late_refreshes += 1
+            else:
+                self.total_refresh_lead += remaining
+
+    def stats(self) -> dict:
+        hot = self.hottest()
+        requests = sum(tracked.requests for _, tracked in hot)
+        hits = sum(tracked.hits for _, tracked in hot)
+        on_time = self.refreshes - self.late_refreshes
+        return {
+            "running": self._task is not None,
+            "tracked_keys": len(self._tracked),
+            "hot_keys": len(hot),
+            "hot_requests": requests,
+            "hot_hit_ratio": round(hits / requests, 4) if requests else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "skipped_budget": self.skipped_budget,
+            "late_refreshes": self.late_refreshes,
+            "avg_refresh_lead_seconds": round(self.total_refresh_lead / on_time, 2) if on_time else 0.0,
+        }
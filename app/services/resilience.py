@@ -0,0 +1,332 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Errores HTTP/gRPC de Gemini que vale la pena reintentar
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(ConnectionError):
+    """El circuito está abierto: Gemini se considera no disponible"""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Timeouts, errores de conexión y códigos de estado transitorios"""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    return getattr(exc, "code", None) in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker clásico.
+
+    - closed: las llamadas pasan; `failure_threshold` fallas seguidas lo abren.
+    - open: las llamadas fallan de inmediato durante `recovery_timeout` segundos.
+    - half_open: se deja pasar una llamada de prueba; si funciona se cierra.
+      Si la prueba no informa resultado en `probe_timeout` segundos (p. ej.
+      se perdió), se deja pasar otra.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float, probe_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.probe_timeout = probe_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        # ID de la llamada de prueba en curso (None si no hay) y cuándo empezó
+        self._probe: Optional[int] = None
+        self._probe_started = 0.0
+        self._probes = 0
+
+        # Métricas
+        self.times_opened = 0
+        self.rejected = 0
+        self.expired_probes = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probe = None
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            if self._probe is not None and now - self._probe_started >= self.probe_timeout:
+                self.expired_probes += 1
+                self._probe = None
+            if self._probe is None:
+                self._probes += 1
+                self._probe = self._probes
+                self._probe_started = now
+                return True
+        self.rejected += 1
+        return False
+
+    @property
+    def current_probe(self) -> Optional[int]:
+        """ID de la llamada de prueba en curso, si el circuito está semiabierto"""
+        return self._probe if self._state == self.HALF_OPEN else None
+
+    def release_probe(self, probe: Optional[int]) -> None:
+        """Libera la prueba `probe` sin informar resultado (la llamada se canceló)"""
+        if probe is not None and self._probe == probe:
+            self._probe = None
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe = None
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe = None
+
+    def retry_after(self) -> float:
+        """Segundos hasta que el circuito vuelva a probar"""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "expired_probes": self.expired_probes,
+            "retry_after_seconds": round(self.retry_after(), 1),
+        }
+
+
+class RetryBudget:
+    """
+    Limita los reintentos a una fracción de las llamadas.
+
+    Cada llamada deposita `ratio` tokens y cada reintento consume uno, así
+    que con el upstream caído los reintentos no multiplican la carga.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def try_withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class LatencyTracker:
+    """Ventana deslizante de latencias para calcular percentiles"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(len(ordered) * p / 100), len(ordered) - 1)
+        return ordered[index]
+
+
+class ResilientCaller:
+    """
+    Envuelve las llamadas a Gemini con:
+
+    - un deadline total por llamada (que acota cada intento),
+    - reintentos con backoff exponencial y jitter, limitados por un presupuesto,
+    - un segundo intento "hedged" si el primero supera el p95 de latencia,
+    - un circuit breaker que falla rápido mientras el upstream no responde.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        retry_budget: RetryBudget,
+        breaker: CircuitBreaker,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20
+    ):
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_budget = retry_budget
+        self.breaker = breaker
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+
+        # Métricas
+        self.calls = 0
+        self.retries = 0
+        self.retries_denied = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def check(self) -> Optional[int]:
+        """
+        Falla de inmediato si el circuito está abierto. Si la llamada es la
+        prueba del circuito semiabierto, retorna su ID (para `release`).
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"Gemini no disponible temporalmente; reintenta en "
+                f"{self.breaker.retry_after():.0f} segundos"
+            )
+        return self.breaker.current_probe
+
+    def release(self, probe: Optional[int]) -> None:
+        """
+        Para llamadas que terminan sin resultado (canceladas): si eran la
+        prueba del breaker, la siguiente llamada puede volver a probar.
+        """
+        self.breaker.release_probe(probe)
+
+    def record(self, exc: Optional[BaseException] = None) -> None:
+        """Informa al breaker el resultado de una llamada hecha fuera de `call`"""
+        if exc is None:
+            self.breaker.record_success()
+        elif is_retryable(exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    async def call(self, attempt: Callable[[float], Awaitable[T]]) -> T:
+        """
+        Ejecuta `attempt(timeout)` con reintentos y hedging.
+
+        `attempt` recibe el tiempo que le queda a la llamada completa.
+        """
+        probe = self.check()
+        try:
+            return await self._call(attempt)
+        finally:
+            # Éxito y falla ya informaron al breaker; esto cubre la cancelación
+            self.release(probe)
+
+    async def _call(self, attempt: Callable[[float], Awaitable[T]]) -> T:
+        self.calls += 1
+        self.retry_budget.deposit()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        retries = 0
+
+        while True:
+            remaining = deadline - loop.time()
+            started = loop.time()
+            try:
+                result = await self._attempt(attempt, remaining)
+            except Exception as exc:
+                if not is_retryable(exc):
+                    # El upstream respondió; el error es de la petición
+                    self.breaker.record_success()
+                    raise
+
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** retries)
+                backoff *= random.uniform(0.5, 1.0)
+                remaining = deadline - loop.time()
+
+                if retries >= self.max_retries or remaining <= backoff:
+                    self.breaker.record_failure()
+                    raise
+                if not self.retry_budget.try_withdraw():
+                    self.retries_denied += 1
+                    self.breaker.record_failure()
+                    raise
+
+                retries += 1
+                self.retries += 1
+                await asyncio.sleep(backoff)
+                continue
+
+            self.latency.record(loop.time() - started)
+            self.breaker.record_success()
+            return result
+
+    async def _attempt(self, attempt: Callable[[float], Awaitable[T]], timeout: float) -> T:
+        hedge_after = None
+        if self.hedge_enabled and len(self.latency) >= self.hedge_min_samples:
+            hedge_after = self.latency.percentile(self.hedge_percentile)
+
+        if hedge_after is None or hedge_after >= timeout:
+            return await attempt(timeout)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        primary = asyncio.create_task(attempt(timeout))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # El primer intento va más lento que el p95: se lanza uno en paralelo
+        self.hedges += 1
+        hedge = asyncio.create_task(attempt(max(deadline - loop.time(), 0.0)))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        p95 = self.latency.percentile(95)
+        return {
+            "circuit_breaker": self.breaker.stats(),
+            "calls": self.calls,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "retry_budget_tokens": round(self.retry_budget.tokens, 2),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
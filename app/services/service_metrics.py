@@ -0,0 +1,129 @@
+from app.services.admission import admission_controller
+from app.services.batch_news import batch_news_runner
+from app.services.gemini_service import gemini_service
+from app.services.geolocation_service import geolocation_service
+from app.services.metrics import registry, single
+from app.services.news_service import news_cache, news_service, prewarm_scheduler
+from app.services.usage import usage_tracker
+
+# Estados del circuit breaker como valor numérico
+BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def register_service_metrics() -> None:
+    """
+    Expone como métricas los contadores que ya llevan los servicios; se leen
+    al momento del scrape, así que no agregan costo al camino caliente.
+    """
+    registry.callback(
+        "news_cache_requests_total",
+        "Consultas al caché de noticias por resultado",
+        "counter",
+        lambda: {
+            ("hit",): news_cache.hits,
+            ("stale",): news_cache.stale_hits,
+            ("miss",): news_cache.misses,
+        },
+        ("result",)
+    )
+    registry.callback(
+        "news_cache_bytes", "Bytes aproximados en el caché de noticias", "gauge",
+        lambda: single(news_cache.stats()["bytes"])
+    )
+    registry.callback(
+        "news_cache_view_bytes", "Bytes de vistas JSON, variantes comprimidas e historial", "gauge",
+        lambda: single(news_cache.stats()["view_bytes"])
+    )
+    registry.callback(
+        "news_cache_entries", "Lotes en el caché de noticias", "gauge",
+        lambda: single(news_cache.stats()["entries"])
+    )
+    registry.callback(
+        "news_proximity_hits_total", "Peticiones respondidas con el lote de una ubicación cercana", "counter",
+        lambda: single(news_service.proximity_hits)
+    )
+    registry.callback(
+        "news_store_hits_total", "Lotes obtenidos del store compartido", "counter",
+        lambda: single(news_service.store_hits)
+    )
+    registry.callback(
+        "news_generations_in_flight", "Generaciones de lotes en curso (ya deduplicadas)", "gauge",
+        lambda: single(len(news_service._in_flight))
+    )
+    registry.callback(
+        "geolocation_cache_requests_total",
+        "Consultas al caché de geolocalización por resultado",
+        "counter",
+        lambda: {
+            ("hit",): geolocation_service.cache.hits,
+            ("negative_hit",): geolocation_service.cache.negative_hits,
+            ("miss",): geolocation_service.cache.misses,
+        },
+        ("result",)
+    )
+    registry.callback(
+        "gemini_in_flight", "Llamadas a Gemini en curso", "gauge",
+        lambda: single(gemini_service.executor.in_flight)
+    )
+    registry.callback(
+        "gemini_queued", "Llamadas a Gemini esperando un cupo de concurrencia", "gauge",
+        lambda: single(gemini_service.executor.queued)
+    )
+    registry.callback(
+        "gemini_timeouts_total", "Llamadas a Gemini que superaron el timeout", "counter",
+        lambda: single(gemini_service.executor.timeouts)
+    )
+    registry.callback(
+        "gemini_retries_total", "Reintentos de llamadas a Gemini", "counter",
+        lambda: single(gemini_service.resilience.retries)
+    )
+    registry.callback(
+        "gemini_circuit_state", "Estado del circuit breaker (0 cerrado, 1 semiabierto, 2 abierto)", "gauge",
+        lambda: single(BREAKER_STATES[gemini_service.resilience.breaker.state])
+    )
+    registry.callback(
+        "gemini_parse_failures_total", "Respuestas de Gemini que no se pudieron parsear completas", "counter",
+        lambda: single(gemini_service.parse_failures)
+    )
+    registry.callback(
+        "gemini_tokens_total",
+        "Tokens consumidos en Gemini por tipo",
+        "counter",
+        lambda: {
+            ("prompt",): usage_tracker.totals.prompt_tokens,
+            ("output",): usage_tracker.totals.output_tokens,
+            ("cached",): usage_tracker.totals.cached_tokens,
+        },
+        ("type",)
+    )
+    registry.callback(
+        "gemini_cost_usd_total", "Costo estimado acumulado de Gemini en USD", "counter",
+        lambda: single(usage_tracker.totals.cost_usd)
+    )
+    registry.callback(
+        "prewarm_refreshes_total", "Lotes refrescados por el pre-calentamiento", "counter",
+        lambda: single(prewarm_scheduler.refreshes)
+    )
+    registry.callback(
+        "batch_requests_total", "Peticiones recibidas por el endpoint batch", "counter",
+        lambda: single(batch_news_runner.requests)
+    )
+    registry.callback(
+        "admission_in_flight", "Peticiones admitidas generando noticias", "gauge",
+        lambda: single(admission_controller.in_flight)
+    )
+    registry.callback(
+        "admission_queue_depth", "Peticiones esperando en la cola de admisión", "gauge",
+        lambda: single(admission_controller.queued)
+    )
+    registry.callback(
+        "admission_shed_total",
+        "Peticiones rechazadas con 429 por motivo",
+        "counter",
+        lambda: {(reason,): count for reason, count in admission_controller.shed.items()},
+        ("reason",)
+    )
+    registry.callback(
+        "admission_bypassed_total", "Peticiones que el caché respondió sin pasar por la cola", "counter",
+        lambda: single(admission_controller.bypassed)
+    )
@@ -0,0 +1,43 @@
+import asyncio
+from typing import AsyncIterator, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SharedStream(Generic[T]):
+    """
+    Una secuencia que se produce una vez y se consume muchas: cada suscriptor
+    recibe desde el primer elemento, y luego cada uno apenas se publica.
+    """
+
+    def __init__(self):
+        self.items: List[T] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._updated = asyncio.Event()
+
+    def _wake(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def publish(self, item: T) -> None:
+        self.items.append(item)
+        self._wake()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._wake()
+
+    async def subscribe(self) -> AsyncIterator[T]:
+        position = 0
+        while True:
+            while position < len(self.items):
+                yield self.items[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            # Sin await desde que se revisó `items`: no se pierde ninguna publicación
+            await self._updated.wait()
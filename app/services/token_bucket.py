@@ -0,0 +1,31 @@
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket clásico: `rate` tokens por segundo, hasta `burst` acumulados"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: Optional[float] = None, cost: float = 1) -> float:
+        """
+        Consume `cost` tokens; si no alcanzan, retorna los segundos hasta que
+        alcancen (0 = admitido). Un costo mayor que `burst` se admite con el
+        bucket lleno y queda como deuda.
+        """
+        now = now or time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        needed = min(cost, self.burst)
+        if self.tokens >= needed:
+            self.tokens -= cost
+            return 0.0
+        return (needed - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+    def try_acquire(self, cost: float = 1) -> bool:
+        """Consume `cost` tokens si alcanzan"""
+        return self.take(cost=cost) == 0
@@ -0,0 +1,105 @@
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# Endpoint que originó la llamada a Gemini; las tareas de fondo heredan el
+# de la petición que las lanzó y el pre-calentamiento queda como "background"
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="background")
+
+OTHER = "otros"
+
+
+@dataclass
+class UsageRecord:
+    """Consumo de una llamada a Gemini"""
+    endpoint: str
+    location: str
+    language: str
+    limit: int
+    model: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    prompt_chars: int = 0
+    latency_seconds: float = 0.0
+    cost_usd: float = 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class UsageTotals:
+    requests: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    prompt_chars: int = 0
+    latency_seconds: float = 0.0
+    cost_usd: float = 0.0
+
+    def add(self, record: UsageRecord) -> None:
+        self.requests += 1
+        self.prompt_tokens += record.prompt_tokens
+        self.output_tokens += record.output_tokens
+        self.cached_tokens += record.cached_tokens
+        self.prompt_chars += record.prompt_chars
+        self.latency_seconds += record.latency_seconds
+        self.cost_usd += record.cost_usd
+
+    def as_dict(self) -> dict:
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "avg_prompt_tokens": round(self.prompt_tokens / requests, 1),
+            "avg_output_tokens": round(self.output_tokens / requests, 1),
+            "avg_prompt_chars": round(self.prompt_chars / requests, 1),
+            "avg_latency_seconds": round(self.latency_seconds / requests, 3),
+            "avg_cost_usd": round(self.cost_usd / requests, 6),
+        }
+
+
+class UsageTracker:
+    """
+    Agrega el consumo de tokens y el costo estimado de las llamadas a Gemini,
+    en total y por endpoint, ubicación, idioma, `limit` y modelo.
+
+    Cada dimensión guarda como máximo `max_keys` valores distintos; el resto
+    se acumula en "otros" para acotar la memoria.
+    """
+
+    DIMENSIONS = ("endpoint", "location", "language", "limit", "model")
+
+    def __init__(self, max_keys: int = 500):
+        self.max_keys = max_keys
+        self.totals = UsageTotals()
+        self._by: Dict[str, Dict[str, UsageTotals]] = {dimension: {} for dimension in self.DIMENSIONS}
+
+    def record(self, record: UsageRecord) -> None:
+        self.totals.add(record)
+        for dimension in self.DIMENSIONS:
+            buckets = self._by[dimension]
+            value = str(getattr(record, dimension))
+            if value not in buckets and len(buckets) >= self.max_keys:
+                value = OTHER
+            buckets.setdefault(value, UsageTotals()).add(record)
+
+    def stats(self, top: Optional[int] = 20) -> dict:
+        """Totales y desglose por dimensión, ordenado por costo (las `top` más caras)"""
+        result = {"totals": self.totals.as_dict()}
+        for dimension, buckets in self._by.items():
+            ordered = sorted(buckets.items(), key=lambda pair: pair[1].cost_usd, reverse=True)
+            if top is not None:
+                ordered = ordered[:top]
+            result[f"by_{dimension}"] = {value: totals.as_dict() for value, totals in ordered}
+        return result
+
+
+# Singleton
+usage_tracker = UsageTracker(max_keys=settings.usage_max_keys)
@@ -0,0 +1,99 @@
+"""
+Compara la memoria por entrada del caché de noticias en el proceso.
+
+    python benchmarks/bench_cache_memory.py
+    python benchmarks/bench_cache_memory.py --entries 2000 --items 20
+
+- models: lista de `NewsItem` + JSON de cada noticia (la entrada antes de `CompactBatch`)
+- compact: `CompactBatch` (arreglo JSON en UTF-8, offsets y snapshot empaquetado)
+
+Los lotes se arman desde JSON, como llegan de Gemini o del store, y cada uno
+tiene textos distintos. Se mide lo que queda retenido con `tracemalloc`.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.crud.news_batch import news_list_adapter  # noqa: E402
+from app.services.news_cache import CompactBatch, encode_items  # noqa: E402
+
+CATEGORIES = ["política", "economía", "deportes", "tecnología", "local", "seguridad", "salud"]
+
+
+def batch_json(entry: int, items: int) -> bytes:
+    """JSON de un lote, con el tamaño y la forma de una respuesta real de Gemini"""
+    location = f"Comuna {entry}"
+    return json.dumps([
+        {
+            "id": entry * 100 + i,
+            "title": f"Nueva línea de metro conectará {location} con el centro ({i})",
+            "summary": (
+                f"El proyecto de extensión beneficiará a más de 500 mil vecinos de {location}. "
+                "Las obras comenzarán durante el próximo semestre y durarán tres años."
+            ),
+            "category": CATEGORIES[(entry + i) % len(CATEGORIES)],
+            "relevance_score": 10 - i % 10,
+            "location_context": f"Afecta directamente el transporte en {location}",
+            "estimated_date": "enero 2024",
+            "keywords": ["metro", "transporte", "infraestructura", location.lower()],
+        }
+        for i in range(1, items + 1)
+    ], ensure_ascii=False).encode("utf-8")
+
+
+def models(raw: bytes) -> object:
+    items = news_list_adapter.validate_json(raw)
+    return items, encode_items(items)
+
+
+def compact(raw: bytes) -> object:
+    return CompactBatch.from_items(news_list_adapter.validate_json(raw))
+
+
+def retained(build: Callable[[bytes], object], raws: List[bytes]) -> float:
+    """Bytes retenidos por entrada tras construir todas las entradas"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries = [build(raw) for raw in raws]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entries
+    return (after - before) / len(raws)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=10)
+    args = parser.parse_args()
+
+    raws = [batch_json(entry, args.items) for entry in range(args.entries)]
+    print(f"{args.entries} entradas de {args.items} noticias (JSON: {sum(map(len, raws)) / len(raws):.0f} B/entrada)")
+
+    builders = {"models": models, "compact": compact}
+    for build in builders.values():
+        # Calentamiento: cachés internos de Pydantic y del intérprete
+        retained(build, raws[:10])
+    results = {name: retained(build, raws) for name, build in builders.items()}
+    for name, per_entry in results.items():
+        print(f"{name:10} {per_entry / 1024:8.1f} KiB/entrada  ({results['models'] / per_entry:4.1f}x)")
+
+    # Lo que cuesta reconstruir los modelos cuando alguien los pide (stream, batch)
+    batch = compact(raws[0])
+    number = 2000
+    seconds = timeit.timeit(batch.items, number=number)
+    print(f"\nreconstruir {args.items} NewsItem desde CompactBatch: {seconds / number * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
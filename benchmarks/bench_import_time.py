@@ -0,0 +1,79 @@
+"""
+Mide el arranque en frío: cuánto tarda `import app.main` y cuánto tarda en
+responder el primer `GET /api/v1/health/` (import + lifespan + petición).
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 10 --max-health-seconds 1.5
+
+Cada medición corre en un proceso nuevo. Con `--max-health-seconds` termina
+con código 1 si la mediana supera el umbral (para detectar regresiones en CI).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+sdk_on_import = "google.generativeai" in sys.modules
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    status = client.get("/api/v1/health/").status_code
+    healthy = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "health": healthy - started,
+    "status": status,
+    "sdk_on_import": sdk_on_import,
+}))
+"""
+
+
+def run_once() -> dict:
+    env = {**os.environ, "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "benchmark"), "PREWARM_ENABLED": "false"}
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - started
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-health-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    # La primera corrida calienta el caché de bytecode y del sistema de archivos
+    run_once()
+    results = [run_once() for _ in range(args.runs)]
+
+    for key, label in (("import", "import app.main"), ("health", "primer health"), ("process", "proceso completo")):
+        values = [result[key] for result in results]
+        print(f"{label:18} mediana {statistics.median(values) * 1000:7.0f} ms   máx {max(values) * 1000:7.0f} ms")
+    print(f"SDK de Gemini importado al importar la app: {any(r['sdk_on_import'] for r in results)}")
+
+    health = statistics.median(result["health"] for result in results)
+    if args.max_health_seconds is not None and health > args.max_health_seconds:
+        print(f"REGRESIÓN: el primer health tardó {health:.2f}s (máximo {args.max_health_seconds:.2f}s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Compara el costo de CPU de armar la respuesta de `GET /news/` en un acierto de caché.
+
+    python benchmarks/bench_response_encoding.py
+
+- fastapi_default: validar NewsResponse + jsonable_encoder + json.dumps (camino de FastAPI)
+- model_dump_json: construir NewsResponse y serializarlo con Pydantic
+- preserialized: bytes cacheados de las noticias + envoltorio armado a mano
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.schemas.news import NewsCategory, NewsItem, NewsResponse  # noqa: E402
+from app.services.news_cache import CompactBatch, encode_news  # noqa: E402
+
+ITEMS = [
+    NewsItem(
+        id=i,
+        title=f"Nueva línea de metro conectará comunas del sector oriente ({i})",
+        summary="El proyecto de extensión del metro beneficiará a más de 500 mil personas. " * 2,
+        category=NewsCategory.LOCAL,
+        relevance_score=9,
+        location_context="Afecta directamente el transporte en Santiago",
+        estimated_date="enero 2024",
+        keywords=["metro", "transporte", "infraestructura"],
+    )
+    for i in range(1, 11)
+]
+ENCODED = encode_news(CompactBatch.from_items(ITEMS))
+LOCATION = "Santiago, Región Metropolitana, Chile"
+
+
+def fastapi_default() -> bytes:
+    response = NewsResponse.model_validate(
+        {"success": True, "location": LOCATION, "total_news": len(ITEMS), "news": ITEMS},
+        from_attributes=True,
+    )
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def model_dump_json() -> bytes:
+    response = NewsResponse(success=True, location=LOCATION, total_news=len(ITEMS), news=ITEMS)
+    return response.model_dump_json().encode("utf-8")
+
+
+def preserialized() -> bytes:
+    return b"".join((
+        b'{"success":true,"location":',
+        json.dumps(LOCATION, ensure_ascii=False).encode("utf-8"),
+        b',"generated_at":"',
+        datetime.utcnow().isoformat().encode("ascii"),
+        b'","total_news":',
+        str(ENCODED.total).encode("ascii"),
+        b',"news":',
+        ENCODED.items_json,
+        b"}",
+    ))
+
+
+def main() -> None:
+    # Los tres caminos producen el mismo documento
+    assert json.loads(preserialized())["news"] == json.loads(fastapi_default())["news"]
+
+    number = 5000
+    baseline = None
+    for func in (fastapi_default, model_dump_json, preserialized):
+        seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+        baseline = baseline or seconds
+        print(f"{func.__name__:16} {seconds * 1e6:8.1f} µs/respuesta  ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
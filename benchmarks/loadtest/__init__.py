@@ -0,0 +1,12 @@
+"""
+Pruebas de carga sin consumir cuota de Gemini ni de ip-api.com.
+
+- `stand_ins`: dobles locales de ip-api.com (servidor HTTP) y del SDK de
+  Gemini, con latencias, errores y JSON malformado o truncado configurables.
+- `target`: levanta la API con esos dobles y mide el lag del event loop.
+- `profiles`: perfiles de carga (ciudades calientes, cola larga, ráfagas).
+- `run`: orquesta una corrida, reporta p50/p95/p99, RPS y lag, y guarda el
+  resultado en `benchmarks/results/` para comparar corrida a corrida.
+
+    python -m benchmarks.loadtest.run --profile hot_city --duration 30 --rate 50
+"""
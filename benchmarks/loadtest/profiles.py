@@ -0,0 +1,81 @@
+"""
+Perfiles de carga de lazo abierto: cada uno genera de antemano los instantes
+de llegada y la IP de cada petición, así una API lenta no frena la carga
+(sin "coordinated omission") y dos corridas con la misma semilla son iguales.
+"""
+import bisect
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.loadtest.stand_ins import ip_for
+
+Arrival = Tuple[float, str, int]  # (segundos desde el inicio, IP del cliente, limit)
+
+
+def _zipf_sampler(cities: int, exponent: float, rng: random.Random) -> Callable[[], int]:
+    weights = [1.0 / (rank ** exponent) for rank in range(1, cities + 1)]
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return lambda: bisect.bisect_left(cumulative, rng.random() * total)
+
+
+def _limit(rng: random.Random) -> int:
+    # La mayoría de los clientes usa el valor por defecto
+    return rng.choices([5, 10, 20], weights=[2, 7, 1])[0]
+
+
+def _poisson(duration: float, rate: Callable[[float], float], rng: random.Random) -> List[float]:
+    """Instantes de llegada de un proceso de Poisson con tasa variable (por thinning)"""
+    peak = max(rate(t / 10) for t in range(int(duration * 10) + 1)) or 1.0
+    times, t = [], 0.0
+    while True:
+        t += rng.expovariate(peak)
+        if t >= duration:
+            return times
+        if rng.random() < rate(t) / peak:
+            times.append(t)
+
+
+@dataclass
+class Profile:
+    name: str
+    description: str
+    build: Callable[[float, float, random.Random], List[Arrival]]
+
+
+def hot_city(duration: float, rate: float, rng: random.Random) -> List[Arrival]:
+    """Tráfico sesgado: pocas ciudades concentran casi todas las peticiones"""
+    city = _zipf_sampler(50, 1.2, rng)
+    return [(t, ip_for(city(), rng.randrange(254)), _limit(rng)) for t in _poisson(duration, lambda t: rate, rng)]
+
+
+def cold_tail(duration: float, rate: float, rng: random.Random) -> List[Arrival]:
+    """Cola larga: casi cada petición es de una ciudad distinta (fallos de caché)"""
+    return [
+        (t, ip_for(rng.randrange(10, 60000), rng.randrange(254)), _limit(rng))
+        for t in _poisson(duration, lambda t: rate, rng)
+    ]
+
+
+def bursts(duration: float, rate: float, rng: random.Random) -> List[Arrival]:
+    """Ráfagas: 1 s cada 5 s a 10x la tasa base (la mitad de `rate`), sobre ciudades calientes"""
+    city = _zipf_sampler(200, 1.0, rng)
+
+    def burst_rate(t: float) -> float:
+        return rate * 5 if t % 5.0 < 1.0 else rate * 0.5
+
+    return [(t, ip_for(city(), rng.randrange(254)), _limit(rng)) for t in _poisson(duration, burst_rate, rng)]
+
+
+PROFILES: Dict[str, Profile] = {
+    profile.name: profile
+    for profile in (
+        Profile("hot_city", hot_city.__doc__, hot_city),
+        Profile("cold_tail", cold_tail.__doc__, cold_tail),
+        Profile("bursts", bursts.__doc__, bursts),
+    )
+}
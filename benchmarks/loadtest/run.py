@@ -0,0 +1,226 @@
+"""
+Corre un perfil de carga contra la API con los dobles locales y guarda el
+resultado en `benchmarks/results/` (JSON, con el commit), comparándolo con
+la corrida anterior del mismo perfil.
+
+    python -m benchmarks.loadtest.run --profile hot_city --duration 30 --rate 50
+    python -m benchmarks.loadtest.run --profile cold_tail --gemini-p50 3 --gemini-error-rate 0.05
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import httpx
+
+from benchmarks.loadtest.profiles import PROFILES, Arrival
+from benchmarks.loadtest.stand_ins import StandInConfig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+NEWS_PATH = "/api/v1/news/"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn(module: str, argv: List[str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", module, *argv], cwd=ROOT)
+
+
+async def _wait_ready(client: httpx.AsyncClient, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} no respondió en {timeout:.0f}s")
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _fire(
+    client: httpx.AsyncClient,
+    base_url: str,
+    arrivals: List[Arrival],
+) -> Tuple[List[Tuple[float, int]], float]:
+    """Lanza cada petición en su instante (lazo abierto); retorna (latencia, estado) y la duración"""
+    results: List[Tuple[float, int]] = []
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def one(offset: float, ip: str, limit: int) -> None:
+        await asyncio.sleep(max(0.0, started + offset - loop.time()))
+        # La latencia se mide desde el instante programado, no desde el envío real
+        scheduled = started + offset
+        try:
+            response = await client.get(
+                f"{base_url}{NEWS_PATH}",
+                params={"limit": limit},
+                headers={"X-Forwarded-For": ip, "Accept-Encoding": "gzip"}
+            )
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        results.append((loop.time() - scheduled, status))
+
+    await asyncio.gather(*(one(*arrival) for arrival in arrivals))
+    return results, loop.time() - started
+
+
+def summarize(results: List[Tuple[float, int]], elapsed: float) -> dict:
+    latencies = [latency for latency, status in results if status == 200]
+    ms = lambda value: round(value * 1000, 1) if value is not None else None  # noqa: E731
+    return {
+        "requests": len(results),
+        "ok": len(latencies),
+        "status": dict(sorted(Counter(str(status) for _, status in results).items())),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(max(latencies) if latencies else None),
+        },
+    }
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _previous(profile: str) -> Optional[dict]:
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, f"{profile}-*.json")))
+    if not paths:
+        return None
+    with open(paths[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _report(result: dict, previous: Optional[dict]) -> None:
+    summary = result["summary"]
+    lag = result["server"]["loop_lag"]
+    print(f"\nPerfil {result['profile']} @ {result['commit'] or 'sin commit'}")
+    print(f"  peticiones {summary['requests']}  ok {summary['ok']}  estados {summary['status']}")
+
+    rows = [
+        ("RPS (ok)", summary["throughput_rps"], previous and previous["summary"]["throughput_rps"]),
+        *[
+            (f"{key} ms", summary["latency_ms"][key], previous and previous["summary"]["latency_ms"][key])
+            for key in ("p50", "p95", "p99", "max")
+        ],
+        ("lag p99 ms", lag.get("p99_ms"), previous and previous["server"]["loop_lag"].get("p99_ms")),
+        ("lag máx ms", lag.get("max_ms"), previous and previous["server"]["loop_lag"].get("max_ms")),
+    ]
+    for label, value, before in rows:
+        delta = ""
+        if before and value is not None:
+            delta = f"  ({(value - before) / before * 100:+.1f}% vs {before})"
+        print(f"  {label:12} {value}{delta}")
+
+    cache = result["server"]["cache"]
+    gemini = result["server"]["gemini_stand_in"]
+    print(f"  caché: hits {cache.get('hits')}  stale {cache.get('stale_hits')}  misses {cache.get('misses')}")
+    print(f"  Gemini: llamadas {gemini['calls']}  errores {gemini['errors']}  malformadas {gemini['malformed']}  truncadas {gemini['truncated']}")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    profile = PROFILES[args.profile]
+    config = StandInConfig.from_args(args)
+    arrivals = profile.build(args.duration, args.rate, random.Random(args.seed))
+
+    geo_port, api_port = _free_port(), _free_port()
+    geo_url = f"http://127.0.0.1:{geo_port}/json"
+    base_url = f"http://127.0.0.1:{api_port}"
+    processes = [
+        _spawn("benchmarks.loadtest.stand_ins", ["--port", str(geo_port), *config.to_argv()]),
+        _spawn(
+            "benchmarks.loadtest.target",
+            ["--port", str(api_port), "--geo-url", geo_url, *config.to_argv(), *(["--store"] if args.store else [])]
+        ),
+    ]
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+            await _wait_ready(client, f"{geo_url}/10.0.0.1")
+            await _wait_ready(client, f"{base_url}/api/v1/health/")
+            await client.post(f"{base_url}/_loadtest/reset")
+
+            print(f"{profile.name}: {len(arrivals)} peticiones en {args.duration:.0f}s — {profile.description}")
+            results, elapsed = await _fire(client, base_url, arrivals)
+            server = (await client.get(f"{base_url}/_loadtest/stats")).json()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    return {
+        "profile": profile.name,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--", "app")),
+        "parameters": {
+            "duration": args.duration,
+            "rate": args.rate,
+            "seed": args.seed,
+            "connections": args.connections,
+            "store": args.store,
+        },
+        "stand_ins": vars(config),
+        "summary": summarize(results, elapsed),
+        "server": server,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="hot_city")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos de carga")
+    parser.add_argument("--rate", type=float, default=50.0, help="Peticiones por segundo (promedio)")
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--store", action="store_true", help="Mantener el store compartido (SQLite)")
+    parser.add_argument("--no-save", action="store_true", help="No guardar el resultado")
+    StandInConfig.add_arguments(parser)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    previous = _previous(args.profile)
+    _report(result, previous)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"{args.profile}-{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\nResultado guardado en {os.path.relpath(path, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Dobles locales de los servicios externos.
+
+- ip-api.com: una app ASGI que responde con el mismo JSON que el servicio
+  real. La ciudad sale de la IP (10.<hi>.<lo>.<usuario>, ciudad = hi*256+lo),
+  así el generador de carga controla qué ciudades se piden.
+- Gemini: un reemplazo del módulo `google.generativeai` (`configure` y
+  `GenerativeModel`) que se instala en `app.services.gemini_service`.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# Ciudades con nombre real para el extremo "caliente"; el resto son sintéticas
+KNOWN_CITIES: List[Tuple[str, str, str, str, float, float]] = [
+    ("Santiago", "Región Metropolitana", "Chile", "CL", -33.4489, -70.6693),
+    ("Lima", "Lima", "Perú", "PE", -12.0464, -77.0428),
+    ("Bogotá", "Bogotá D.C.", "Colombia", "CO", 4.7110, -74.0721),
+    ("Buenos Aires", "Buenos Aires", "Argentina", "AR", -34.6037, -58.3816),
+    ("Ciudad de México", "Ciudad de México", "México", "MX", 19.4326, -99.1332),
+    ("Quito", "Pichincha", "Ecuador", "EC", -0.1807, -78.4678),
+    ("Montevideo", "Montevideo", "Uruguay", "UY", -34.9011, -56.1645),
+    ("Valparaíso", "Valparaíso", "Chile", "CL", -33.0472, -71.6127),
+    ("Medellín", "Antioquia", "Colombia", "CO", 6.2442, -75.5812),
+    ("Guadalajara", "Jalisco", "México", "MX", 20.6597, -103.3496),
+]
+
+
+def city_for(index: int) -> Tuple[str, str, str, str, float, float]:
+    if index < len(KNOWN_CITIES):
+        return KNOWN_CITIES[index]
+    # Separadas por ~1 grado: ninguna queda dentro del radio de proximidad de otra
+    return (
+        f"Localidad {index}",
+        f"Provincia {index % 97}",
+        "Chile",
+        "CL",
+        -17.0 - (index % 40),
+        -75.0 + (index // 40) % 30,
+    )
+
+
+def ip_for(city: int, user: int) -> str:
+    return f"10.{city // 256 % 256}.{city % 256}.{user % 254 + 1}"
+
+
+def city_from_ip(ip: str) -> int:
+    parts = ip.split(".")
+    return int(parts[1]) * 256 + int(parts[2])
+
+
+@dataclass
+class LatencyModel:
+    """Latencia log-normal definida por su mediana y su p99 (segundos)"""
+    p50: float
+    p99: float
+
+    def sample(self, rng: random.Random) -> float:
+        if self.p50 <= 0:
+            return 0.0
+        sigma = math.log(max(self.p99, self.p50) / self.p50) / 2.326
+        return rng.lognormvariate(math.log(self.p50), sigma)
+
+
+@dataclass
+class StandInConfig:
+    """Comportamiento de los dobles; se pasa por línea de comandos a cada proceso"""
+    gemini_p50: float = 1.5
+    gemini_p99: float = 6.0
+    gemini_fast_p50: float = 0.6
+    gemini_fast_p99: float = 2.5
+    gemini_error_rate: float = 0.01
+    gemini_malformed_rate: float = 0.01
+    gemini_truncated_rate: float = 0.02
+    geo_p50: float = 0.03
+    geo_p99: float = 0.15
+    geo_error_rate: float = 0.002
+    geo_fail_rate: float = 0.001
+    geo_malformed_rate: float = 0.0
+    seed: int = 1
+
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        for name, default in asdict(cls()).items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "StandInConfig":
+        return cls(**{name: getattr(args, name) for name in asdict(cls())})
+
+    def to_argv(self) -> List[str]:
+        argv = []
+        for name, value in asdict(self).items():
+            argv += [f"--{name.replace('_', '-')}", str(value)]
+        return argv
+
+
+# --- ip-api.com ---------------------------------------------------------------
+
+def ip_api_app(config: StandInConfig) -> Starlette:
+    rng = random.Random(config.seed)
+    latency = LatencyModel(config.geo_p50, config.geo_p99)
+    stats = {"requests": 0, "errors": 0, "fails": 0, "malformed": 0}
+
+    async def lookup(request: Request) -> Response:
+        stats["requests"] += 1
+        await asyncio.sleep(latency.sample(rng))
+
+        roll = rng.random()
+        if roll < config.geo_error_rate:
+            stats["errors"] += 1
+            return Response("Service Unavailable", status_code=503)
+        roll -= config.geo_error_rate
+        if roll < config.geo_fail_rate:
+            stats["fails"] += 1
+            return JSONResponse({"status": "fail", "message": "reserved range", "query": request.path_params.get("ip")})
+        roll -= config.geo_fail_rate
+        if roll < config.geo_malformed_rate:
+            stats["malformed"] += 1
+            return Response('{"status": "success", "city": ', media_type="application/json")
+
+        ip = request.path_params.get("ip") or "10.0.0.1"
+        try:
+            city, region, country, code, lat, lon = city_for(city_from_ip(ip))
+        except (IndexError, ValueError):
+            return JSONResponse({"status": "fail", "message": "invalid query", "query": ip})
+        return JSONResponse({
+            "status": "success",
+            "country": country,
+            "countryCode": code,
+            "regionName": region,
+            "city": city,
+            "lat": lat,
+            "lon": lon,
+            "timezone": "America/Santiago",
+            "query": ip,
+        })
+
+    async def get_stats(request: Request) -> Response:
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/json", lookup),
+        Route("/json/{ip}", lookup),
+        Route("/_stats", get_stats),
+    ])
+
+
+# --- Gemini -------------------------------------------------------------------
+
+class StandInError(Exception):
+    """Error transitorio con código HTTP, como los de google.api_core"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _Usage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+        self.cached_content_token_count = 0
+
+
+class _Response:
+    def __init__(self, text: str, usage: Optional[_Usage] = None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+def fake_news(count: int, location: str, rng: random.Random) -> List[dict]:
+    categories = ["política", "economía", "deportes", "tecnología", "local", "seguridad", "salud"]
+    return [
+        {
+            "id": i,
+            "title": f"Noticia {i} sobre {location}: avanza un proyecto de infraestructura",
+            "summary": (
+                f"Autoridades de {location} anunciaron nuevas medidas que afectarán a miles de vecinos. "
+                "El plan contempla inversiones durante los próximos meses y mesas de trabajo con la comunidad."
+            ),
+            "category": rng.choice(categories),
+            "relevance_score": max(1, 10 - i // 2),
+            "location_context": f"Impacta directamente a los habitantes de {location}",
+            "estimated_date": "esta semana",
+            "keywords": ["comunidad", "infraestructura", location.split(",")[0].lower()],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class StandInModel:
+    """Imita `GenerativeModel.generate_content_async` (con y sin streaming)"""
+
+    LIMIT = re.compile(r"Genera exactamente (\d+) noticias")
+    LOCATION = re.compile(r"para esta ubicación: (.+)")
+    LOCATIONS = re.compile(r"^(\d+)\. (.+)$", re.MULTILINE)
+
+    def __init__(self, name: str, config: StandInConfig, rng: random.Random, stats: dict):
+        fast = "flash-lite" in name or "8b" in name
+        self.name = name
+        self.config = config
+        self.latency = LatencyModel(
+            config.gemini_fast_p50 if fast else config.gemini_p50,
+            config.gemini_fast_p99 if fast else config.gemini_p99
+        )
+        self.rng = rng
+        self.stats = stats
+
+    def _text(self, prompt: str, structured: bool) -> str:
+        """JSON con la forma que pide el prompt: con schema, el arreglo sin envoltorio"""
+        match = self.LIMIT.search(prompt)
+        limit = int(match.group(1)) if match else 5
+        locations = self.LOCATIONS.findall(prompt)
+        if "location_index" in prompt and locations:
+            data = [
+                {"location_index": int(index), "news": fake_news(limit, location, self.rng)}
+                for index, location in locations
+            ]
+            return json.dumps(data if structured else {"locations": data}, ensure_ascii=False)
+        match = self.LOCATION.search(prompt)
+        location = match.group(1).strip() if match else "la zona"
+        news = fake_news(limit, location, self.rng)
+        return json.dumps(news if structured else {"news": news}, ensure_ascii=False)
+
+    def _fault(self, text: str) -> str:
+        roll = self.rng.random()
+        if roll < self.config.gemini_error_rate:
+            self.stats["errors"] += 1
+            raise StandInError(self.rng.choice([429, 500, 503]), "stand-in: error transitorio")
+        roll -= self.config.gemini_error_rate
+        if roll < self.config.gemini_malformed_rate:
+            self.stats["malformed"] += 1
+            return "Lo siento, no puedo generar noticias en este momento. " + text[: len(text) // 3]
+        roll -= self.config.gemini_malformed_rate
+        if roll < self.config.gemini_truncated_rate:
+            self.stats["truncated"] += 1
+            return text[: int(len(text) * self.rng.uniform(0.3, 0.9))]
+        return text
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False, request_options=None):
+        self.stats["calls"] += 1
+        self.stats["calls_by_model"][self.name] = self.stats["calls_by_model"].get(self.name, 0) + 1
+        delay = self.latency.sample(self.rng)
+        text = self._text(prompt, bool((generation_config or {}).get("response_schema")))
+        usage = _Usage(len(prompt) // 4, len(text) // 4)
+
+        if not stream:
+            await asyncio.sleep(delay)
+            return _Response(self._fault(text), usage)
+
+        # Primer chunk tras ~30% de la latencia; el resto repartido en el tiempo restante
+        await asyncio.sleep(delay * 0.3)
+        text = self._fault(text)
+        return self._chunks(text, delay * 0.7, usage)
+
+    async def _chunks(self, text: str, remaining: float, usage: _Usage):
+        size = 200
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(remaining / len(pieces))
+            yield _Response(piece, usage if index == len(pieces) - 1 else None)
+
+
+class StandInSDK:
+    """Reemplazo de `google.generativeai` con lo que usa `GeminiService`"""
+
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats = {"calls": 0, "errors": 0, "malformed": 0, "truncated": 0, "calls_by_model": {}}
+
+    def configure(self, **kwargs) -> None:
+        pass
+
+    def GenerativeModel(self, model_name: str, system_instruction: Optional[str] = None) -> StandInModel:
+        return StandInModel(model_name, self.config, self.rng, self.stats)
+
+
+def install_gemini_stand_in(config: StandInConfig) -> StandInSDK:
+    """Hace que `load_sdk()` retorne el doble en vez de importar el SDK real"""
+    import importlib
+
+    gemini_module = importlib.import_module("app.services.gemini_service")
+    sdk = StandInSDK(config)
+    gemini_module._sdk = sdk
+    return sdk
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Doble local de ip-api.com")
+    parser.add_argument("--port", type=int, required=True)
+    StandInConfig.add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(ip_api_app(StandInConfig.from_args(args)), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
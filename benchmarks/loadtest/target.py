@@ -0,0 +1,110 @@
+"""
+Proceso bajo prueba: la API real con el doble de Gemini instalado, apuntando
+al doble de ip-api.com, más un monitor del lag del event loop.
+
+Agrega dos rutas solo para la prueba:
+- `POST /_loadtest/reset`: arranca el monitor de lag o descarta sus muestras.
+- `GET /_loadtest/stats`: lag del event loop y contadores de los servicios.
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import List
+
+LAG_INTERVAL = 0.01
+
+
+class LoopLagMonitor:
+    """Duerme `interval` en un loop y registra cuánto se atrasa el despertar"""
+
+    def __init__(self, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def stats(self) -> dict:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"samples": 0}
+
+        def pick(q: float) -> float:
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+
+        return {"samples": len(samples), "p50_ms": pick(0.50), "p99_ms": pick(0.99), "max_ms": round(samples[-1] * 1000, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API bajo prueba con dobles locales")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--geo-url", required=True, help="URL del doble de ip-api.com")
+    parser.add_argument("--store", action="store_true", help="Mantener el store compartido (SQLite)")
+    from benchmarks.loadtest.stand_ins import StandInConfig, install_gemini_stand_in
+    StandInConfig.add_arguments(parser)
+    args = parser.parse_args()
+
+    # Antes de importar la app: los singletons leen la configuración al crearse
+    os.environ.update({
+        "GEMINI_API_KEY": "loadtest",
+        "GEOLOCATION_BACKEND": "http",
+        "GEOLOCATION_API_URL": args.geo_url,
+        "PREWARM_ENABLED": "false",
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    })
+    if not args.store:
+        os.environ["NEWS_STORE_ENABLED"] = "false"
+
+    import uvicorn
+    from fastapi.responses import JSONResponse
+
+    from app.main import app
+    from app.services import gemini_service, geolocation_service, news_cache, news_service
+
+    sdk = install_gemini_stand_in(StandInConfig.from_args(args))
+    monitor = LoopLagMonitor()
+
+    @app.post("/_loadtest/reset", include_in_schema=False)
+    async def reset() -> JSONResponse:
+        # El monitor arranca aquí (dentro del loop de uvicorn), justo antes de medir
+        if not monitor.running:
+            monitor.start()
+        monitor.samples.clear()
+        return JSONResponse({"ok": True})
+
+    @app.get("/_loadtest/stats", include_in_schema=False)
+    async def stats() -> JSONResponse:
+        return JSONResponse({
+            "loop_lag": monitor.stats(),
+            "gemini_stand_in": sdk.stats,
+            "generation": gemini_service.executor.stats(),
+            "parsing": gemini_service.parse_stats(),
+            "cache": {**news_cache.stats(), **news_service.stats()},
+            "geolocation": geolocation_service.stats(),
+        })
+
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+        # El generador de carga manda la IP del "cliente" en X-Forwarded-For
+        proxy_headers=True,
+        forwarded_allow_ips="*"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Configuración de las pruebas: todo corre sin red. Gemini se reemplaza por el
+doble de `benchmarks/loadtest` (sin latencia ni fallas) y el store, el
+pre-calentamiento y la compresión se desactivan.
+"""
+import os
+
+# Antes de importar la app: los singletons leen la configuración al crearse
+os.environ.update({
+    "GEMINI_API_KEY": "test",
+    "NEWS_STORE_ENABLED": "false",
+    "PREWARM_ENABLED": "false",
+    "COMPRESSION_ENABLED": "false",
+    "LOG_LEVEL": "WARNING",
+    "LOG_JSON": "false",
+})
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.schemas import LocationResponse  # noqa: E402
+from benchmarks.loadtest.stand_ins import StandInConfig, install_gemini_stand_in  # noqa: E402
+
+# Script manual que lista los modelos con la API real de Gemini
+collect_ignore = ["test_model.py"]
+
+STAND_IN = StandInConfig(
+    gemini_p50=0.0,
+    gemini_fast_p50=0.0,
+    gemini_error_rate=0.0,
+    gemini_malformed_rate=0.0,
+    gemini_truncated_rate=0.0,
+    geo_p50=0.0,
+)
+
+
+@pytest.fixture(scope="session")
+def gemini_stand_in():
+    return install_gemini_stand_in(STAND_IN)
+
+
+@pytest.fixture
+def services(gemini_stand_in):
+    """Servicios de la app con el caché, las cuotas y las métricas del doble en cero"""
+    from app.services import admission_controller, news_cache
+
+    news_cache.clear()
+    admission_controller.ip_quotas.clear()
+    admission_controller.key_quotas.clear()
+    gemini_stand_in.stats.update(calls=0, errors=0, malformed=0, truncated=0, calls_by_model={})
+    yield gemini_stand_in
+    news_cache.clear()
+
+
+@pytest.fixture
+def client(services, monkeypatch):
+    """Cliente HTTP de la app; la IP de cualquier cliente se ubica en Lima, Perú"""
+    from app.main import app
+    from app.services import geolocation_service
+
+    async def get_location_by_ip(ip=None):
+        return LocationResponse(
+            city="Lima", region="Lima", country="Perú", country_code="PE",
+            latitude=-12.0464, longitude=-77.0428, ip=ip
+        )
+
+    monkeypatch.setattr(geolocation_service, "get_location_by_ip", get_location_by_ip)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,213 @@
+import asyncio
+
+import pytest
+
+from app.services import admission_controller
+from app.services.admission import AdmissionController, AdmissionRejected, ClientQuotas
+from app.services.token_bucket import TokenBucket
+
+NEWS_URL = "/api/v1/news/"
+
+
+def make_controller(max_concurrency: int = 1, max_queue: int = 1, queue_timeout: float = 5.0, burst: int = 100):
+    return AdmissionController(
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        queue_timeout=queue_timeout,
+        ip_quotas=ClientQuotas(rate_per_minute=60, burst=burst, max_clients=10),
+        key_quotas=ClientQuotas(rate_per_minute=60, burst=burst, max_clients=10),
+        api_keys=["clave"]
+    )
+
+
+async def admit(controller: AdmissionController, client_ip: str, api_key=None) -> None:
+    async with controller.admit(client_ip, api_key=api_key):
+        pass
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    now = bucket.updated
+    assert bucket.take(now) == 0
+    assert bucket.take(now) == 0
+    assert bucket.take(now) == pytest.approx(1.0)
+    assert bucket.take(now + 1.0) == 0
+
+
+def test_client_quotas_forget_least_recent_clients():
+    controller = make_controller(burst=1)
+    controller.ip_quotas.max_clients = 2
+
+    async def scenario():
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            await admit(controller, ip)
+        # "10.0.0.1" fue desalojado: vuelve con el bucket lleno
+        await admit(controller, "10.0.0.1")
+
+    asyncio.run(scenario())
+    assert controller.stats()["tracked_clients"]["ip"] == 2
+    assert controller.shed["ip_quota"] == 0
+
+
+def test_quota_rejection_carries_retry_after():
+    controller = make_controller(burst=1)
+
+    async def scenario():
+        async with controller.admit("10.0.0.1"):
+            pass
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit("10.0.0.1"):
+                pass
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.reason == "ip_quota"
+    assert rejected.retry_after >= 1
+    assert controller.shed["ip_quota"] == 1
+
+
+def test_configured_api_key_has_its_own_quota():
+    controller = make_controller(burst=1)
+
+    async def scenario():
+        await admit(controller, "10.0.0.1")
+        await admit(controller, "10.0.0.1", api_key="clave")
+
+    asyncio.run(scenario())
+    assert controller.shed["ip_quota"] == 0
+    assert controller.stats()["tracked_clients"] == {"ip": 1, "api_key": 1}
+
+
+def test_unknown_api_keys_are_charged_to_the_ip():
+    controller = make_controller(burst=1)
+
+    async def scenario():
+        await admit(controller, "10.0.0.1", api_key="inventada-1")
+        # Una key nueva en cada petición no abre otra cuota
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admit(controller, "10.0.0.1", api_key="inventada-2")
+        return rejected.value
+
+    assert asyncio.run(scenario()).reason == "ip_quota"
+    assert controller.stats()["tracked_clients"] == {"ip": 1, "api_key": 0}
+
+
+def test_full_queue_is_shed():
+    controller = make_controller(max_concurrency=1, max_queue=1)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit("10.0.0.1"):
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1
+        assert controller.queued == 1
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit("10.0.0.2"):
+                pass
+        release.set()
+        await asyncio.gather(*holders)
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.reason == "queue_full"
+    assert controller.admitted == 2
+    assert controller.in_flight == 0
+
+
+def test_queue_timeout_is_shed():
+    controller = make_controller(max_concurrency=1, max_queue=4, queue_timeout=0.01)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit("10.0.0.1"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit("10.0.0.2"):
+                pass
+        release.set()
+        await holder
+        return rejected.value
+
+    assert asyncio.run(scenario()).reason == "queue_timeout"
+
+
+def test_cacheable_requests_bypass_admission():
+    controller = make_controller(burst=0)
+
+    async def scenario():
+        async with controller.admit("10.0.0.1", cacheable=True):
+            pass
+
+    asyncio.run(scenario())
+    assert controller.bypassed == 1
+    assert controller.shed["ip_quota"] == 0
+
+
+@pytest.fixture
+def tight_quota(monkeypatch):
+    monkeypatch.setattr(admission_controller, "ip_quotas", ClientQuotas(rate_per_minute=1, burst=2, max_clients=10))
+
+
+def test_api_returns_429_with_retry_after(client, tight_quota):
+    statuses = [
+        client.post(NEWS_URL, json={"city": f"Ciudad {i}", "country": "Chile", "limit": 3}).status_code
+        for i in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+
+    response = client.post(NEWS_URL, json={"city": "Ciudad 9", "country": "Chile", "limit": 3})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["detail"]
+
+
+def test_api_cached_location_is_not_charged(client, tight_quota):
+    body = {"city": "Quito", "country": "Ecuador", "limit": 3}
+    assert client.post(NEWS_URL, json=body).status_code == 200
+    # Lo que ya está en caché no gasta cuota
+    for _ in range(5):
+        assert client.post(NEWS_URL, json=body).status_code == 200
+
+
+def test_bucket_charges_cost_and_admits_oversized_requests_as_debt():
+    bucket = TokenBucket(rate=1.0, burst=3)
+    now = bucket.updated
+    assert bucket.take(now, cost=2) == 0
+    assert bucket.take(now, cost=2) == pytest.approx(1.0)
+    # Más que el burst: se admite con el bucket lleno y se paga después
+    assert bucket.take(now + 2.0, cost=5) == 0
+    assert bucket.take(now + 2.0) == pytest.approx(3.0)
+
+
+def test_api_stream_is_admitted(client, tight_quota):
+    statuses = [
+        client.post(f"{NEWS_URL}stream", json={"city": f"Ciudad {i}", "country": "Chile", "limit": 3}).status_code
+        for i in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+    assert admission_controller.in_flight == 0
+
+
+def test_api_batch_pays_per_unique_uncached_location(client, tight_quota):
+    assert client.post(NEWS_URL, json={"city": "Quito", "country": "Ecuador", "limit": 3}).status_code == 200
+    batch = {"requests": [
+        {"city": "Quito", "country": "Ecuador", "limit": 3},
+        {"city": "Cuenca", "country": "Ecuador", "limit": 3},
+        {"city": "Cuenca", "country": "Ecuador", "limit": 3},
+    ]}
+    # Quito está en caché y Cuenca se repite: cuesta un solo token, el último
+    assert client.post(f"{NEWS_URL}batch", json=batch).status_code == 200
+    batch["requests"].append({"city": "Loja", "country": "Ecuador", "limit": 3})
+    response = client.post(f"{NEWS_URL}batch", json=batch)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
@@ -0,0 +1,56 @@
+import asyncio
+
+from app.schemas import NewsRequest
+from app.services import gemini_service, news_cache, news_service
+from app.services.batch_news import BatchNewsRunner
+from app.services.news_cache import make_cache_key
+from app.services.news_versions import stable_id
+from tests.test_news_cache import make_items
+
+
+def make_runner(**kwargs) -> BatchNewsRunner:
+    options = dict(max_concurrency=4, pack_enabled=True, pack_size=4, pack_max_limit=5)
+    options.update(kwargs)
+    return BatchNewsRunner(news_service, gemini_service, **options)
+
+
+async def collect(runner: BatchNewsRunner, queries) -> list:
+    return [result async for result in runner.run(queries)]
+
+
+def test_packed_entries_are_cached_with_the_items_they_received(services, monkeypatch):
+    async def short_pack(locations, limit, categories=None, language="es"):
+        # Tres noticias para la primera ubicación aunque el grupo pidió cinco
+        return [make_items(3 if i == 0 else limit, location) for i, location in enumerate(locations)]
+
+    monkeypatch.setattr(gemini_service, "get_news_for_locations", short_pack)
+    queries = [("Arequipa, Perú", NewsRequest(limit=2)), ("Trujillo, Perú", NewsRequest(limit=5))]
+    results = asyncio.run(collect(make_runner(), queries))
+    assert all(result.source == "packed" for result in results)
+
+    entry = news_cache.peek(make_cache_key("Arequipa, Perú"))
+    # El lote guardado no cubre un limit que no recibió
+    assert entry.limit == 3
+    assert not news_service.is_cached("Arequipa, Perú", 5)
+
+
+def test_crashed_pack_yields_a_failed_result_per_entry(services, monkeypatch):
+    runner = make_runner()
+
+    async def crash(pack):
+        raise RuntimeError("error inesperado")
+
+    monkeypatch.setattr(runner, "_fetch_pack", crash)
+    queries = [("Piura, Perú", NewsRequest(limit=3)), ("Tacna, Perú", NewsRequest(limit=3))]
+    results = asyncio.run(asyncio.wait_for(collect(runner, queries), timeout=5))
+    assert len(results) == 2
+    assert all(isinstance(result.error, RuntimeError) for result in results)
+    assert runner.failures == 2
+
+
+def test_batch_results_carry_stable_ids(services):
+    queries = [("Arequipa, Perú", NewsRequest(limit=3)), ("Lima, Perú", NewsRequest(limit=8))]
+    results = asyncio.run(collect(make_runner(), queries))
+    for result in results:
+        assert result.items
+        assert [item.id for item in result.items] == [stable_id(item) for item in result.items]
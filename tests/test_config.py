@@ -0,0 +1,18 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_defaults_are_valid():
+    assert Settings().news_fanout_chunk_size < Settings().news_fanout_min_categories
+
+
+def test_fanout_chunks_must_be_smaller_than_the_fanout_threshold():
+    with pytest.raises(ValidationError, match="news_fanout_chunk_size"):
+        Settings(news_fanout_enabled=True, news_fanout_chunk_size=2, news_fanout_min_categories=2)
+
+
+def test_fanout_values_are_not_checked_while_disabled():
+    settings = Settings(news_fanout_enabled=False, news_fanout_chunk_size=2, news_fanout_min_categories=2)
+    assert not settings.news_fanout_enabled
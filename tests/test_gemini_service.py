@@ -0,0 +1,40 @@
+import asyncio
+import importlib
+import time
+
+from app.services import gemini_service
+
+# `app.services.gemini_service` es también el nombre del singleton exportado
+gemini_module = importlib.import_module("app.services.gemini_service")
+
+
+def test_model_resolution_does_not_block_the_event_loop(services, monkeypatch):
+    sdk = gemini_module._sdk
+
+    def slow_import():
+        # Un import del SDK en curso (p. ej. el warm-up todavía no termina)
+        time.sleep(0.2)
+        gemini_module._sdk = sdk
+        return sdk
+
+    monkeypatch.setattr(gemini_module, "_sdk", None)
+    monkeypatch.setattr(gemini_module, "load_sdk", slow_import)
+
+    async def scenario():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        model = await gemini_service._resolve_model("models/otro-modelo")
+        ticker.cancel()
+        return model, ticks
+
+    model, ticks = asyncio.run(scenario())
+    assert model is not None
+    # El loop siguió atendiendo mientras se importaba el SDK
+    assert ticks >= 5
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.services.generation_executor import GenerationExecutor, GenerationTimeoutError
+
+
+async def answer():
+    return "ok"
+
+
+def test_zero_remaining_deadline_is_not_the_default_timeout():
+    executor = GenerationExecutor(max_concurrency=1, timeout=30.0)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(GenerationTimeoutError):
+        asyncio.run(asyncio.wait_for(executor.run(slow, timeout=0.0), timeout=0.5))
+    assert executor.timeouts == 1
+
+
+def test_queue_wait_counts_against_the_timeout():
+    executor = GenerationExecutor(max_concurrency=1, timeout=30.0)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+
+        holder = asyncio.create_task(executor.run(hold))
+        await asyncio.sleep(0)
+        with pytest.raises(GenerationTimeoutError):
+            await executor.run(answer, timeout=0.05)
+        assert executor.queued == 0
+        release.set()
+        await holder
+        # El slot que no se llegó a tomar no quedó perdido
+        return await executor.run(answer, timeout=1.0)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert executor.timeouts == 1
+    assert executor.in_flight == 0
+
+
+def test_stream_respects_the_deadline_while_queued():
+    executor = GenerationExecutor(max_concurrency=1, timeout=30.0)
+
+    async def chunks():
+        yield "a"
+
+    async def open_stream():
+        return chunks()
+
+    async def scenario():
+        release = asyncio.Event()
+        holder = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(GenerationTimeoutError):
+            async for _ in executor.stream(open_stream, timeout=0.05):
+                pass
+        release.set()
+        await holder
+        return [chunk async for chunk in executor.stream(open_stream)]
+
+    assert asyncio.run(scenario()) == ["a"]
+    assert executor.timeouts == 1
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Optional
+
+import pytest
+
+from app.schemas import LocationResponse
+from app.services.geolocation_backends import GeolocationBackend
+from app.services.geolocation_service import GeolocationService
+
+LIMA = LocationResponse(city="Lima", region="Lima", country="Perú", country_code="PE")
+
+
+class FakeBackend(GeolocationBackend):
+    """Backend que responde lo configurado y cuenta las consultas"""
+
+    def __init__(self, name: str, result=None):
+        super().__init__()
+        self.name = name
+        self.result = result
+        self.calls = 0
+
+    async def lookup(self, ip: Optional[str]) -> Optional[LocationResponse]:
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def lookup(service: GeolocationService, ip: str) -> LocationResponse:
+    return asyncio.run(service.get_location_by_ip(ip))
+
+
+@pytest.mark.parametrize("local_result", [None, ValueError("IP inválida en la base local")])
+def test_local_miss_or_error_falls_through_to_http(local_result):
+    local, http = FakeBackend("csv", local_result), FakeBackend("http", LIMA)
+    service = GeolocationService(backends=[local, http])
+
+    assert lookup(service, "200.1.2.3").city == "Lima"
+    assert http.calls == 1
+    # El acierto del respaldo se cachea para todo el prefijo
+    assert lookup(service, "200.1.2.99").city == "Lima"
+    assert http.calls == 1
+
+
+def test_negative_result_is_cached_only_after_every_backend_failed():
+    local = FakeBackend("csv", ValueError("hueco en la base"))
+    http = FakeBackend("http", ValueError("Error de geolocalización: reserved range"))
+    service = GeolocationService(backends=[local, http])
+
+    with pytest.raises(ValueError, match="reserved range"):
+        lookup(service, "10.0.0.1")
+    assert (local.calls, http.calls) == (1, 1)
+
+    # Cacheado: no se vuelve a consultar a ningún backend
+    with pytest.raises(ValueError):
+        lookup(service, "10.0.0.2")
+    assert (local.calls, http.calls) == (1, 1)
+
+
+def test_transient_errors_are_not_cached():
+    local = FakeBackend("csv", None)
+    http = FakeBackend("http", ConnectionError("ip-api caído"))
+    service = GeolocationService(backends=[local, http])
+
+    with pytest.raises(ConnectionError):
+        lookup(service, "200.1.2.3")
+    http.result = LIMA
+    assert lookup(service, "200.1.2.3").city == "Lima"
+
+
+def test_not_found_anywhere_is_a_value_error():
+    service = GeolocationService(backends=[FakeBackend("csv"), FakeBackend("http")])
+    with pytest.raises(ValueError, match="no encontrada"):
+        lookup(service, "200.1.2.3")
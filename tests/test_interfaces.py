@@ -0,0 +1,35 @@
+import pytest
+
+from app.db.base import NewsStore
+from app.services.geolocation_backends import GeolocationBackend
+from app.services.metrics import Counter, Metric
+
+
+class IncompleteStore(NewsStore):
+    async def get(self, key):
+        return None
+
+
+class IncompleteBackend(GeolocationBackend):
+    name = "incompleto"
+
+
+class IncompleteMetric(Metric):
+    kind = "gauge"
+
+
+@pytest.mark.parametrize("cls", [NewsStore, IncompleteStore, GeolocationBackend, IncompleteBackend])
+def test_incomplete_implementations_fail_on_instantiation(cls):
+    with pytest.raises(TypeError):
+        cls()
+
+
+def test_incomplete_metric_fails_on_instantiation():
+    with pytest.raises(TypeError):
+        IncompleteMetric("metrica", "Sin muestras")
+
+
+def test_complete_metric_renders():
+    counter = Counter("peticiones_total", "Peticiones", ["ruta"])
+    counter.inc(ruta="/news/")
+    assert 'peticiones_total{ruta="/news/"} 1' in counter.render()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from benchmarks.loadtest.profiles import PROFILES
+from benchmarks.loadtest.run import percentile, summarize
+from benchmarks.loadtest.stand_ins import StandInConfig, StandInSDK, city_from_ip
+
+PROMPT = "Genera exactamente 4 noticias para esta ubicación: Lima, Perú"
+
+
+@pytest.mark.parametrize("name", sorted(PROFILES))
+def test_profiles_are_deterministic_for_a_fixed_seed(name):
+    build = PROFILES[name].build
+    arrivals = build(10.0, 20.0, random.Random(7))
+    assert arrivals == build(10.0, 20.0, random.Random(7))
+    assert arrivals != build(10.0, 20.0, random.Random(8))
+
+    times = [t for t, _, _ in arrivals]
+    assert times == sorted(times)
+    assert all(0.0 <= t < 10.0 for t in times)
+    assert {limit for _, _, limit in arrivals} <= {5, 10, 20}
+
+
+def test_hot_city_concentrates_requests_on_few_cities():
+    arrivals = PROFILES["hot_city"].build(30.0, 20.0, random.Random(1))
+    cities = [city_from_ip(ip) for _, ip, _ in arrivals]
+    top = max(set(cities), key=cities.count)
+    assert cities.count(top) > len(cities) * 0.2
+
+
+def test_percentile():
+    assert percentile([], 0.5) is None
+    values = [float(value) for value in range(1, 101)]
+    random.Random(3).shuffle(values)
+    assert percentile(values, 0.50) == 51.0
+    assert percentile(values, 0.99) == 100.0
+    # q = 1 no se sale del arreglo
+    assert percentile(values, 1.0) == 100.0
+
+
+def test_summarize_counts_only_successful_latencies():
+    results = [(0.1, 200), (0.2, 200), (0.3, 200), (5.0, 503), (0.0, 0)]
+    summary = summarize(results, elapsed=2.0)
+    assert summary["requests"] == 5
+    assert summary["ok"] == 3
+    assert summary["status"] == {"0": 1, "200": 3, "503": 1}
+    assert summary["throughput_rps"] == 1.5
+    assert summary["latency_ms"] == {"p50": 200.0, "p95": 300.0, "p99": 300.0, "max": 300.0}
+
+    empty = summarize([], elapsed=0.0)
+    assert empty["throughput_rps"] == 0.0
+    assert empty["latency_ms"]["p50"] is None
+
+
+def generate(config: StandInConfig) -> tuple:
+    sdk = StandInSDK(config)
+    model = sdk.GenerativeModel("gemini-test")
+    response = asyncio.run(model.generate_content_async(PROMPT))
+    return response.text, sdk.stats
+
+
+def test_gemini_stand_in_produces_malformed_output():
+    text, stats = generate(StandInConfig(gemini_p50=0.0, gemini_error_rate=0.0, gemini_malformed_rate=1.0))
+    assert stats["malformed"] == 1
+    assert text.startswith("Lo siento")
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+
+
+def test_gemini_stand_in_produces_truncated_output():
+    config = StandInConfig(
+        gemini_p50=0.0, gemini_error_rate=0.0, gemini_malformed_rate=0.0, gemini_truncated_rate=1.0
+    )
+    text, stats = generate(config)
+    assert stats["truncated"] == 1
+    assert text.startswith('{"news": [')
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+
+
+def test_gemini_stand_in_without_faults_returns_the_requested_news():
+    config = StandInConfig(
+        gemini_p50=0.0, gemini_error_rate=0.0, gemini_malformed_rate=0.0, gemini_truncated_rate=0.0
+    )
+    text, stats = generate(config)
+    assert stats["calls"] == 1
+    assert stats["calls_by_model"] == {"gemini-test": 1}
+    assert len(json.loads(text)["news"]) == 4
@@ -0,0 +1,55 @@
+from app.services.location_index import LocationIndex, build_location_index, fold
+from app.services.news_cache import make_cache_key
+
+index = build_location_index()
+
+
+def test_fold_removes_accents_case_and_punctuation():
+    assert fold("  Región Metropolitana ") == "region metropolitana"
+    assert fold("Bs. As.") == "bs as"
+
+
+def test_variants_share_the_canonical_id():
+    for location in (
+        "Santiago, Región Metropolitana, Chile",
+        "santiago, region metropolitana, chile",
+        "Santiago de Chile",
+        "Stgo, CL",
+    ):
+        assert index.canonical_id(location) == "cl-santiago", location
+
+
+def test_ambiguous_city_is_not_canonicalized():
+    # "Santiago" a secas puede ser Chile o República Dominicana
+    assert index.resolve("Santiago") is None
+    assert index.canonical_id("Santiago") == "santiago"
+
+
+def test_unknown_location_uses_normalized_form():
+    assert index.canonical_id("Ñuñoa,  Región Metropolitana") == "nunoa, region metropolitana"
+
+
+def test_extra_parts_fall_back_to_city_and_country():
+    place = index.resolve("Providencia, Santiago, Región Metropolitana, Chile")
+    assert place is None or place.country == "Chile"
+    assert index.canonical_id("Lima, Lima Metropolitana, Lima, Perú") == "pe-lima"
+
+
+def test_city_fallback_respects_the_given_country():
+    # Homónimos fuera del índice no se confunden con la ciudad conocida
+    assert index.resolve("Lima, Ohio, United States") is None
+    assert index.canonical_id("Lima, Ohio, United States") == "lima, ohio, united states"
+    assert index.resolve("Concepción, Paraguay") is None
+    assert index.canonical_id("Concepción, Paraguay") == "concepcion, paraguay"
+
+
+def test_display_name_is_canonical():
+    assert index.display_name("CDMX") == "Ciudad de México, México"
+
+
+def test_cache_keys_share_variants():
+    assert make_cache_key("Bogotá D.C., Colombia") == make_cache_key("bogota, colombia")
+
+
+def test_empty_index_returns_none():
+    assert LocationIndex().resolve("Lima, Perú") is None
@@ -0,0 +1,21 @@
+from app.core.config import settings
+
+
+def test_root_describes_the_api(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["version"] == settings.app_version
+    assert body["documentation"]["openapi_json"] == "/api/v1/openapi.json"
+
+
+def test_openapi_schema_is_served(client):
+    response = client.get("/api/v1/openapi.json")
+    assert response.status_code == 200
+    assert "/api/v1/news/" in response.json()["paths"]
+
+
+def test_metrics_use_prometheus_text_format(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,42 @@
+from app.services.model_router import ModelRouter, ModelTier
+
+
+def make_router(**kwargs) -> ModelRouter:
+    return ModelRouter(
+        fast=ModelTier(name=ModelRouter.FAST, model="fast-model", temperature=0.5),
+        standard=ModelTier(name=ModelRouter.STANDARD, model="standard-model", temperature=0.7),
+        fast_max_limit=6,
+        latency_budget=15.0,
+        error_budget=0.3,
+        **kwargs
+    )
+
+
+def test_small_requests_stay_on_standard_model_by_default():
+    router = make_router()
+    assert router.choose(3).tier == ModelRouter.STANDARD
+    # El nivel rápido sigue disponible cuando se pide explícitamente
+    assert router.choose(3, tier=ModelRouter.FAST).model == "fast-model"
+
+
+def test_routing_sends_small_requests_to_fast_model_when_enabled():
+    router = make_router(routing_enabled=True)
+    assert router.choose(3).tier == ModelRouter.FAST
+    assert router.choose(10).tier == ModelRouter.STANDARD
+
+
+def test_token_cap_follows_measured_item_size():
+    router = make_router(token_headroom=1.5)
+    standard = router.tiers[ModelRouter.STANDARD]
+    initial = router.choose(5).generation_config["max_output_tokens"]
+    assert initial == standard.base_tokens + standard.tokens_per_item * 5
+
+    # Noticias más largas de lo estimado: el tope crece para no truncar
+    router.record_item_size("standard-model", output_tokens=5 * 500, items=5)
+    assert router.tokens_per_item(ModelRouter.STANDARD) == 750
+    assert router.choose(5).generation_config["max_output_tokens"] == standard.base_tokens + 750 * 5
+
+    # Respuestas muy cortas no bajan el tope por debajo del mínimo
+    router = make_router()
+    router.record_item_size("standard-model", output_tokens=50, items=5)
+    assert router.tokens_per_item(ModelRouter.STANDARD) == standard.min_tokens_per_item
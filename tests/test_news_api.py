@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+from app.schemas import NewsCategory, NewsItem
+from app.services import news_cache, news_service
+from app.services.news_cache import make_cache_key
+
+NEWS_URL = "/api/v1/news/"
+LIMA = make_cache_key("Lima, Lima, Perú")
+
+
+def regenerate(key, change):
+    """Simula una generación nueva del lote de `key` a partir del actual"""
+    entry = news_cache.peek(key)
+    items = change(entry.news())
+    asyncio.run(news_service.remember(key, items, entry.limit))
+
+
+def test_cache_hit_does_not_call_gemini(client, services):
+    client.get(NEWS_URL, params={"limit": 5})
+    client.get(NEWS_URL, params={"limit": 3})
+    assert services.stats["calls"] == 1
+
+
+def test_post_custom_location(client):
+    response = client.post(NEWS_URL, json={"city": "Quito", "country": "Ecuador", "limit": 4})
+    assert response.status_code == 200
+    assert response.json()["total_news"] == 4
+
+
+def test_get_news_sets_validators(client):
+    response = client.get(NEWS_URL, params={"limit": 5})
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert "private" in response.headers["Cache-Control"]
+
+
+def test_if_none_match_returns_304(client):
+    first = client.get(NEWS_URL, params={"limit": 5})
+    etag = first.headers["ETag"]
+
+    response = client.get(NEWS_URL, params={"limit": 5}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    # Otra vista del lote es otro recurso
+    other = client.get(NEWS_URL, params={"limit": 3}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_categories_are_cacheable(client):
+    response = client.get("/api/v1/news/categories")
+    assert response.status_code == 200
+    assert "public" in response.headers["Cache-Control"]
+    again = client.get("/api/v1/news/categories", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_get_news_returns_versioned_batch(client):
+    data = client.get(NEWS_URL, params={"limit": 5}).json()
+    assert data["location"] == "Lima, Lima, Perú"
+    assert data["total_news"] == len(data["news"]) == 5
+    assert data["version"] == 1
+    assert data["cursor"]
+
+
+def test_since_current_cursor_is_an_empty_delta(client):
+    cursor = client.get(NEWS_URL, params={"limit": 5}).json()["cursor"]
+    delta = client.get(NEWS_URL, params={"limit": 5, "since": cursor}).json()
+    assert delta["full"] is False
+    assert delta["news"] == []
+    assert delta["removed"] == []
+    assert delta["cursor"] == cursor
+
+
+def test_since_returns_changed_and_removed_items(client):
+    first = client.get(NEWS_URL, params={"limit": 5}).json()
+    ids = [item["id"] for item in first["news"]]
+
+    def change(items):
+        edited = items[0].model_copy(update={"summary": "Resumen actualizado"})
+        extra = NewsItem(
+            id=0,
+            title="Una noticia que no estaba",
+            summary="Nueva",
+            category=NewsCategory.LOCAL,
+            relevance_score=5,
+            location_context="Lima",
+        )
+        # Se cae la última y entra una nueva
+        return [edited, *items[1:4], extra]
+
+    regenerate(LIMA, change)
+
+    response = client.get(NEWS_URL, params={"limit": 5, "since": first["cursor"]})
+    delta = response.json()
+    assert delta["full"] is False
+    assert delta["version"] == 2
+    assert delta["cursor"] != first["cursor"]
+    assert delta["removed"] == [ids[4]]
+    changed = {item["title"]: item for item in delta["news"]}
+    assert set(changed) == {first["news"][0]["title"], "Una noticia que no estaba"}
+    # La noticia editada conserva su ID estable
+    assert changed[first["news"][0]["title"]]["id"] == ids[0]
+
+    # El mismo delta otra vez: 304
+    again = client.get(
+        NEWS_URL,
+        params={"limit": 5, "since": first["cursor"]},
+        headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert again.status_code == 304
+
+
+def test_streamed_ids_drive_since_deltas(client):
+    lines = client.get(f"{NEWS_URL}stream", params={"limit": 5}).text.splitlines()
+    streamed = [json.loads(line)["news"]["id"] for line in lines if json.loads(line)["type"] == "news"]
+    assert len(streamed) == 5
+
+    # El lote que dejó el stream tiene los mismos IDs que se emitieron
+    first = client.get(NEWS_URL, params={"limit": 5}).json()
+    assert [item["id"] for item in first["news"]] == streamed
+
+    def replace_first(items):
+        extra = items[0].model_copy(update={"title": "Una noticia que no estaba"})
+        return [*items[1:], extra]
+
+    regenerate(LIMA, replace_first)
+    response = client.get(NEWS_URL, params={"limit": 5, "since": first["cursor"]})
+    delta = response.json()
+    assert delta["full"] is False
+    assert delta["removed"] == [streamed[0]]
+
+    again = client.get(
+        NEWS_URL,
+        params={"limit": 5, "since": first["cursor"]},
+        headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert again.status_code == 304
+
+
+def test_unknown_cursor_returns_full_batch(client):
+    client.get(NEWS_URL, params={"limit": 5})
+    delta = client.get(NEWS_URL, params={"limit": 5, "since": "desconocido"}).json()
+    assert delta["full"] is True
+    assert len(delta["news"]) == 5
+
+
+def test_identical_regeneration_keeps_version(client):
+    first = client.get(NEWS_URL, params={"limit": 5})
+    regenerate(LIMA, lambda items: items)
+    second = client.get(NEWS_URL, params={"limit": 5})
+    assert second.json()["version"] == 1
+    assert second.headers["ETag"] == first.headers["ETag"]
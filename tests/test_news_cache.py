@@ -0,0 +1,142 @@
+import json
+
+from app.schemas import NewsCategory, NewsItem
+from app.services.news_cache import CompactBatch, NewsCache, encode_news
+from app.services.news_versions import unpack_snapshot
+
+
+def make_items(count: int, prefix: str = "Noticia") -> list:
+    return [
+        NewsItem(
+            id=i,
+            title=f"{prefix} {i}",
+            summary="Resumen " * 10,
+            category=NewsCategory.LOCAL,
+            relevance_score=5,
+            location_context="Lima",
+            keywords=["uno", "dos"],
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def test_size_tracks_entries():
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=10 ** 6)
+    entry = cache.set(("a", (), "es"), make_items(5), 5)
+    assert entry.size >= entry.batch.nbytes
+    assert cache.stats()["bytes"] == entry.size
+
+    # Reemplazar la entrada no duplica su tamaño
+    entry = cache.set(("a", (), "es"), make_items(5, "Otra"), 5)
+    assert cache.stats()["bytes"] == entry.size
+
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_evicts_least_recently_used_over_budget():
+    size = CompactBatch.from_items(make_items(5)).nbytes
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=int(size * 2.5))
+    for name in ("a", "b"):
+        cache.set((name, (), "es"), make_items(5), 5)
+    cache.get(("a", (), "es"))
+    cache.set(("c", (), "es"), make_items(5), 5)
+
+    assert ("a", (), "es") in cache
+    assert ("b", (), "es") not in cache
+    assert cache.evictions == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_entries_expire_after_ttl_and_then_stale_ttl():
+    cache = NewsCache(ttl=60, stale_ttl=30, max_bytes=10 ** 6)
+    key = ("a", (), "es")
+    assert cache.set(key, make_items(3), 3).is_fresh()
+    # Vencida pero dentro de stale_ttl: se sirve mientras se refresca
+    entry = cache.set(key, make_items(3), 3, age=70)
+    assert not entry.is_fresh()
+    assert cache.get(key) is entry
+    # Fuera de stale_ttl ya no se sirve, pero sigue como último resultado bueno
+    cache.set(key, make_items(3), 3, age=100)
+    assert cache.get(key) is None
+    assert cache.get_last_good(key) is not None
+
+
+def test_larger_limit_covers_smaller_ones():
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=10 ** 6)
+    entry = cache.set(("a", (), "es"), make_items(20), 20)
+    assert entry.covers(5) and not entry.covers(21)
+    assert [item.title for item in entry.news(5)] == [f"Noticia {i}" for i in range(1, 6)]
+
+
+def test_encoded_view_snapshot_matches_items():
+    batch = CompactBatch.from_items(make_items(3))
+    view = encode_news(batch, 2)
+    assert view.total == 2
+    assert list(unpack_snapshot(view.snapshot)) == [1, 2]
+    assert [json.loads(chunk)["id"] for chunk in view.item_chunks] == [1, 2]
+
+
+def test_version_bumps_only_when_content_changes():
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=10 ** 6)
+    key = ("a", (), "es")
+    assert cache.set(key, make_items(3), 3).version == 1
+    assert cache.set(key, make_items(3), 3).version == 1
+    assert cache.set(key, make_items(3, "Otra"), 3).version == 2
+
+
+def test_views_and_variants_count_towards_the_budget():
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=10 ** 6)
+    entry = cache.set(("a", (), "es"), make_items(5), 5)
+    base = entry.size
+
+    # Un prefijo copiado y su snapshot ocupan memoria propia
+    view = entry.encoded(2)
+    assert entry.size == base + len(view.items_json) + len(view.snapshot)
+    view.set_variant("Lima", "gzip", b"x" * 100)
+    assert entry.size == base + len(view.items_json) + len(view.snapshot) + 100
+
+    stats = cache.stats()
+    assert stats["bytes"] == entry.size
+    assert stats["view_bytes"] == entry.size - base
+
+
+def test_growing_views_trigger_eviction():
+    size = CompactBatch.from_items(make_items(5)).nbytes
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=int(size * 2.5))
+    cache.set(("a", (), "es"), make_items(5), 5)
+    entry = cache.set(("b", (), "es"), make_items(5), 5)
+    entry.encoded(5).set_variant("Lima", "gzip", b"x" * size)
+
+    assert ("a", (), "es") not in cache
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_compact_batch_round_trip():
+    items = make_items(4)
+    batch = CompactBatch.from_items(items)
+    assert len(batch) == 4
+    assert batch.ids == [1, 2, 3, 4]
+    assert batch.items() == items
+    assert batch.items(2) == items[:2]
+    assert json.loads(batch.chunk(2))["title"] == "Noticia 3"
+    assert json.loads(batch.prefix(0)) == []
+    assert batch.prefix(10) is batch.json
+
+
+def test_variants_evict_least_recently_used_one_at_a_time():
+    cache = NewsCache(ttl=60, stale_ttl=60, max_bytes=10 ** 6)
+    entry = cache.set(("a", (), "es"), make_items(3), 3)
+    view = entry.encoded(3)
+    for i in range(view.MAX_VARIANTS):
+        view.set_variant(f"Lugar {i}", "gzip", bytes([i]) * 10)
+    assert view.get_variant("Lugar 0", "gzip") is not None
+    size = entry.size
+
+    view.set_variant("Otro lugar", "gzip", bytes([99]) * 10)
+    assert len(view.variants) == view.MAX_VARIANTS
+    # Se va la menos usada ("Lugar 1"), no todas
+    assert view.get_variant("Lugar 1", "gzip") is None
+    assert view.get_variant("Lugar 0", "gzip") is not None
+    assert entry.size == size
+    assert cache.stats()["bytes"] == entry.size
@@ -0,0 +1,192 @@
+import asyncio
+
+from app.db.base import NewsStore
+from app.services import news_cache, news_service
+from app.services.news_cache import make_cache_key
+
+
+async def collect(location: str, limit: int) -> list:
+    return [item async for item in news_service.stream_news(location, limit)]
+
+
+def test_concurrent_misses_share_one_generation(services):
+    async def scenario():
+        return await asyncio.gather(*(news_service.get_news("Asunción, Paraguay", 5) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert services.stats["calls"] == 1
+    assert all([item.id for item in items] == [item.id for item in results[0]] for items in results)
+
+
+def test_smaller_limit_is_sliced_from_cached_batch(services):
+    async def scenario():
+        full = await news_service.get_news("La Paz, Bolivia", 10)
+        return full, await news_service.get_news("La Paz, Bolivia", 4)
+
+    full, sliced = asyncio.run(scenario())
+    assert services.stats["calls"] == 1
+    assert sliced == full[:4]
+
+
+def test_stale_entry_is_served_while_refreshing(services):
+    key = make_cache_key("Caracas, Venezuela")
+
+    async def scenario():
+        await news_service.get_news("Caracas, Venezuela", 3)
+        stale = news_cache.peek(key)
+        news_cache.set(key, stale.news(), stale.limit, age=news_cache.ttl + 1)
+        # Se responde con el lote vencido sin esperar a Gemini
+        served = await news_service.get_news("Caracas, Venezuela", 3)
+        await asyncio.gather(*news_service._background)
+        return stale, served
+
+    stale, served = asyncio.run(scenario())
+    assert [item.id for item in served] == [item.id for item in stale.news()]
+    assert services.stats["calls"] == 2
+    assert news_cache.peek(key).is_fresh()
+
+
+def test_concurrent_streams_share_one_generation(services):
+    async def scenario():
+        return await asyncio.gather(*(collect("Montevideo, Uruguay", 5) for _ in range(4)))
+
+    results = asyncio.run(scenario())
+    assert services.stats["calls"] == 1
+    assert all(len(items) == 5 for items in results)
+    assert all([item.id for item in items] == [item.id for item in results[0]] for items in results)
+    assert news_cache.peek(make_cache_key("Montevideo, Uruguay")) is not None
+
+
+def test_buffered_request_joins_stream_generation(services):
+    async def scenario():
+        stream = asyncio.create_task(collect("Madrid, España", 5))
+        await asyncio.sleep(0)
+        batch = await news_service.get_news("Madrid, España", 5)
+        return await stream, batch
+
+    streamed, batch = asyncio.run(scenario())
+    assert services.stats["calls"] == 1
+    assert [item.id for item in streamed] == [item.id for item in batch]
+
+
+def test_stream_generation_outlives_disconnected_client(services):
+    async def scenario():
+        async for _ in news_service.stream_news("Barcelona, España", 5):
+            break
+        # La generación sigue en segundo plano y deja el lote completo en el caché
+        key = make_cache_key("Barcelona, España")
+        while key in news_service._in_flight:
+            await asyncio.sleep(0.01)
+        return news_cache.peek(key)
+
+    entry = asyncio.run(scenario())
+    assert entry is not None and len(entry.batch) == 5
+    assert services.stats["calls"] == 1
+
+
+def test_fanout_generates_each_group_once(services, monkeypatch):
+    from app.core.config import settings
+    from app.schemas import NewsCategory
+
+    monkeypatch.setattr(settings, "news_fanout_enabled", True)
+    categories = [NewsCategory.POLITICS, NewsCategory.SPORTS, NewsCategory.HEALTH]
+
+    items = asyncio.run(asyncio.wait_for(news_service.get_news("Quito, Ecuador", 6, categories), timeout=5))
+    # El doble repite títulos entre grupos: la unión los deduplica
+    assert items
+    # Una llamada por grupo de categorías, sin volver a dividir ni esperarse a sí misma
+    assert services.stats["calls"] == 3
+    for category in categories:
+        assert news_cache.peek(make_cache_key("Quito, Ecuador", [category])) is not None
+    assert news_cache.peek(make_cache_key("Quito, Ecuador", categories)) is not None
+
+
+class BrokenStore(NewsStore):
+    """Store caído: todas las operaciones fallan"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def _fail(self, *args):
+        self.calls += 1
+        raise ConnectionError("store caído")
+
+    get = put = acquire_lease = release_lease = _fail
+
+
+def test_store_outage_generates_locally_without_waiting(services, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(news_service, "store", BrokenStore())
+    monkeypatch.setattr(settings, "news_store_wait_seconds", 30.0)
+    waits = news_service.store_waits
+
+    items = asyncio.run(asyncio.wait_for(news_service.get_news("Cusco, Perú", 3), timeout=5))
+    assert len(items) == 3
+    assert services.stats["calls"] == 1
+    assert news_service.store_waits == waits
+
+
+def test_fast_first_partial_result_has_stable_ids(services, monkeypatch):
+    from app.core.config import settings
+    from app.services import gemini_service
+    from app.services.news_versions import stable_id
+
+    monkeypatch.setattr(settings, "news_fast_first_enabled", True)
+    generate = gemini_service.get_news_by_location
+
+    async def slow_full_batch(*args, tier=None, **kwargs):
+        if tier is None:
+            await asyncio.sleep(5)
+        return await generate(*args, tier=tier, **kwargs)
+
+    monkeypatch.setattr(gemini_service, "get_news_by_location", slow_full_batch)
+    items = asyncio.run(news_service.get_news("Lima, Perú", settings.news_fast_first_items + 2))
+    assert len(items) == settings.news_fast_first_items
+    assert [item.id for item in items] == [stable_id(item) for item in items]
+
+
+def test_refresh_with_store_generates_a_new_batch(services, monkeypatch, tmp_path):
+    from app.db.sqlite_store import SqliteNewsStore
+
+    monkeypatch.setattr(news_service, "store", SqliteNewsStore(str(tmp_path / "news.db")))
+    key = make_cache_key("Rosario, Argentina")
+
+    async def scenario():
+        await news_service.get_news("Rosario, Argentina", 3)
+        before = news_cache.peek(key)
+        hits = news_service.store_hits
+        # Aún fresco: el store tiene el mismo lote, que no debe volver a servirse
+        await news_service.refresh("Rosario, Argentina", 3)
+        await news_service.store.close()
+        return before, hits
+
+    before, hits = asyncio.run(scenario())
+    assert services.stats["calls"] == 2
+    assert news_service.store_hits == hits
+    assert news_cache.peek(key) is not before
+    assert news_cache.peek(key).age() < before.age()
+
+
+def test_refresh_uses_a_newer_batch_from_another_worker(services, monkeypatch, tmp_path):
+    from app.crud.news_batch import save_news_batch
+    from app.db.sqlite_store import SqliteNewsStore
+
+    store = SqliteNewsStore(str(tmp_path / "news.db"))
+    monkeypatch.setattr(news_service, "store", store)
+    key = make_cache_key("Córdoba, Argentina")
+
+    async def scenario():
+        items = await news_service.get_news("Córdoba, Argentina", 3)
+        cached = news_cache.peek(key)
+        news_cache.set(key, cached.news(), cached.limit, age=120)
+        # Otro worker generó después que este
+        await save_news_batch(store, key, items, 3, ttl=3600)
+        hits = news_service.store_hits
+        await news_service.refresh("Córdoba, Argentina", 3)
+        await store.close()
+        return hits
+
+    hits = asyncio.run(scenario())
+    assert services.stats["calls"] == 1
+    assert news_service.store_hits == hits + 1
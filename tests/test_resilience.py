@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+
+from app.services.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller, RetryBudget
+
+
+class Unavailable(Exception):
+    code = 503
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+def make_caller(breaker: CircuitBreaker, max_retries: int = 0) -> ResilientCaller:
+    return ResilientCaller(
+        deadline=5.0,
+        max_retries=max_retries,
+        backoff_base=0.001,
+        backoff_max=0.001,
+        retry_budget=RetryBudget(ratio=1.0),
+        breaker=breaker
+    )
+
+
+async def fail(timeout: float):
+    raise Unavailable("upstream caído")
+
+
+async def succeed(timeout: float):
+    return "ok"
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.times_opened == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_probe_success_closes_and_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=0)
+    for _ in range(5):
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.recovery_timeout = 60
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+
+
+def test_caller_fails_fast_while_open():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    caller = make_caller(breaker)
+    with pytest.raises(Unavailable):
+        asyncio.run(caller.call(fail))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(caller.call(succeed))
+
+
+def test_request_errors_do_not_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    caller = make_caller(breaker)
+
+    async def bad_request(timeout: float):
+        raise BadRequest("prompt inválido")
+
+    with pytest.raises(BadRequest):
+        asyncio.run(caller.call(bad_request))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retries_then_succeeds():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    caller = make_caller(breaker, max_retries=2)
+    attempts = []
+
+    async def flaky(timeout: float):
+        attempts.append(timeout)
+        if len(attempts) < 2:
+            raise Unavailable("transitorio")
+        return "ok"
+
+    assert asyncio.run(caller.call(flaky)) == "ok"
+    assert caller.retries == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def half_open_breaker(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0, **kwargs)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+
+def test_cancelled_probe_releases_the_slot():
+    breaker = half_open_breaker()
+    caller = make_caller(breaker)
+
+    async def scenario():
+        hang = asyncio.Event()
+
+        async def slow(timeout: float):
+            await hang.wait()
+
+        probe = asyncio.create_task(caller.call(slow))
+        await asyncio.sleep(0)
+        # Mientras la prueba corre no pasa otra llamada
+        with pytest.raises(CircuitOpenError):
+            await caller.call(succeed)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        # La cancelación no deja el circuito tomado
+        return await caller.call(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_lost_probe_expires_after_probe_timeout():
+    breaker = half_open_breaker(probe_timeout=0.01)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker._probe_started -= 0.02
+    assert breaker.allow()
+    assert breaker.expired_probes == 1
+
+
+def test_release_only_frees_its_own_probe():
+    breaker = half_open_breaker()
+    assert breaker.allow()
+    probe = breaker.current_probe
+    breaker.release_probe(None)
+    breaker.release_probe(probe + 1)
+    assert not breaker.allow()
+    breaker.release_probe(probe)
+    assert breaker.allow()
+
+
+def test_abandoned_stream_releases_the_probe(services):
+    from app.services import gemini_service
+
+    breaker = gemini_service.resilience.breaker
+    breaker.record_failure()
+    breaker._state, breaker._opened_at = CircuitBreaker.OPEN, 0.0
+    try:
+        async def scenario():
+            stream = gemini_service.stream_news_by_location("Lima, Perú", 3)
+            await stream.__anext__()
+            # El cliente se desconecta a mitad del stream
+            await stream.aclose()
+            return breaker.allow()
+
+        assert asyncio.run(scenario())
+    finally:
+        breaker.record_success()